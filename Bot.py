@@ -4,6 +4,8 @@ import os
 from dotenv import load_dotenv
 import asyncio
 import logging
+import subprocess
+import sys
 from logging_config import setup_logging
 
 # Initialize enhanced logging with bot-specific configuration
@@ -17,6 +19,17 @@ logger = setup_logging(
 # Load environment variables
 load_dotenv()
 BOT_TOKEN = os.getenv("BOT_TOKEN")
+SYNC_APP_COMMANDS = os.getenv("SYNC_APP_COMMANDS", "true").lower() == "true"
+# Set by the runner's supervisor: where this process reports its health (gateway latency, pollers)
+HEARTBEAT_FILE = os.getenv("BOT_HEARTBEAT_FILE")
+
+# Sharding: BOT_SHARDED enables AutoShardedBot; BOT_SHARD_COUNT fixes the total shard count
+# (Discord's recommendation is used otherwise); BOT_SHARD_IDS limits this process to some shards;
+# BOT_SHARD_PROCESSES > 1 splits the shards across that many bot processes on this host.
+SHARD_COUNT = int(os.getenv("BOT_SHARD_COUNT", 0)) or None
+SHARD_IDS = [int(shard_id) for shard_id in os.getenv("BOT_SHARD_IDS", "").split(",") if shard_id.strip()] or None
+SHARD_PROCESSES = int(os.getenv("BOT_SHARD_PROCESSES", 1))
+SHARDED = os.getenv("BOT_SHARDED", "false").lower() == "true" or SHARD_COUNT is not None or SHARD_IDS is not None
 
 if not BOT_TOKEN:
     logger.critical("BOT_TOKEN is missing. Please check your .env file.")
@@ -28,10 +41,43 @@ def get_bot():
     """
     intents = discord.Intents.default()
     intents.message_content = True
+    if SHARDED:
+        logger.info("Using AutoShardedBot", extra={
+            'event_type': 'bot_sharding_enabled',
+            'shard_count': SHARD_COUNT,
+            'shard_ids': SHARD_IDS
+        })
+        return commands.AutoShardedBot(
+            command_prefix="!", intents=intents, shard_count=SHARD_COUNT, shard_ids=SHARD_IDS
+        )
     return commands.Bot(command_prefix="!", intents=intents)
 
 bot = get_bot()
 
+async def sync_app_commands():
+    """
+    Sync slash commands with Discord once the bot has logged in.
+    """
+    if not SYNC_APP_COMMANDS:
+        return
+    try:
+        synced = await bot.tree.sync()
+        logger.info(f"Synced {len(synced)} app command(s)", extra={
+            'event_type': 'app_commands_synced',
+            'count': len(synced)
+        })
+    except Exception as e:
+        logger.error(
+            "Failed to sync app commands",
+            exc_info=True,
+            extra={
+                'event_type': 'app_commands_sync_failed',
+                'error': str(e)
+            }
+        )
+
+bot.setup_hook = sync_app_commands
+
 @bot.event
 async def on_ready():
     """
@@ -40,7 +86,9 @@ async def on_ready():
     logger.info(f"Bot is online as {bot.user}", extra={
         'event_type': 'bot_ready',
         'user_id': bot.user.id,
-        'username': str(bot.user)
+        'username': str(bot.user),
+        'shard_count': bot.shard_count,
+        'shard_ids': sorted(bot.shards) if SHARDED else None
     })
     
     guild_details = [
@@ -82,7 +130,7 @@ async def setup_extensions():
     """
     Dynamically load extensions (cogs) from a predefined list.
     """
-    extensions = ["commands.general", "commands.notifications"]  # Add more extensions as needed
+    extensions = ["commands.general", "commands.notifications", "commands.slash", "commands.shards", "commands.metrics"]  # Add more extensions as needed
     
     loaded = 0
     failed = 0
@@ -117,6 +165,18 @@ async def setup_extensions():
         }
     )
 
+async def write_heartbeats():
+    """
+    Write this bot's health to HEARTBEAT_FILE every few seconds for the runner's supervisor.
+    """
+    from myslt.health import HEARTBEAT_INTERVAL, bot_status, write_heartbeat
+    while True:
+        try:
+            await asyncio.to_thread(write_heartbeat, HEARTBEAT_FILE, bot_status(bot))
+        except Exception as e:
+            logger.warning("Failed to write heartbeat", extra={'event_type': 'bot_heartbeat_failed', 'error': str(e)})
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
+
 async def main():
     """
     Main function to start the bot.
@@ -125,8 +185,13 @@ async def main():
         async with bot:
             logger.info("Starting bot initialization", extra={'event_type': 'bot_init_start'})
             await setup_extensions()
+            heartbeat = asyncio.create_task(write_heartbeats()) if HEARTBEAT_FILE else None
             logger.info("Starting bot connection", extra={'event_type': 'bot_connect_start'})
-            await bot.start(BOT_TOKEN)
+            try:
+                await bot.start(BOT_TOKEN)
+            finally:
+                if heartbeat:
+                    heartbeat.cancel()
     except Exception as e:
         logger.critical(
             "Critical error in bot main loop", 
@@ -138,10 +203,47 @@ async def main():
         )
         raise
 
+def run_shard_cluster():
+    """
+    Split BOT_SHARD_COUNT shards across BOT_SHARD_PROCESSES bot processes and wait for them.
+    """
+    if not SHARD_COUNT:
+        logger.critical("BOT_SHARD_COUNT must be set when BOT_SHARD_PROCESSES > 1.")
+        exit(1)
+
+    processes = []
+    for index in range(SHARD_PROCESSES):
+        shard_ids = [shard_id for shard_id in range(SHARD_COUNT) if shard_id % SHARD_PROCESSES == index]
+        if not shard_ids:
+            continue
+        env = dict(os.environ, BOT_SHARD_IDS=",".join(map(str, shard_ids)), BOT_SHARD_PROCESSES="1")
+        if 0 not in shard_ids:
+            # The command tree is global: only the process owning shard 0 syncs it
+            env["SYNC_APP_COMMANDS"] = "false"
+        process = subprocess.Popen([sys.executable, os.path.abspath(__file__)], env=env)
+        logger.info(f"Started shard process {process.pid}", extra={
+            'event_type': 'shard_process_start',
+            'pid': process.pid,
+            'shard_ids': shard_ids,
+            'shard_count': SHARD_COUNT
+        })
+        processes.append(process)
+
+    try:
+        for process in processes:
+            process.wait()
+    finally:
+        for process in processes:
+            if process.poll() is None:
+                process.terminate()
+
 if __name__ == "__main__":
     try:
         logger.info("Bot process starting", extra={'event_type': 'bot_process_start'})
-        asyncio.run(main())
+        if SHARD_PROCESSES > 1:
+            run_shard_cluster()
+        else:
+            asyncio.run(main())
     except KeyboardInterrupt:
         logger.info("Bot shutdown requested via keyboard interrupt", extra={'event_type': 'bot_shutdown_keyboard'})
     except Exception as e:
@@ -153,3 +255,5 @@ if __name__ == "__main__":
                 'error': str(e)
             }
         )
+        # Non-zero exit so the runner's supervisor (or systemd/Docker) restarts the bot
+        sys.exit(1)
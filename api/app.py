@@ -1,13 +1,24 @@
-from fastapi import FastAPI, Depends, HTTPException, Request
+from fastapi import FastAPI, Depends, HTTPException, Request, Response
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+import asyncio
 import logging
+import math
 import time
 from typing import Callable
 import uuid
 
-from myslt.api import SLTAPI
-from config.config import USERNAME, PASSWORD, SUBSCRIBER_ID, TP_NO, ACCOUNT_NO
+from myslt.cache import get_shared_cache
+from myslt.poller import poller_status
+from config.config import (
+    SUBSCRIBER_ID, TP_NO, ACCOUNT_NO, RATE_LIMIT_ENABLED, RATE_LIMIT_TRUST_PROXY,
+    API_KEYS,
+)
+from api.responses import FastJSONResponse
+from api.response_cache import response_cache
 from logging_config import setup_logging
+from metrics import API_RATE_LIMITED, API_REQUEST_SECONDS, CONTENT_TYPE as METRICS_CONTENT_TYPE, REGISTRY
+from api.ratelimit import SQLiteBucketStore, client_key, get_rate_limiter
 
 # Configure enhanced logging for API
 logger = setup_logging(
@@ -22,8 +33,43 @@ app = FastAPI(
     title="MySLT Bot API",
     description="API for accessing SLT data and bot functionality",
     version="1.0.0",
+    default_response_class=FastJSONResponse,
 )
 
+# Paths that are never rate limited (monitoring and docs)
+RATE_LIMIT_EXEMPT = {"/health", "/ready", "/metrics", "/docs", "/redoc", "/openapi.json"}
+
+def rate_limited_response(retry_after: float) -> JSONResponse:
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "Rate limit exceeded"},
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+    )
+
+# Rate limiting per API key or client IP. Registered before CORS so that 429s still carry CORS headers.
+@app.middleware("http")
+async def rate_limit(request: Request, call_next: Callable):
+    if not RATE_LIMIT_ENABLED or request.method == "OPTIONS" or request.url.path in RATE_LIMIT_EXEMPT:
+        return await call_next(request)
+
+    key = client_key(request, RATE_LIMIT_TRUST_PROXY, API_KEYS)
+    retry_after = await get_rate_limiter().acquire(key)
+    if retry_after > 0:
+        API_RATE_LIMITED.inc()
+        logger.warning(
+            f"Rate limit exceeded: {request.method} {request.url.path}",
+            extra={
+                'event_type': 'rate_limited',
+                'client': key,
+                'path': request.url.path,
+                'retry_after_seconds': round(retry_after, 2)
+            }
+        )
+        return rate_limited_response(retry_after)
+    # Later handlers (e.g. /batch) charge extra tokens to the same client
+    request.state.rate_limit_key = key
+    return await call_next(request)
+
 # Configure CORS to allow frontend access
 app.add_middleware(
     CORSMiddleware,
@@ -33,6 +79,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+def route_label(request: Request) -> str:
+    """The matched route template (e.g. /usage/summary), keeping metric label cardinality bounded."""
+    route = request.scope.get("route")
+    return getattr(route, "path", "unmatched")
+
 # Middleware for request logging
 @app.middleware("http")
 async def log_requests(request: Request, call_next: Callable):
@@ -56,6 +107,7 @@ async def log_requests(request: Request, call_next: Callable):
     try:
         response = await call_next(request)
         process_time = time.time() - start_time
+        API_REQUEST_SECONDS.labels(request.method, route_label(request), str(response.status_code)).observe(process_time)
         
         # Log the response
         logger.info(
@@ -77,6 +129,7 @@ async def log_requests(request: Request, call_next: Callable):
         return response
     except Exception as e:
         process_time = time.time() - start_time
+        API_REQUEST_SECONDS.labels(request.method, route_label(request), "500").observe(process_time)
         logger.error(
             f"Request failed: {request.method} {request.url.path}",
             exc_info=True,
@@ -91,11 +144,12 @@ async def log_requests(request: Request, call_next: Callable):
         )
         raise
 
-# Dependency to get SLT API client
-def get_slt_api():
+# Dependency to get the process-wide SLT cache (one client and one login per process)
+def get_slt_cache():
     try:
-        api = SLTAPI(USERNAME, PASSWORD)
-        return api
+        slt_cache = get_shared_cache()
+        response_cache.attach(slt_cache)
+        return slt_cache
     except Exception as e:
         logger.error(
             f"Failed to initialize SLTAPI",
@@ -107,11 +161,71 @@ def get_slt_api():
         )
         raise HTTPException(status_code=500, detail="SLT API client initialization failed")
 
-# Health check endpoint
+# Dependency to get SLT API client
+def get_slt_api():
+    return get_slt_cache().slt_api
+
+# SLT calls fetched at startup; the worker reports ready once they are cached
+WARMUP_TARGETS = [("get_usage_summary", SUBSCRIBER_ID)]
+WARMUP_MAX_BACKOFF = 60
+
+async def warm_up():
+    """Log in to SLT and fill the cache for WARMUP_TARGETS, retrying with backoff until it works."""
+    delay = 1
+    while True:
+        try:
+            slt_cache = await asyncio.to_thread(get_slt_cache)
+            for method, *args in WARMUP_TARGETS:
+                await slt_cache.get(method, *args)
+            app.state.slt_cache = slt_cache
+            logger.info(
+                "SLT tokens and cache warmed up",
+                extra={'event_type': 'warmup_complete', 'targets': [target[0] for target in WARMUP_TARGETS]}
+            )
+            return
+        except Exception as e:
+            logger.warning(
+                f"Warm-up failed, retrying in {delay}s",
+                extra={'event_type': 'warmup_failed', 'error': str(e), 'retry_in_seconds': delay}
+            )
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, WARMUP_MAX_BACKOFF)
+
+def readiness_checks() -> dict:
+    """
+    Whether this worker has logged in to SLT and has every warm-up call cached. An
+    expired token does not make the worker unready: it is renewed on the next call.
+    """
+    slt_cache = getattr(app.state, "slt_cache", None)
+    if slt_cache is None:
+        return {"tokens": False, "caches": False}
+    return {
+        "tokens": bool(slt_cache.slt_api.access_token),
+        "caches": all(slt_cache.peek(method, *args) is not None for method, *args in WARMUP_TARGETS),
+    }
+
+# Liveness: fails (503) when a background poller has stopped making progress
 @app.get("/health")
 async def health_check():
     logger.debug("Health check endpoint called", extra={'event_type': 'health_check'})
-    return {"status": "ok", "service": "MySLT Bot API"}
+    pollers = poller_status()
+    healthy = not any(status["stale"] for status in pollers)
+    return JSONResponse(
+        {"status": "ok" if healthy else "degraded", "service": "MySLT Bot API", "pollers": pollers},
+        status_code=200 if healthy else 503
+    )
+
+# Readiness: 503 until SLT tokens and caches are warm, so load balancers skip cold workers
+@app.get("/ready")
+async def readiness_check():
+    checks = readiness_checks()
+    ready = all(checks.values())
+    return JSONResponse({"status": "ready" if ready else "warming_up", "checks": checks}, status_code=200 if ready else 503)
+
+# Prometheus metrics endpoint
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(content=REGISTRY.render(), media_type=METRICS_CONTENT_TYPE)
 
 # Error handler for application exceptions
 @app.exception_handler(Exception)
@@ -138,6 +252,11 @@ async def startup_event():
             'event_type': 'server_startup'
         }
     )
+    app.state.slt_cache = None
+    app.state.warmup = asyncio.create_task(warm_up())
+    app.state.rate_limit_pruning = None
+    if RATE_LIMIT_ENABLED and isinstance(get_rate_limiter(), SQLiteBucketStore):
+        app.state.rate_limit_pruning = asyncio.create_task(get_rate_limiter().run_pruning())
 
 @app.on_event("shutdown")
 async def shutdown_event():
@@ -147,11 +266,18 @@ async def shutdown_event():
             'event_type': 'server_shutdown'
         }
     )
+    app.state.warmup.cancel()
+    if app.state.rate_limit_pruning:
+        app.state.rate_limit_pruning.cancel()
 
 # Include routers from other modules
-from api.routers import usage, profile, bills, vas
+from api.routers import usage, profile, bills, vas, dashboard, stream, export, batch
 
 app.include_router(usage.router)
 app.include_router(profile.router)
 app.include_router(bills.router)
-app.include_router(vas.router) 
\ No newline at end of file
+app.include_router(vas.router) 
+app.include_router(dashboard.router)
+app.include_router(stream.router)
+app.include_router(export.router)
+app.include_router(batch.router)
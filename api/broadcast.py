@@ -0,0 +1,109 @@
+import asyncio
+import json
+import logging
+from typing import Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class StreamEvent:
+    """
+    One published update, serialized once and shared by every subscriber.
+    """
+
+    def __init__(self, event: str, version: int, payload: dict):
+        self.event = event
+        self.version = version
+        self.data = json.dumps(payload, separators=(",", ":"))
+        self.sse = f"event: {event}\nid: {version}\ndata: {self.data}\n\n".encode()
+
+
+class Subscription:
+    def __init__(self, queue_size: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.evicted = False
+
+    async def next_event(self, timeout: float) -> Optional[StreamEvent]:
+        """
+        Waits up to `timeout` seconds for the next event.
+
+        Returns:
+            The next event, or None on timeout (time for a heartbeat).
+
+        Raises:
+            ConnectionAbortedError: If the subscriber was evicted for falling behind.
+        """
+        try:
+            event = await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if event is None:
+            raise ConnectionAbortedError("Subscriber evicted for falling behind")
+        return event
+
+
+class Broadcaster:
+    """
+    In-process fan-out of stream events to many idle connections.
+
+    Publishing is a non-blocking put into each subscriber's bounded queue; a
+    subscriber whose queue is full is evicted instead of slowing everyone else down.
+    """
+
+    def __init__(self, name: str, queue_size: int = 8, max_subscribers: int = 10000):
+        self.name = name
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self.latest: Optional[StreamEvent] = None
+        self._subscribers: Set[Subscription] = set()
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._subscribers)
+
+    def subscribe(self) -> Subscription:
+        """
+        Adds a subscriber, primed with the latest event if there is one.
+
+        Raises:
+            OverflowError: If the subscriber limit has been reached.
+        """
+        if len(self._subscribers) >= self.max_subscribers:
+            raise OverflowError(f"Too many {self.name} stream subscribers")
+        subscription = Subscription(self.queue_size)
+        if self.latest is not None:
+            subscription.queue.put_nowait(self.latest)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self._subscribers.discard(subscription)
+
+    def publish(self, event: StreamEvent):
+        self.latest = event
+        evicted = []
+        for subscription in self._subscribers:
+            try:
+                subscription.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                evicted.append(subscription)
+
+        for subscription in evicted:
+            # Drop the backlog and leave a sentinel so the consumer closes its connection
+            while not subscription.queue.empty():
+                subscription.queue.get_nowait()
+            subscription.queue.put_nowait(None)
+            subscription.evicted = True
+            self._subscribers.discard(subscription)
+        self.evictions += len(evicted)
+
+        logger.debug(
+            f"Published {event.event} event",
+            extra={
+                'event_type': 'stream_publish',
+                'stream': self.name,
+                'version': event.version,
+                'subscribers': len(self._subscribers),
+                'evicted': len(evicted)
+            }
+        )
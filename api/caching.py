@@ -0,0 +1,51 @@
+from fastapi import Request, Response
+from myslt.cache import SLTCache, Snapshot
+from typing import Optional
+import hashlib
+
+
+def snapshot_etag(request: Request, *snapshots: Snapshot) -> str:
+    """
+    Builds an ETag from the route (path and query) and the versions of the SLT snapshots it is rendered from.
+
+    The tag is weak: the same snapshot is served identity, gzip or brotli encoded,
+    and those bodies are equivalent but not byte-identical.
+    """
+    tag = hashlib.sha1(request.url.path.encode())
+    tag.update(request.url.query.encode())
+    for snapshot in snapshots:
+        tag.update(f"{snapshot.digest}:{snapshot.version}".encode())
+    return f'W/"{tag.hexdigest()[:20]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Checks an ETag against the request's If-None-Match header (weak comparison)."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque_tag = etag.removeprefix("W/")
+    candidates = (candidate.strip() for candidate in if_none_match.split(","))
+    return any(candidate.removeprefix("W/") == opaque_tag for candidate in candidates)
+
+
+def cache_headers(slt_cache: SLTCache, request: Request, *snapshots: Snapshot) -> dict:
+    """ETag and Cache-Control headers; max-age is the time left before the oldest snapshot expires."""
+    max_age = int(max(0, min(slt_cache.ttl - snapshot.age for snapshot in snapshots)))
+    return {
+        "ETag": snapshot_etag(request, *snapshots),
+        "Cache-Control": f"private, max-age={max_age}",
+    }
+
+
+def not_modified(request: Request, headers: dict) -> Optional[Response]:
+    """
+    Returns a 304 response if the client's copy matches the ETag in `headers`, else None.
+
+    Call this before building the response body so unchanged data is never re-serialized.
+    """
+    if etag_matches(request, headers["ETag"]):
+        # A 304 must carry the Vary of the 200 it stands for, so caches key it the same way
+        return Response(status_code=304, headers=dict(headers, Vary="Accept-Encoding"))
+    return None
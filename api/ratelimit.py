@@ -0,0 +1,174 @@
+from collections import OrderedDict
+from fastapi import Request
+from typing import Collection, Tuple
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def refill(tokens: float, updated: float, now: float, rate: float, burst: float) -> float:
+    """Tokens in a bucket at `now`, given its level at `updated`."""
+    return min(burst, tokens + max(0.0, now - updated) * rate)
+
+
+def take(tokens: float, cost: float, rate: float) -> Tuple[float, float]:
+    """
+    Tries to take `cost` tokens from a bucket holding `tokens`.
+
+    Returns:
+        Tuple[float, float]: The new token level and the seconds to wait before
+        retrying (0.0 if the tokens were taken).
+    """
+    if tokens >= cost:
+        return tokens - cost, 0.0
+    return tokens, (cost - tokens) / rate
+
+
+class MemoryBucketStore:
+    """
+    Token buckets kept in process memory. Buckets that have been idle long enough
+    to refill completely are indistinguishable from new ones, so the least recently
+    used are dropped once there are more than `max_keys`.
+    """
+
+    def __init__(self, rate: float, burst: float, max_keys: int = 10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def acquire(self, key: str, cost: float = 1.0) -> float:
+        return self.acquire_sync(key, cost)
+
+    def acquire_sync(self, key: str, cost: float = 1.0) -> float:
+        # A request can never cost more than a full bucket, or it could never succeed
+        cost = min(cost, self.burst)
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (self.burst, now))
+        tokens, retry_after = take(refill(tokens, updated, now, self.rate, self.burst), cost, self.rate)
+        self._buckets[key] = (tokens, now)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+
+class SQLiteBucketStore:
+    """
+    Token buckets in a SQLite database, shared by every API worker process on the host.
+
+    Each acquisition is one short write transaction; it runs in a worker thread so
+    lock contention between processes never blocks the event loop.
+    """
+
+    def __init__(self, path: str, rate: float, burst: float):
+        self.path = path
+        self.rate = rate
+        self.burst = burst
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_buckets (key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+        )
+
+    async def acquire(self, key: str, cost: float = 1.0) -> float:
+        return await asyncio.to_thread(self.acquire_sync, key, cost)
+
+    def acquire_sync(self, key: str, cost: float = 1.0) -> float:
+        cost = min(cost, self.burst)
+        # Wall-clock time, since the buckets are shared between processes
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT tokens, updated FROM rate_buckets WHERE key = ?", (key,)
+                ).fetchone()
+                tokens, updated = row if row else (self.burst, now)
+                tokens, retry_after = take(refill(tokens, updated, now, self.rate, self.burst), cost, self.rate)
+                self._conn.execute(
+                    "INSERT INTO rate_buckets (key, tokens, updated) VALUES (?, ?, ?) "
+                    "ON CONFLICT (key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated",
+                    (key, tokens, now)
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return retry_after
+
+    def prune(self, idle_seconds: float):
+        """Deletes buckets idle for longer than `idle_seconds` (they would be full again anyway)."""
+        with self._lock:
+            self._conn.execute("DELETE FROM rate_buckets WHERE updated < ?", (time.time() - idle_seconds,))
+
+    async def run_pruning(self, interval: float = 600.0):
+        """Prunes buckets that have refilled completely every `interval` seconds, until cancelled."""
+        # A bucket idle for burst / rate seconds is full, the same as a missing one
+        idle_seconds = max(self.burst / self.rate, 60.0)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.prune, idle_seconds)
+            except sqlite3.Error as e:
+                logger.warning(
+                    "Rate limit bucket pruning failed",
+                    extra={'event_type': 'rate_limit_prune_failed', 'error': str(e)}
+                )
+
+
+def client_key(request: Request, trust_proxy: bool = False, api_keys: Collection[str] = ()) -> str:
+    """
+    Identifies the client a request is charged to: its API key if it sent one listed
+    in `api_keys` (`X-API-Key`, hashed so keys never sit in memory or on disk), else
+    its IP address. Unknown keys are ignored, so a client cannot get a fresh bucket
+    by inventing keys.
+    """
+    api_key = request.headers.get("x-api-key")
+    if api_key and api_key in api_keys:
+        return "key:" + hashlib.sha256(api_key.encode()).hexdigest()[:16]
+    if trust_proxy:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return "ip:" + forwarded.split(",")[0].strip()
+    return "ip:" + (request.client.host if request.client else "unknown")
+
+
+_limiter = None
+
+
+def get_rate_limiter():
+    """Returns the process-wide bucket store configured by the RATE_LIMIT_* settings."""
+    global _limiter
+    if _limiter is None:
+        from config.config import API_WORKERS, RATE_LIMIT_RATE, RATE_LIMIT_BURST, RATE_LIMIT_STORE, RATE_LIMIT_DB_PATH
+        if RATE_LIMIT_STORE == "sqlite":
+            _limiter = SQLiteBucketStore(RATE_LIMIT_DB_PATH, RATE_LIMIT_RATE, RATE_LIMIT_BURST)
+        else:
+            _limiter = MemoryBucketStore(RATE_LIMIT_RATE, RATE_LIMIT_BURST)
+            if API_WORKERS > 1:
+                logger.warning(
+                    f"Rate limits are kept per worker: each of the {API_WORKERS} API workers allows the full "
+                    "rate and burst. Set RATE_LIMIT_STORE=sqlite to share them",
+                    extra={'event_type': 'rate_limiter_per_worker', 'workers': API_WORKERS}
+                )
+        logger.info(
+            "Rate limiter configured",
+            extra={
+                'event_type': 'rate_limiter_init',
+                'store': RATE_LIMIT_STORE,
+                'rate': RATE_LIMIT_RATE,
+                'burst': RATE_LIMIT_BURST
+            }
+        )
+    return _limiter
@@ -0,0 +1,146 @@
+from collections import OrderedDict
+from fastapi import Request, Response
+from config.config import RESPONSE_CACHE_SIZE
+from api.responses import MIN_COMPRESS_SIZE, compress, json_dumps, negotiate_encoding
+from myslt.cache import SLTCache, Snapshot
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class EncodedBody:
+    """
+    A serialized response body and its compressed variants, which are built on first request.
+    """
+
+    __slots__ = ("body", "variants")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.variants: Dict[str, bytes] = {}
+
+    def encoded(self, encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+        """Returns the body in `encoding` (None for identity) and the encoding actually used."""
+        if encoding is None or len(self.body) < MIN_COMPRESS_SIZE:
+            return self.body, None
+        variant = self.variants.get(encoding)
+        if variant is None:
+            variant = self.variants[encoding] = compress(self.body, encoding)
+        return variant, encoding
+
+
+class ResponseCache:
+    """
+    LRU cache of encoded JSON response bodies keyed by (route, params, snapshot versions).
+
+    A hit skips building, validating and serializing the payload. Entries are dropped
+    as soon as the SLT cache publishes a new version of a snapshot they were built from.
+    """
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, EncodedBody]" = OrderedDict()
+        # SLT cache key -> response cache keys built from it
+        self._dependents: Dict[Tuple, Set[Tuple]] = {}
+        self._source: Optional[SLTCache] = None
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def attach(self, slt_cache: SLTCache):
+        """Subscribes to new snapshot versions of `slt_cache`. Safe to call on every request."""
+        if self._source is slt_cache:
+            return
+        if self._source is not None:
+            self._source.unsubscribe(self.invalidate)
+            self.clear()
+        slt_cache.subscribe(self.invalidate)
+        self._source = slt_cache
+
+    @staticmethod
+    def entry_key(request: Request, snapshots: Tuple[Snapshot, ...]) -> Tuple:
+        params = tuple(sorted(request.query_params.multi_items()))
+        return (request.url.path, params) + tuple((snapshot.key, snapshot.version) for snapshot in snapshots)
+
+    def respond(self, request: Request, snapshots: Tuple[Snapshot, ...], build: Callable[[], Any],
+                headers: Optional[Dict[str, str]] = None) -> Response:
+        """
+        Returns the cached encoded response for this route and these snapshot versions,
+        calling `build()` for the payload only on a miss.
+
+        Args:
+            request: The incoming request; its path and query parameters are part of the key.
+            snapshots: The SLT snapshots the payload is built from.
+            build: Zero-argument callable returning the JSON-serializable payload.
+            headers: Extra response headers (ETag, Cache-Control).
+
+        Returns:
+            Response: The JSON response, compressed according to Accept-Encoding.
+        """
+        key = self.entry_key(request, snapshots)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+        else:
+            self.misses += 1
+            entry = EncodedBody(json_dumps(build()))
+            self._add(key, entry, snapshots)
+
+        body, encoding = entry.encoded(negotiate_encoding(request.headers.get("accept-encoding")))
+        response_headers = dict(headers or {})
+        response_headers["Vary"] = "Accept-Encoding"
+        if encoding:
+            response_headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type="application/json", headers=response_headers)
+
+    def _add(self, key: Tuple, entry: EncodedBody, snapshots: Tuple[Snapshot, ...]):
+        self._entries[key] = entry
+        for snapshot in snapshots:
+            self._dependents.setdefault(snapshot.key, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            oldest, _ = self._entries.popitem(last=False)
+            self._forget(oldest)
+
+    def _forget(self, key: Tuple):
+        for snapshot_key, _ in key[2:]:
+            dependents = self._dependents.get(snapshot_key)
+            if dependents is not None:
+                dependents.discard(key)
+                if not dependents:
+                    del self._dependents[snapshot_key]
+
+    def invalidate(self, snapshot_key: Tuple, snapshot: Optional[Snapshot] = None):
+        """SLT cache listener: drops every response built from an older version of `snapshot_key`."""
+        stale = self._dependents.pop(snapshot_key, set())
+        for key in stale:
+            if self._entries.pop(key, None) is not None:
+                self._forget(key)
+        self.invalidations += len(stale)
+        if stale:
+            logger.debug(
+                f"Invalidated {len(stale)} cached responses for {snapshot_key[0]}",
+                extra={
+                    'event_type': 'response_cache_invalidate',
+                    'api_method': snapshot_key[0],
+                    'entries': len(stale)
+                }
+            )
+
+    def clear(self):
+        self._entries.clear()
+        self._dependents.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'invalidations': self.invalidations,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'entries': len(self._entries),
+        }
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,105 @@
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from typing import Any, Dict, Iterable, Optional
+import gzip
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+# Bodies smaller than this are not worth compressing
+MIN_COMPRESS_SIZE = 512
+
+
+def json_dumps(content: Any) -> bytes:
+    """Serializes to compact JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse that renders with orjson when available."""
+
+    def render(self, content: Any) -> bytes:
+        return json_dumps(content)
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Picks the best supported content encoding from an Accept-Encoding header (br, then gzip)."""
+    if not accept_encoding:
+        return None
+    accepted = set()
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0"):
+            continue
+        accepted.add(coding.strip().lower())
+    if brotli is not None and ("br" in accepted or "*" in accepted):
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: Optional[str]) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=4)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=5)
+    return body
+
+
+def encoded_json_response(request: Request, content: Any, status_code: int = 200,
+                          headers: Optional[Dict[str, str]] = None) -> Response:
+    """
+    Serializes `content` and compresses it according to the request's Accept-Encoding.
+    """
+    body = json_dumps(content)
+    response_headers = dict(headers or {})
+    response_headers["Vary"] = "Accept-Encoding"
+    if len(body) >= MIN_COMPRESS_SIZE:
+        encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+        if encoding:
+            body = compress(body, encoding)
+            response_headers["Content-Encoding"] = encoding
+    return Response(content=body, status_code=status_code, media_type="application/json", headers=response_headers)
+
+
+def parse_fields(fields: Optional[str]) -> Optional[set]:
+    """Parses a comma-separated `fields=` query parameter."""
+    if not fields:
+        return None
+    return {field.strip() for field in fields.split(",") if field.strip()}
+
+
+def project(payload: Dict[str, Any], fields: Optional[Iterable[str]] = None, include_raw: bool = False,
+            items_key: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Applies a field projection to a response payload and drops `raw_data` unless requested.
+
+    Args:
+        payload: The response payload.
+        fields: Keys to keep; None keeps everything.
+        include_raw: Whether to keep the `raw_data` copy of the upstream data.
+        items_key: If set, the projection applies to each item of this list instead of the top level.
+    """
+    fields = set(fields) if fields else None
+    include_raw = include_raw or (fields is not None and "raw_data" in fields)
+
+    def select(item):
+        return {
+            key: value for key, value in item.items()
+            if (fields is None or key in fields) and (include_raw or key != "raw_data")
+        }
+
+    if items_key:
+        return {**payload, items_key: [select(item) for item in payload.get(items_key, [])]}
+    return select(payload)
@@ -0,0 +1,130 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from myslt.cache import SLTCache
+from config.config import SUBSCRIBER_ID, TP_NO, ACCOUNT_NO, BATCH_MAX_REQUESTS
+from api.app import get_slt_cache, rate_limited_response
+from api.ratelimit import get_rate_limiter
+from api.responses import encoded_json_response, parse_fields, project
+from api.routers.usage import build_usage_summary
+from api.routers.profile import build_profile_info
+from api.routers.bills import build_bill_status
+from api.routers.vas import build_vas_bundles
+from pydantic import BaseModel, Field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import asyncio
+import logging
+import time
+
+# Get logger
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/batch", tags=["Batch"])
+
+# Sub-request parameters naming the account, with the configured account as default
+ACCOUNT_PARAMS = {
+    "subscriber_id": SUBSCRIBER_ID,
+    "tp_no": TP_NO,
+    "account_no": ACCOUNT_NO,
+}
+
+def passthrough(data_bundle: Dict[str, Any]) -> Dict[str, Any]:
+    return data_bundle
+
+# Route -> (SLT cache method, account parameters, response builder, list key for projections)
+BATCH_ROUTES: Dict[str, Tuple[str, Tuple[str, ...], Callable, Optional[str]]] = {
+    "/usage/summary": ("get_usage_summary", ("subscriber_id",), build_usage_summary, None),
+    "/profile/info": ("get_profile", ("subscriber_id",), build_profile_info, None),
+    "/bills/status": ("get_bill_status", ("tp_no", "account_no"), build_bill_status, None),
+    "/bills/payment": ("get_bill_payment_request", ("tp_no", "account_no"), passthrough, None),
+    "/vas/bundles": ("get_vas_bundles", ("subscriber_id",), build_vas_bundles, "bundles"),
+    "/vas/extra-gb": ("get_extra_gb", ("subscriber_id",), passthrough, None),
+}
+
+class BatchItem(BaseModel):
+    route: str = Field(..., description=f"One of: {', '.join(BATCH_ROUTES)}")
+    params: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="Account parameters (subscriber_id, tp_no, account_no) plus optional fields and include_raw"
+    )
+
+class BatchRequest(BaseModel):
+    requests: List[BatchItem]
+
+class BatchResult(BaseModel):
+    route: str
+    status: int = Field(..., description="HTTP status the route would have returned")
+    body: Optional[Any] = None
+    error: Optional[str] = None
+
+class BatchResponse(BaseModel):
+    results: List[BatchResult]
+
+async def run_item(slt_cache: SLTCache, item: BatchItem) -> Dict[str, Any]:
+    """Runs one sub-request through the shared cache and returns its result entry."""
+    route = BATCH_ROUTES.get(item.route)
+    if route is None:
+        return {"route": item.route, "status": 404, "error": f"Unknown route '{item.route}'"}
+    method, account_params, build, items_key = route
+
+    unknown = set(item.params) - set(account_params) - {"fields", "include_raw"}
+    if unknown:
+        return {"route": item.route, "status": 400, "error": f"Unknown params: {', '.join(sorted(unknown))}"}
+    args = [str(item.params.get(name) or ACCOUNT_PARAMS[name]) for name in account_params]
+
+    try:
+        snapshot = await slt_cache.get(method, *args)
+    except Exception as e:
+        return {"route": item.route, "status": 500, "error": str(e)}
+    if not snapshot.data.get("isSuccess", False):
+        return {"route": item.route, "status": 400, "error": "The SLT API returned an unsuccessful response"}
+
+    fields = item.params.get("fields")
+    try:
+        body = project(
+            build(snapshot.data.get("dataBundle", {})),
+            parse_fields(fields) if isinstance(fields, str) else fields,
+            bool(item.params.get("include_raw", False)),
+            items_key=items_key
+        )
+    except Exception as e:
+        return {"route": item.route, "status": 500, "error": str(e)}
+    return {"route": item.route, "status": 200, "body": body}
+
+@router.post("", response_model=BatchResponse)
+async def run_batch(request: Request, batch: BatchRequest, slt_cache: SLTCache = Depends(get_slt_cache)):
+    """
+    Run several sub-requests in one call. Sub-requests run concurrently through the shared cache
+    (identical ones share a single SLT call, and at most SLT_MAX_CONCURRENCY SLT calls run at once).
+    Results are returned in request order, each with its own status.
+    """
+    if len(batch.requests) > BATCH_MAX_REQUESTS:
+        raise HTTPException(status_code=413, detail=f"At most {BATCH_MAX_REQUESTS} sub-requests per batch")
+
+    # Each sub-request costs one rate limit token (the middleware already took the first)
+    rate_limit_key = getattr(request.state, "rate_limit_key", None)
+    if rate_limit_key is not None and len(batch.requests) > 1:
+        limiter = get_rate_limiter()
+        # The stores cap a cost at the bucket size, so a larger batch would be undercharged
+        if len(batch.requests) > limiter.burst:
+            raise HTTPException(
+                status_code=413,
+                detail=f"At most {int(limiter.burst)} sub-requests per batch under the rate limit"
+            )
+        retry_after = await limiter.acquire(rate_limit_key, len(batch.requests) - 1)
+        if retry_after > 0:
+            return rate_limited_response(retry_after)
+
+    start_time = time.monotonic()
+    results = await asyncio.gather(*(run_item(slt_cache, item) for item in batch.requests))
+
+    failed = sum(1 for result in results if result["status"] != 200)
+    logger.info(
+        f"Batch of {len(results)} sub-requests completed",
+        extra={
+            'event_type': 'batch_complete',
+            'request_id': request.headers.get("X-Request-ID", "unknown"),
+            'sub_requests': len(results),
+            'failed': failed,
+            'duration_ms': round((time.monotonic() - start_time) * 1000, 2)
+        }
+    )
+    return encoded_json_response(request, {"results": results})
@@ -1,7 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
-from myslt.api import SLTAPI
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from myslt.cache import SLTCache
 from config.config import TP_NO, ACCOUNT_NO
-from api.app import get_slt_api
+from api.app import get_slt_cache
+from api.caching import cache_headers, not_modified
+from api.responses import parse_fields, project
+from api.response_cache import response_cache
 from pydantic import BaseModel
 from typing import Dict, Any, Optional
 
@@ -11,41 +14,74 @@ class BillStatusResponse(BaseModel):
     status: str
     amount: Optional[float] = None
     due_date: Optional[str] = None
-    raw_data: Dict[str, Any]
+    raw_data: Optional[Dict[str, Any]] = None  # Only included with include_raw=true
+
+def build_bill_status(data_bundle: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Extracts the bill status fields from the `dataBundle` of a bill status response
+    """
+    return {
+        "status": data_bundle.get("bill_code_desc", "Unknown"),
+        "amount": data_bundle.get("bill_value"),
+        "due_date": data_bundle.get("due_date"),
+        "raw_data": data_bundle
+    }
 
 @router.get("/status", response_model=BillStatusResponse)
-async def get_bill_status(slt_api: SLTAPI = Depends(get_slt_api)):
+async def get_bill_status(request: Request,
+                          fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+                          include_raw: bool = Query(False, description="Include the raw upstream data"),
+                          slt_cache: SLTCache = Depends(get_slt_cache)):
     """
     Get the current bill status
     """
     try:
-        bill_status = slt_api.get_bill_status(TP_NO, ACCOUNT_NO)
+        snapshot = await slt_cache.get("get_bill_status", TP_NO, ACCOUNT_NO)
+        bill_status = snapshot.data
         
         if not bill_status.get("isSuccess", False):
             raise HTTPException(status_code=400, detail="Failed to retrieve bill status")
         
-        data_bundle = bill_status.get("dataBundle", {})
+        headers = cache_headers(slt_cache, request, snapshot)
+        cached_response = not_modified(request, headers)
+        if cached_response is not None:
+            return cached_response
         
-        return {
-            "status": data_bundle.get("bill_code_desc", "Unknown"),
-            "amount": data_bundle.get("bill_value"),
-            "due_date": data_bundle.get("due_date"),
-            "raw_data": data_bundle
-        }
+        return response_cache.respond(
+            request, (snapshot,),
+            lambda: project(build_bill_status(bill_status.get("dataBundle", {})), parse_fields(fields), include_raw),
+            headers
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving bill status: {str(e)}")
 
 @router.get("/payment", response_model=Dict[str, Any])
-async def get_bill_payment_info(slt_api: SLTAPI = Depends(get_slt_api)):
+async def get_bill_payment_info(request: Request,
+                                fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+                                slt_cache: SLTCache = Depends(get_slt_cache)):
     """
     Get bill payment information
     """
     try:
-        payment_info = slt_api.get_bill_payment_request(TP_NO, ACCOUNT_NO)
+        snapshot = await slt_cache.get("get_bill_payment_request", TP_NO, ACCOUNT_NO)
+        payment_info = snapshot.data
         
         if not payment_info.get("isSuccess", False):
             raise HTTPException(status_code=400, detail="Failed to retrieve bill payment information")
         
-        return payment_info.get("dataBundle", {})
+        headers = cache_headers(slt_cache, request, snapshot)
+        cached_response = not_modified(request, headers)
+        if cached_response is not None:
+            return cached_response
+        
+        return response_cache.respond(
+            request, (snapshot,),
+            lambda: project(payment_info.get("dataBundle", {}), parse_fields(fields), include_raw=True),
+            headers
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving bill payment information: {str(e)}") 
\ No newline at end of file
@@ -0,0 +1,82 @@
+from fastapi import APIRouter, Depends, Query, Request
+from myslt.cache import SLTCache
+from config.config import SUBSCRIBER_ID, TP_NO, ACCOUNT_NO
+from api.app import get_slt_cache
+from api.caching import cache_headers, not_modified
+from api.responses import encoded_json_response, project
+from api.response_cache import response_cache
+from api.routers.usage import UsageSummaryResponse, build_usage_summary
+from api.routers.profile import ProfileResponse, build_profile_info
+from api.routers.bills import BillStatusResponse, build_bill_status
+from api.routers.vas import VASBundlesResponse, build_vas_bundles
+from pydantic import BaseModel, Field
+from typing import Dict, Optional
+import asyncio
+import logging
+
+# Get logger
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
+
+# Dashboard section -> (SLT cache method, arguments, response builder)
+SECTIONS = {
+    "usage": ("get_usage_summary", (SUBSCRIBER_ID,), build_usage_summary),
+    "profile": ("get_profile", (SUBSCRIBER_ID,), build_profile_info),
+    "bill": ("get_bill_status", (TP_NO, ACCOUNT_NO), build_bill_status),
+    "vas": ("get_vas_bundles", (SUBSCRIBER_ID,), build_vas_bundles),
+}
+
+class DashboardResponse(BaseModel):
+    usage: Optional[UsageSummaryResponse] = None
+    profile: Optional[ProfileResponse] = None
+    bill: Optional[BillStatusResponse] = None
+    vas: Optional[VASBundlesResponse] = None
+    errors: Dict[str, str] = Field(default_factory=dict, description="Sections that could not be loaded")
+
+@router.get("", response_model=DashboardResponse)
+async def get_dashboard(request: Request,
+                        include_raw: bool = Query(False, description="Include the raw upstream data"),
+                        slt_cache: SLTCache = Depends(get_slt_cache)):
+    """
+    Get usage, profile, bill status and VAS bundles in one response.
+    The SLT calls run concurrently and are served from the shared cache when fresh.
+    """
+    request_id = request.headers.get("X-Request-ID", "unknown")
+    results = await asyncio.gather(
+        *(slt_cache.get(method, *args) for method, args, _ in SECTIONS.values()),
+        return_exceptions=True
+    )
+
+    def build():
+        response_data = {"errors": {}}
+        for (section, (method, _, build_section)), result in zip(SECTIONS.items(), results):
+            if isinstance(result, Exception):
+                response_data["errors"][section] = str(result)
+            elif not result.data.get("isSuccess", False):
+                response_data["errors"][section] = "The SLT API returned an unsuccessful response"
+            else:
+                response_data[section] = project(
+                    build_section(result.data.get("dataBundle", {})), include_raw=include_raw,
+                    items_key="bundles" if section == "vas" else None
+                )
+        return response_data
+
+    # Only a fully loaded dashboard is cacheable
+    if all(not isinstance(result, Exception) and result.data.get("isSuccess", False) for result in results):
+        headers = cache_headers(slt_cache, request, *results)
+        cached_response = not_modified(request, headers)
+        if cached_response is not None:
+            return cached_response
+        return response_cache.respond(request, tuple(results), build, headers)
+
+    response_data = build()
+    logger.warning(
+        "Dashboard returned with missing sections",
+        extra={
+            'event_type': 'dashboard_partial',
+            'request_id': request_id,
+            'errors': response_data["errors"]
+        }
+    )
+    return encoded_json_response(request, response_data)
@@ -0,0 +1,47 @@
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from api.routers.usage import resolve_range
+from myslt.export import FORMATS, export_chunks
+from datetime import datetime
+from typing import List, Optional
+import logging
+
+# Get logger
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/export", tags=["Export"])
+
+@router.get("/{kind}")
+async def export_history(
+    kind: str,
+    format: str = Query("csv", description=f"One of: {', '.join(FORMATS)}"),
+    start: Optional[datetime] = Query(None, alias="from", description="Range start (ISO 8601, default: all history)"),
+    end: Optional[datetime] = Query(None, alias="to", description="Range end (ISO 8601, default now)"),
+    account: Optional[List[str]] = Query(None, description="Only export these accounts (repeatable)"),
+):
+    """
+    Stream the stored usage samples, bill snapshots or VAS snapshots as CSV, NDJSON or Parquet
+    """
+    since, until = resolve_range(start, end, default_days=None)
+    try:
+        chunks = export_chunks(kind, format, since, until, account)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+
+    logger.info(
+        f"Exporting {kind} history as {format}",
+        extra={
+            'event_type': 'history_export',
+            'kind': kind,
+            'format': format,
+            'accounts': len(account) if account else None
+        }
+    )
+    # Sync generators are iterated in the threadpool, so SQLite reads stay off the event loop
+    return StreamingResponse(
+        chunks,
+        media_type=FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{kind}_history.{format}"'}
+    )
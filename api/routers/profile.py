@@ -1,7 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
-from myslt.api import SLTAPI
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from myslt.cache import SLTCache
 from config.config import SUBSCRIBER_ID
-from api.app import get_slt_api
+from api.app import get_slt_cache
+from api.caching import cache_headers, not_modified
+from api.responses import parse_fields, project
+from api.response_cache import response_cache
 from pydantic import BaseModel
 from typing import Dict, Optional, Any
 
@@ -12,27 +15,48 @@ class ProfileResponse(BaseModel):
     package: str
     contact_no: Optional[str] = None
     email: Optional[str] = None
-    raw_data: Dict[str, Any]  # Include raw data for additional fields
+    mobile_no: Optional[str] = None
+    raw_data: Optional[Dict[str, Any]] = None  # Only included with include_raw=true
+
+def build_profile_info(data_bundle: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Extracts the profile fields from the `dataBundle` of a profile response
+    """
+    return {
+        "fullname": data_bundle.get("fullname", "Unknown"),
+        "package": data_bundle.get("subscriber_package_display", "Unknown"),
+        "contact_no": data_bundle.get("contact_no"),
+        "email": data_bundle.get("email"),
+        "mobile_no": data_bundle.get("mobile_no"),
+        "raw_data": data_bundle  # Include all data for additional fields
+    }
 
 @router.get("/info", response_model=ProfileResponse)
-async def get_profile_info(slt_api: SLTAPI = Depends(get_slt_api)):
+async def get_profile_info(request: Request,
+                           fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+                           include_raw: bool = Query(False, description="Include the raw upstream data"),
+                           slt_cache: SLTCache = Depends(get_slt_cache)):
     """
     Get the user's profile information
     """
     try:
-        profile = slt_api.get_profile(SUBSCRIBER_ID)
+        snapshot = await slt_cache.get("get_profile", SUBSCRIBER_ID)
+        profile = snapshot.data
         
         if not profile.get("isSuccess", False):
             raise HTTPException(status_code=400, detail="Failed to retrieve profile data")
         
-        data_bundle = profile.get("dataBundle", {})
+        headers = cache_headers(slt_cache, request, snapshot)
+        cached_response = not_modified(request, headers)
+        if cached_response is not None:
+            return cached_response
         
-        return {
-            "fullname": data_bundle.get("fullname", "Unknown"),
-            "package": data_bundle.get("subscriber_package_display", "Unknown"),
-            "contact_no": data_bundle.get("contact_no"),
-            "email": data_bundle.get("email"),
-            "raw_data": data_bundle  # Include all data for additional fields
-        }
+        return response_cache.respond(
+            request, (snapshot,),
+            lambda: project(build_profile_info(profile.get("dataBundle", {})), parse_fields(fields), include_raw),
+            headers
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving profile data: {str(e)}") 
\ No newline at end of file
@@ -0,0 +1,124 @@
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from config.config import (
+    SUBSCRIBER_ID, USAGE_POLL_INTERVAL,
+    STREAM_HEARTBEAT_INTERVAL, STREAM_QUEUE_SIZE, STREAM_MAX_SUBSCRIBERS,
+)
+from api.app import WARMUP_MAX_BACKOFF, get_slt_cache
+from api.broadcast import Broadcaster, StreamEvent
+from api.routers.usage import build_usage_summary
+from myslt.poller import get_shared_poller
+import asyncio
+import logging
+
+# Get logger
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/stream", tags=["Stream"])
+
+usage_broadcaster = Broadcaster("usage", queue_size=STREAM_QUEUE_SIZE, max_subscribers=STREAM_MAX_SUBSCRIBERS)
+usage_poller = None
+usage_stream_setup = None
+
+def publish_usage_snapshot(key, snapshot):
+    """Cache listener: push each new usage snapshot to the stream subscribers."""
+    if key[0] != "get_usage_summary":
+        return
+    usage_broadcaster.publish(
+        StreamEvent("usage", snapshot.version, build_usage_summary(snapshot.data.get("dataBundle", {})))
+    )
+
+async def attach_usage_poller():
+    """
+    Subscribe the stream to the SLT cache and start the usage poller once the cache
+    exists. Creating it logs in to SLT, so it runs in a thread and is retried with
+    backoff until it succeeds.
+    """
+    global usage_poller
+    delay = 1
+    while True:
+        try:
+            slt_cache = await asyncio.to_thread(get_slt_cache)
+            break
+        except HTTPException:
+            logger.error(
+                f"Usage stream unavailable: SLT API client not ready, retrying in {delay}s",
+                extra={'event_type': 'stream_disabled', 'retry_in_seconds': delay}
+            )
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, WARMUP_MAX_BACKOFF)
+    slt_cache.subscribe(publish_usage_snapshot)
+    # Same "poller" election as the bot, so a bot running in another process (or another
+    # API worker) does not poll the same usage summary as well
+    usage_poller = get_shared_poller(
+        slt_cache, [("get_usage_summary", SUBSCRIBER_ID)], USAGE_POLL_INTERVAL, leader_only=True
+    )
+    usage_poller.start()
+
+@router.on_event("startup")
+async def start_usage_poller():
+    global usage_stream_setup
+    usage_stream_setup = asyncio.create_task(attach_usage_poller())
+
+@router.on_event("shutdown")
+async def stop_usage_poller():
+    if usage_stream_setup is not None:
+        usage_stream_setup.cancel()
+    if usage_poller is not None:
+        usage_poller.stop()
+
+@router.get("/usage")
+async def stream_usage():
+    """
+    Server-Sent Events stream of usage summaries. An event is pushed only when the
+    backend poller sees new usage data; comment lines are sent as heartbeats.
+    """
+    try:
+        subscription = usage_broadcaster.subscribe()
+    except OverflowError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    async def events():
+        try:
+            yield f"retry: {int(STREAM_HEARTBEAT_INTERVAL * 1000)}\n\n".encode()
+            while True:
+                event = await subscription.next_event(STREAM_HEARTBEAT_INTERVAL)
+                yield event.sse if event is not None else b": heartbeat\n\n"
+        except ConnectionAbortedError:
+            logger.info("Slow usage stream consumer evicted", extra={'event_type': 'stream_consumer_evicted'})
+        finally:
+            usage_broadcaster.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.websocket("/usage/ws")
+async def stream_usage_ws(websocket: WebSocket):
+    """
+    WebSocket variant of the usage stream. Sends the usage summary JSON on each change
+    and `{"type": "heartbeat"}` when idle.
+    """
+    await websocket.accept()
+    try:
+        subscription = usage_broadcaster.subscribe()
+    except OverflowError:
+        await websocket.close(code=1013)
+        return
+
+    try:
+        while True:
+            event = await subscription.next_event(STREAM_HEARTBEAT_INTERVAL)
+            if event is None:
+                await websocket.send_text('{"type":"heartbeat"}')
+            else:
+                await websocket.send_text(event.data)
+    except ConnectionAbortedError:
+        logger.info("Slow usage WebSocket consumer evicted", extra={'event_type': 'stream_consumer_evicted'})
+        await websocket.close(code=1008)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        usage_broadcaster.unsubscribe(subscription)
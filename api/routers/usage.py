@@ -1,9 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
-from myslt.api import SLTAPI
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from myslt.cache import SLTCache
 from config.config import SUBSCRIBER_ID
-from api.app import get_slt_api
+from tasks.usage_chart import get_chart_renderer, RANGES, DEFAULT_RANGE
+from api.app import get_slt_cache
+from api.caching import cache_headers, not_modified
+from api.responses import json_dumps, parse_fields, project
+from api.response_cache import response_cache
+from myslt.history import BUCKETS, LOCAL_UTC_OFFSET, get_usage_history
 from pydantic import BaseModel, Field
-from typing import Optional
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, Optional, Tuple
+import asyncio
+import time
 import logging
 
 # Get logger
@@ -11,6 +20,10 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/usage", tags=["Usage"])
 
+LOCAL_TZ = timezone(timedelta(seconds=LOCAL_UTC_OFFSET))
+DEFAULT_HISTORY_DAYS = 7
+STREAM_BATCH_ROWS = 500
+
 class UsageDetail(BaseModel):
     used: float = Field(..., description="Amount of data used in GB")
     limit: float = Field(..., description="Data limit in GB")
@@ -25,8 +38,81 @@ class UsageSummaryResponse(BaseModel):
     nighttime: UsageDetail = Field(..., description="Nighttime (Free) data usage")
     reported_time: Optional[str] = Field(None, description="Time when usage was reported")
 
+def build_usage_summary(data_bundle: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Computes the usage summary, split into daytime (Standard) and nighttime (Free) usage,
+    from the `dataBundle` of a usage summary response
+    """
+    my_package_summary = data_bundle.get("my_package_summary", {})
+    my_package_info = data_bundle.get("my_package_info", {})
+    usage_details = my_package_info.get("usageDetails", [])
+    reported_time = my_package_info.get("reported_time")
+    
+    # Get total usage
+    total_used = float(my_package_summary.get("used", 0))
+    total_limit = float(my_package_summary.get("limit", 1))  # Default to 1 to avoid division by zero
+    total_percentage = (total_used / total_limit) * 100 if total_limit > 0 else 0
+    
+    # Initialize daytime and nighttime usage with default values
+    daytime_usage = {
+        "used": 0.0,
+        "limit": 0.0,
+        "remaining": 0.0,
+        "percentage": 0.0
+    }
+    
+    nighttime_usage = {
+        "used": 0.0,
+        "limit": 0.0,
+        "remaining": 0.0,
+        "percentage": 0.0
+    }
+    
+    # Find standard (daytime) and calculate nighttime usage
+    for detail in usage_details:
+        if detail.get("name") == "Standard":
+            # Standard/daytime data
+            daytime_limit = float(detail.get("limit", 0))
+            daytime_used = float(detail.get("used", 0))
+            daytime_remaining = float(detail.get("remaining", 0))
+            daytime_percentage = (daytime_used / daytime_limit) * 100 if daytime_limit > 0 else 0
+            
+            daytime_usage = {
+                "used": daytime_used,
+                "limit": daytime_limit,
+                "remaining": daytime_remaining,
+                "percentage": daytime_percentage
+            }
+            
+            # Calculate nighttime/free usage (total - standard)
+            nighttime_limit = total_limit - daytime_limit
+            nighttime_used = max(0, total_used - daytime_used)  # Ensure we don't get negative values
+            nighttime_remaining = max(0, nighttime_limit - nighttime_used)
+            nighttime_percentage = (nighttime_used / nighttime_limit) * 100 if nighttime_limit > 0 else 0
+            
+            nighttime_usage = {
+                "used": nighttime_used,
+                "limit": nighttime_limit,
+                "remaining": nighttime_remaining,
+                "percentage": nighttime_percentage
+            }
+            break
+    
+    response_data = {
+        "total_used": total_used,
+        "total_limit": total_limit,
+        "total_percentage": total_percentage,
+        "daytime": daytime_usage,
+        "nighttime": nighttime_usage,
+        "reported_time": reported_time
+    }
+
+    return response_data
+
 @router.get("/summary", response_model=UsageSummaryResponse)
-async def get_usage_summary(request: Request, slt_api: SLTAPI = Depends(get_slt_api)):
+async def get_usage_summary(request: Request,
+                            fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+                            slt_cache: SLTCache = Depends(get_slt_cache)):
     """
     Get the current data usage summary, separated into daytime (Standard) and nighttime (Free) usage
     """
@@ -41,7 +127,8 @@ async def get_usage_summary(request: Request, slt_api: SLTAPI = Depends(get_slt_
     )
     
     try:
-        usage = slt_api.get_usage_summary(SUBSCRIBER_ID)
+        snapshot = await slt_cache.get("get_usage_summary", SUBSCRIBER_ID)
+        usage = snapshot.data
         
         if not usage.get("isSuccess", False):
             logger.warning(
@@ -55,84 +142,27 @@ async def get_usage_summary(request: Request, slt_api: SLTAPI = Depends(get_slt_
             )
             raise HTTPException(status_code=400, detail="Failed to retrieve usage data")
         
-        data_bundle = usage.get("dataBundle", {})
-        my_package_summary = data_bundle.get("my_package_summary", {})
-        my_package_info = data_bundle.get("my_package_info", {})
-        usage_details = my_package_info.get("usageDetails", [])
-        reported_time = my_package_info.get("reported_time")
+        headers = cache_headers(slt_cache, request, snapshot)
+        cached_response = not_modified(request, headers)
+        if cached_response is not None:
+            return cached_response
         
-        # Get total usage
-        total_used = float(my_package_summary.get("used", 0))
-        total_limit = float(my_package_summary.get("limit", 1))  # Default to 1 to avoid division by zero
-        total_percentage = (total_used / total_limit) * 100 if total_limit > 0 else 0
-        
-        # Initialize daytime and nighttime usage with default values
-        daytime_usage = {
-            "used": 0.0,
-            "limit": 0.0,
-            "remaining": 0.0,
-            "percentage": 0.0
-        }
-        
-        nighttime_usage = {
-            "used": 0.0,
-            "limit": 0.0,
-            "remaining": 0.0,
-            "percentage": 0.0
-        }
-        
-        # Find standard (daytime) and calculate nighttime usage
-        for detail in usage_details:
-            if detail.get("name") == "Standard":
-                # Standard/daytime data
-                daytime_limit = float(detail.get("limit", 0))
-                daytime_used = float(detail.get("used", 0))
-                daytime_remaining = float(detail.get("remaining", 0))
-                daytime_percentage = (daytime_used / daytime_limit) * 100 if daytime_limit > 0 else 0
-                
-                daytime_usage = {
-                    "used": daytime_used,
-                    "limit": daytime_limit,
-                    "remaining": daytime_remaining,
-                    "percentage": daytime_percentage
-                }
-                
-                # Calculate nighttime/free usage (total - standard)
-                nighttime_limit = total_limit - daytime_limit
-                nighttime_used = max(0, total_used - daytime_used)  # Ensure we don't get negative values
-                nighttime_remaining = max(0, nighttime_limit - nighttime_used)
-                nighttime_percentage = (nighttime_used / nighttime_limit) * 100 if nighttime_limit > 0 else 0
-                
-                nighttime_usage = {
-                    "used": nighttime_used,
-                    "limit": nighttime_limit,
-                    "remaining": nighttime_remaining,
-                    "percentage": nighttime_percentage
+        def build():
+            response_data = build_usage_summary(usage.get("dataBundle", {}))
+            logger.debug(
+                "Usage summary data processed successfully", 
+                extra={
+                    'event_type': 'usage_summary_success',
+                    'request_id': request_id,
+                    'total_used': response_data["total_used"],
+                    'total_limit': response_data["total_limit"],
+                    'daytime_used': response_data["daytime"]["used"],
+                    'nighttime_used': response_data["nighttime"]["used"]
                 }
-                break
-        
-        response_data = {
-            "total_used": total_used,
-            "total_limit": total_limit,
-            "total_percentage": total_percentage,
-            "daytime": daytime_usage,
-            "nighttime": nighttime_usage,
-            "reported_time": reported_time
-        }
-        
-        logger.debug(
-            "Usage summary data processed successfully", 
-            extra={
-                'event_type': 'usage_summary_success',
-                'request_id': request_id,
-                'total_used': total_used,
-                'total_limit': total_limit,
-                'daytime_used': daytime_usage["used"],
-                'nighttime_used': nighttime_usage["used"]
-            }
-        )
+            )
+            return project(response_data, parse_fields(fields))
         
-        return response_data
+        return response_cache.respond(request, (snapshot,), build, headers)
     except HTTPException:
         # Re-raise HTTP exceptions without wrapping
         raise
@@ -147,4 +177,157 @@ async def get_usage_summary(request: Request, slt_api: SLTAPI = Depends(get_slt_
                 'error_type': type(e).__name__
             }
         )
-        raise HTTPException(status_code=500, detail=f"Error retrieving usage data: {str(e)}") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error retrieving usage data: {str(e)}") 
+
+@router.get("/chart.png", response_class=Response, responses={200: {"content": {"image/png": {}}}})
+async def get_usage_chart(range: str = Query(DEFAULT_RANGE, description=f"One of: {', '.join(RANGES)}")):
+    """
+    Get a PNG chart of daytime and nighttime usage over time from the stored usage history
+    """
+    if range not in RANGES:
+        raise HTTPException(status_code=400, detail=f"Unknown range '{range}'. Use one of: {', '.join(RANGES)}")
+
+    try:
+        png = await get_chart_renderer().render(SUBSCRIBER_ID, range)
+    except Exception as e:
+        logger.error(
+            "Error rendering usage chart",
+            exc_info=True,
+            extra={
+                'event_type': 'usage_chart_error',
+                'error': str(e),
+                'error_type': type(e).__name__
+            }
+        )
+        raise HTTPException(status_code=500, detail=f"Error rendering usage chart: {str(e)}")
+
+    if png is None:
+        raise HTTPException(status_code=404, detail="No usage history recorded yet")
+    return Response(content=png, media_type="image/png")
+
+class UsageStatsResponse(BaseModel):
+    start: str = Field(..., alias="from", description="Start of the range (ISO 8601, Sri Lanka time)")
+    end: str = Field(..., alias="to", description="End of the range (ISO 8601, Sri Lanka time)")
+    total_used: float = Field(..., description="Data used in the range in GB")
+    day_used: float = Field(..., description="Daytime (Standard) data used in GB")
+    night_used: float = Field(..., description="Nighttime (Free) data used in GB")
+    hours: int = Field(..., description="Number of hours with recorded samples")
+    hourly_p50: float = Field(..., description="Median hourly usage in GB")
+    hourly_p95: float = Field(..., description="95th percentile hourly usage in GB")
+    hourly_p99: float = Field(..., description="99th percentile hourly usage in GB")
+    peak_hour: Optional[int] = Field(None, description="Local hour of day (0-23) with the highest average usage")
+    peak_hour_average: Optional[float] = Field(None, description="Average usage in GB during the peak hour")
+    average_daily_burn: float = Field(..., description="Average data used per day in GB")
+
+def to_local_iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, LOCAL_TZ).isoformat()
+
+def resolve_range(start: Optional[datetime], end: Optional[datetime],
+                  default_days: Optional[float] = DEFAULT_HISTORY_DAYS) -> Tuple[float, float]:
+    """
+    Converts the `from`/`to` query parameters to Unix timestamps. Naive datetimes are
+    taken as Sri Lanka time; without `from` the range covers the last `default_days`
+    days, or everything if `default_days` is None.
+    """
+    def timestamp(value: datetime) -> float:
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=LOCAL_TZ)
+        return value.timestamp()
+
+    until = timestamp(end) if end is not None else time.time()
+    if start is not None:
+        since = timestamp(start)
+    else:
+        since = until - default_days * 86400 if default_days is not None else 0.0
+    if since >= until:
+        raise HTTPException(status_code=400, detail="'from' must be before 'to'")
+    return since, until
+
+def history_points(rows: Iterator[Tuple], split: bool) -> Iterator[Dict[str, Any]]:
+    for start, day_used, night_used, samples in rows:
+        point = {"start": to_local_iso(start), "used": round(day_used + night_used, 4), "samples": samples}
+        if split:
+            point["day_used"] = round(day_used, 4)
+            point["night_used"] = round(night_used, 4)
+        yield point
+
+def stream_history_json(rows: Iterator[Tuple], bucket: str, split: bool, since: float, until: float) -> Iterator[bytes]:
+    header = json_dumps({"bucket": bucket, "from": to_local_iso(since), "to": to_local_iso(until)})
+    yield header[:-1] + b',"points":['
+    batch = []
+    first = True
+    for point in history_points(rows, split):
+        batch.append(json_dumps(point))
+        if len(batch) >= STREAM_BATCH_ROWS:
+            yield (b"" if first else b",") + b",".join(batch)
+            batch, first = [], False
+    if batch:
+        yield (b"" if first else b",") + b",".join(batch)
+    yield b"]}"
+
+def stream_history_csv(rows: Iterator[Tuple], split: bool) -> Iterator[bytes]:
+    columns = ["start", "used", "samples"] + (["day_used", "night_used"] if split else [])
+    yield (",".join(columns) + "\n").encode()
+    batch = []
+    for point in history_points(rows, split):
+        batch.append(",".join(str(point[column]) for column in columns))
+        if len(batch) >= STREAM_BATCH_ROWS:
+            yield ("\n".join(batch) + "\n").encode()
+            batch = []
+    if batch:
+        yield ("\n".join(batch) + "\n").encode()
+
+@router.get("/history")
+async def get_usage_history_series(
+    start: Optional[datetime] = Query(None, alias="from", description="Range start (ISO 8601, default 7 days ago)"),
+    end: Optional[datetime] = Query(None, alias="to", description="Range end (ISO 8601, default now)"),
+    bucket: str = Query("hour", description=f"One of: {', '.join(BUCKETS)}"),
+    split: Optional[str] = Query(None, description="Set to 'day_night' to split daytime and nighttime usage"),
+    format: str = Query("json", description="json or csv"),
+):
+    """
+    Get data used per hour or per day from the stored usage history, streamed as JSON or CSV
+    """
+    if bucket not in BUCKETS:
+        raise HTTPException(status_code=400, detail=f"Unknown bucket '{bucket}'. Use one of: {', '.join(BUCKETS)}")
+    if split not in (None, "day_night"):
+        raise HTTPException(status_code=400, detail="split must be 'day_night'")
+    if format not in ("json", "csv"):
+        raise HTTPException(status_code=400, detail="format must be 'json' or 'csv'")
+    since, until = resolve_range(start, end)
+
+    rows = get_usage_history().iter_buckets(SUBSCRIBER_ID, since, until, bucket)
+    # Sync generators are iterated in the threadpool, so SQLite reads stay off the event loop
+    if format == "csv":
+        return StreamingResponse(
+            stream_history_csv(rows, split is not None),
+            media_type="text/csv",
+            headers={"Content-Disposition": f'attachment; filename="usage_{bucket}.csv"'}
+        )
+    return StreamingResponse(
+        stream_history_json(rows, bucket, split is not None, since, until), media_type="application/json"
+    )
+
+@router.get("/stats", response_model=UsageStatsResponse)
+async def get_usage_stats(
+    start: Optional[datetime] = Query(None, alias="from", description="Range start (ISO 8601, default 7 days ago)"),
+    end: Optional[datetime] = Query(None, alias="to", description="Range end (ISO 8601, default now)"),
+):
+    """
+    Get hourly usage percentiles, the peak hour and the average daily burn over a range
+    """
+    since, until = resolve_range(start, end)
+    try:
+        stats = await asyncio.to_thread(get_usage_history().usage_stats, SUBSCRIBER_ID, since, until)
+    except Exception as e:
+        logger.error(
+            "Error computing usage stats",
+            exc_info=True,
+            extra={
+                'event_type': 'usage_stats_error',
+                'error': str(e),
+                'error_type': type(e).__name__
+            }
+        )
+        raise HTTPException(status_code=500, detail=f"Error computing usage stats: {str(e)}")
+    return {"from": to_local_iso(since), "to": to_local_iso(until), **stats}
@@ -1,7 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
-from myslt.api import SLTAPI
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from myslt.cache import SLTCache
 from config.config import SUBSCRIBER_ID
-from api.app import get_slt_api
+from api.app import get_slt_cache
+from api.caching import cache_headers, not_modified
+from api.responses import parse_fields, project
+from api.response_cache import response_cache
 from pydantic import BaseModel
 from typing import Dict, Any, List, Optional
 
@@ -12,50 +15,85 @@ class VASBundleDetail(BaseModel):
     used: Optional[str] = None
     expiry_date: Optional[str] = None
     description: Optional[str] = None
-    raw_data: Dict[str, Any]
+    raw_data: Optional[Dict[str, Any]] = None  # Only included with include_raw=true
 
 class VASBundlesResponse(BaseModel):
     bundles: List[VASBundleDetail]
 
+def build_vas_bundles(data_bundle: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Extracts the bundle list from the `dataBundle` of a VAS bundles response
+    """
+    bundles = []
+    for detail in data_bundle.get("usageDetails", []):
+        bundles.append({
+            "name": detail.get("name", "Unknown"),
+            "used": detail.get("used"),
+            "expiry_date": detail.get("expiry_date"),
+            "description": detail.get("description"),
+            "raw_data": detail
+        })
+    
+    return {"bundles": bundles}
+
 @router.get("/bundles", response_model=VASBundlesResponse)
-async def get_vas_bundles(slt_api: SLTAPI = Depends(get_slt_api)):
+async def get_vas_bundles(request: Request,
+                          fields: Optional[str] = Query(None, description="Comma-separated bundle fields to return"),
+                          include_raw: bool = Query(False, description="Include the raw upstream data per bundle"),
+                          slt_cache: SLTCache = Depends(get_slt_cache)):
     """
     Get VAS (Value-Added Services) bundles information
     """
     try:
-        vas_bundles = slt_api.get_vas_bundles(SUBSCRIBER_ID)
+        snapshot = await slt_cache.get("get_vas_bundles", SUBSCRIBER_ID)
+        vas_bundles = snapshot.data
         
         if not vas_bundles.get("isSuccess", False):
             raise HTTPException(status_code=400, detail="Failed to retrieve VAS bundles information")
         
-        data_bundle = vas_bundles.get("dataBundle", {})
-        usage_details = data_bundle.get("usageDetails", [])
+        headers = cache_headers(slt_cache, request, snapshot)
+        cached_response = not_modified(request, headers)
+        if cached_response is not None:
+            return cached_response
         
-        bundles = []
-        for detail in usage_details:
-            bundles.append({
-                "name": detail.get("name", "Unknown"),
-                "used": detail.get("used"),
-                "expiry_date": detail.get("expiry_date"),
-                "description": detail.get("description"),
-                "raw_data": detail
-            })
-        
-        return {"bundles": bundles}
+        return response_cache.respond(
+            request, (snapshot,),
+            lambda: project(
+                build_vas_bundles(vas_bundles.get("dataBundle", {})), parse_fields(fields), include_raw,
+                items_key="bundles"
+            ),
+            headers
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving VAS bundles information: {str(e)}")
 
 @router.get("/extra-gb", response_model=Dict[str, Any])
-async def get_extra_gb(slt_api: SLTAPI = Depends(get_slt_api)):
+async def get_extra_gb(request: Request,
+                       fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+                       slt_cache: SLTCache = Depends(get_slt_cache)):
     """
     Get Extra GB information
     """
     try:
-        extra_gb = slt_api.get_extra_gb(SUBSCRIBER_ID)
+        snapshot = await slt_cache.get("get_extra_gb", SUBSCRIBER_ID)
+        extra_gb = snapshot.data
         
         if not extra_gb.get("isSuccess", False):
             raise HTTPException(status_code=400, detail="Failed to retrieve Extra GB information")
         
-        return extra_gb.get("dataBundle", {})
+        headers = cache_headers(slt_cache, request, snapshot)
+        cached_response = not_modified(request, headers)
+        if cached_response is not None:
+            return cached_response
+        
+        return response_cache.respond(
+            request, (snapshot,),
+            lambda: project(extra_gb.get("dataBundle", {}), parse_fields(fields), include_raw=True),
+            headers
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving Extra GB information: {str(e)}") 
\ No newline at end of file
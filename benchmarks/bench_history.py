@@ -0,0 +1,96 @@
+"""
+Measures /usage/history and /usage/stats latency over a year of stored usage samples.
+
+Seeds a temporary history database with one sample every five minutes for the given
+number of days (about 105k samples for a year), builds the hourly rollups and times
+each endpoint through the FastAPI test client. The target is a p95 under 50 ms.
+
+Usage:
+    python -m benchmarks.bench_history [--days N] [--interval S] [--iterations N]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from fastapi.testclient import TestClient
+
+import myslt.history
+from config.config import SUBSCRIBER_ID
+from myslt.history import LOCAL_UTC_OFFSET, UsageHistory, percentile
+
+TARGET_P95_MS = 50.0
+
+
+def seed(history: UsageHistory, account: str, days: int, interval: int) -> int:
+    """Inserts cumulative usage samples ending now and rebuilds the rollups; returns the sample count."""
+    count = days * 86400 // interval
+    start = time.time() - count * interval
+    rows = []
+    total_used = standard_used = 0.0
+    for index in range(count):
+        ts = start + index * interval
+        # Restart the cumulative counters every 30 days like a billing cycle
+        if index and index % (30 * 86400 // interval) == 0:
+            total_used = standard_used = 0.0
+        total_used += 0.01
+        if 8 <= time.gmtime(ts + LOCAL_UTC_OFFSET).tm_hour < 24:
+            standard_used += 0.01
+        rows.append((account, ts, total_used, 300.0, standard_used, 150.0))
+    history._conn.executemany(
+        "INSERT INTO usage_samples (account, ts, total_used, total_limit, standard_used, standard_limit) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        rows
+    )
+    history._conn.commit()
+    history.rebuild_rollups()
+    return count
+
+
+def measure(client: TestClient, path: str, params: dict, iterations: int):
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        response = client.get(path, params=params)
+        timings.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+    timings.sort()
+    return percentile(timings, 50), percentile(timings, 95)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--interval", type=int, default=300, help="Seconds between samples")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        history = UsageHistory(os.path.join(directory, "history.db"))
+        started = time.perf_counter()
+        count = seed(history, SUBSCRIBER_ID, args.days, args.interval)
+        print(f"Seeded {count} samples in {time.perf_counter() - started:.1f}s")
+        myslt.history._history = history
+
+        from api.app import app
+        client = TestClient(app)
+        year_start = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(time.time() - args.days * 86400))
+        cases = [
+            ("/usage/history", {}),
+            ("/usage/history", {"bucket": "day", "from": year_start}),
+            ("/usage/history", {"bucket": "hour", "from": year_start, "split": "day_night"}),
+            ("/usage/stats", {}),
+            ("/usage/stats", {"from": year_start}),
+        ]
+
+        print(f"{'endpoint':<16} {'params':<40} {'p50 ms':>8} {'p95 ms':>8}")
+        for path, params in cases:
+            p50, p95 = measure(client, path, params, args.iterations)
+            label = ", ".join(f"{key}={value}" for key, value in params.items()) or "(defaults)"
+            flag = "" if p95 < TARGET_P95_MS else "  over target"
+            print(f"{path:<16} {label:<40} {p50:>8.2f} {p95:>8.2f}{flag}")
+        history.close()
+
+
+if __name__ == "__main__":
+    main()
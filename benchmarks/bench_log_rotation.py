@@ -0,0 +1,69 @@
+"""
+Compares the stdlib RotatingFileHandler with CompressingRotatingFileHandler under
+sustained JSON log volume.
+
+Writes the same records through each handler with a small maxBytes so rotation
+happens often, and reports throughput, the slowest single emit (the rotation pause
+seen by the writing thread) and the disk space taken by the log directory.
+
+Usage:
+    python -m benchmarks.bench_log_rotation [--records N] [--max-bytes BYTES] [--backups N]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from logging.handlers import RotatingFileHandler
+
+from benchmarks.bench_logging import sample_records
+from logging_config import CompressingRotatingFileHandler, JSONFormatter, wait_for_log_compression
+
+
+def disk_usage(directory: str) -> int:
+    return sum(entry.stat().st_size for entry in os.scandir(directory) if entry.is_file())
+
+
+def run(name: str, handler, records, directory: str):
+    handler.setFormatter(JSONFormatter())
+    slowest = 0.0
+    start = time.perf_counter()
+    for record in records:
+        emit_start = time.perf_counter()
+        handler.handle(record)
+        slowest = max(slowest, time.perf_counter() - emit_start)
+    elapsed = time.perf_counter() - start
+    handler.close()
+    wait_for_log_compression()
+    files = len(os.listdir(directory))
+    print(
+        f"{name:<28} {len(records) / elapsed:>10,.0f} records/s  slowest emit {slowest * 1000:>7.2f} ms  "
+        f"{disk_usage(directory) / 1024:>9,.0f} KiB in {files} files"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=200000)
+    parser.add_argument("--max-bytes", type=int, default=2 * 1024 * 1024)
+    parser.add_argument("--backups", type=int, default=20, help="Backups kept by the stdlib handler")
+    args = parser.parse_args()
+
+    records = sample_records(args.records)
+    root = tempfile.mkdtemp(prefix="bench_log_rotation_")
+    try:
+        for name, factory in (
+            ("RotatingFileHandler", lambda path: RotatingFileHandler(
+                path, maxBytes=args.max_bytes, backupCount=args.backups)),
+            ("CompressingRotating (gzip)", lambda path: CompressingRotatingFileHandler(
+                path, maxBytes=args.max_bytes, compression="gzip", quiet_seconds=0)),
+        ):
+            directory = os.path.join(root, name.split()[0])
+            os.makedirs(directory)
+            run(name, factory(os.path.join(directory, "myslt.log")), records, directory)
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
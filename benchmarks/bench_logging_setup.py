@@ -0,0 +1,57 @@
+"""
+Shows that repeated setup_logging calls are cheap and do not leak file descriptors.
+
+Calls setup_logging many times the way modules and entry points do (an explicit
+app configuration, then bare calls, then repeated reconfiguration) and reports the
+time per call and the number of open file descriptors after each phase.
+
+Usage:
+    python -m benchmarks.bench_logging_setup [--calls N] [--log-dir DIR]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from logging_config import setup_logging, stop_log_listener
+
+
+def open_fds() -> int:
+    """Number of open file descriptors (Linux/macOS)."""
+    for path in ("/proc/self/fd", "/dev/fd"):
+        if os.path.isdir(path):
+            return len(os.listdir(path))
+    return -1
+
+
+def phase(name: str, calls: int, **kwargs):
+    start = time.perf_counter()
+    for _ in range(calls):
+        setup_logging(**kwargs)
+    per_call = (time.perf_counter() - start) / calls * 1e6
+    print(f"{name:<36} {per_call:>10.1f} us/call {open_fds():>6} fds")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=1000)
+    parser.add_argument("--log-dir", default=None, help="Log directory (defaults to a temporary one)")
+    args = parser.parse_args()
+    log_dir = args.log_dir or tempfile.mkdtemp(prefix="bench_logging_")
+
+    print(f"{'baseline':<36} {'':>18} {open_fds():>6} fds")
+    phase("first setup (entry point)", 1, app_name="bench", log_dir=log_dir, log_to_console=False)
+    phase("bare setup_logging() (modules)", args.calls)
+    phase("identical explicit setup", args.calls, app_name="bench", log_dir=log_dir, log_to_console=False)
+    start = time.perf_counter()
+    switches = args.calls // 10 or 1
+    for index in range(switches):
+        setup_logging(app_name=f"bench_{index % 2}", log_dir=log_dir, log_to_console=False)
+    per_call = (time.perf_counter() - start) / switches * 1e6
+    print(f"{'alternating app names':<36} {per_call:>10.1f} us/call {open_fds():>6} fds")
+    stop_log_listener()
+    print(f"log files in {log_dir}")
+
+
+if __name__ == "__main__":
+    main()
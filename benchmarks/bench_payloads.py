@@ -0,0 +1,88 @@
+"""
+Measures response payload size and serialization time for the API builders.
+
+Compares the old response shape (full raw_data, stdlib json, uncompressed) with the
+projected, fast-serialized and compressed responses served now.
+
+Usage:
+    python -m benchmarks.bench_payloads [--iterations N] [--bundles N]
+"""
+import argparse
+import gzip
+import json
+import time
+
+from api.responses import brotli, json_dumps, orjson, project
+from api.routers.bills import build_bill_status
+from api.routers.profile import build_profile_info
+from api.routers.usage import build_usage_summary
+from api.routers.vas import build_vas_bundles
+
+
+def sample_payloads(bundle_count: int) -> dict:
+    """Builds responses from synthetic SLT data bundles shaped like the real ones."""
+    usage = {
+        "my_package_info": {
+            "usageDetails": [
+                {"name": "Standard", "used": "42.5", "limit": "100.0", "remaining": "57.5",
+                 "percentage": 42, "volume_unit": "GB", "expiry_date": "30-Sep"},
+                {"name": "Total (Standard + Free)", "used": "60.1", "limit": "150.0", "remaining": "89.9",
+                 "percentage": 40, "volume_unit": "GB", "expiry_date": "30-Sep"},
+            ]
+        },
+        "reported_time": "19-Oct-2026 10:00 AM",
+    }
+    profile = {
+        "fullname": "Sample Subscriber", "subscriber_package": "Any Beat", "contact_no": "0112000000",
+        "email": "subscriber@example.com", "mobile_no": "0770000000",
+        "address": {"line1": "1 Example Road", "city": "Colombo", "postal_code": "00100"},
+        "services": [{"type": "BB", "status": "Active", "id": f"94112{index:06d}"} for index in range(8)],
+    }
+    bill = {
+        "billStatus": "Paid", "billAmount": 4250.0, "dueDate": "2026-11-15",
+        "history": [{"period": f"2026-{month:02d}", "amount": 4000 + month * 25} for month in range(1, 13)],
+    }
+    vas = {
+        "usageDetails": [
+            {"name": f"Extra GB {index}", "used": f"{index}.0", "limit": "25.0", "expiry_date": "30-Nov",
+             "description": "Add-on data bundle", "offerId": f"OFFER-{index:04d}", "priority": index}
+            for index in range(bundle_count)
+        ]
+    }
+    return {
+        "/usage/summary": (build_usage_summary(usage), None),
+        "/profile/info": (build_profile_info(profile), None),
+        "/bills/status": (build_bill_status(bill), None),
+        "/vas/bundles": (build_vas_bundles(vas), "bundles"),
+    }
+
+
+def time_per_call(function, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        function()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--bundles", type=int, default=20, help="Number of synthetic VAS bundles")
+    args = parser.parse_args()
+
+    print(f"orjson: {'yes' if orjson else 'no'}, brotli: {'yes' if brotli else 'no'}")
+    print(f"{'route':<16} {'full':>8} {'projected':>10} {'gzip':>8} {'br':>8} {'json us':>9} {'fast us':>9}")
+    for route, (payload, items_key) in sample_payloads(args.bundles).items():
+        full = json.dumps(payload).encode()
+        projected = project(payload, items_key=items_key)
+        body = json_dumps(projected)
+        gzipped = len(gzip.compress(body, compresslevel=5))
+        brotlied = len(brotli.compress(body, quality=4)) if brotli else 0
+        stdlib_us = time_per_call(lambda: json.dumps(payload).encode(), args.iterations)
+        fast_us = time_per_call(lambda: json_dumps(project(payload, items_key=items_key)), args.iterations)
+        print(f"{route:<16} {len(full):>8} {len(body):>10} {gzipped:>8} {brotlied or '-':>8} "
+              f"{stdlib_us:>9.1f} {fast_us:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Measures SLT cache throughput and upstream call counts with 1, 2, 4 and 8 worker processes.
+
+Each worker runs an SLTCache in front of a simulated SLT client (fixed latency,
+calls counted across processes) and serves cache lookups for a few accounts from
+many concurrent tasks, the way an API worker serves requests. Every worker count is
+run twice: with isolated per-process caches (the old behaviour) and with the SQLite
+shared store, where workers reuse each other's snapshots and only one of them calls
+SLT for a given key at a time.
+
+Usage:
+    python -m benchmarks.bench_workers [--duration S] [--ttl S] [--latency S] [--workers 1,2,4,8]
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+
+from myslt.cache import SLTCache
+from myslt.shared_store import SharedStore
+
+
+class SimulatedSLTAPI:
+    """Stand-in for SLTAPI: sleeps for `latency` and counts every call in `counter`."""
+
+    def __init__(self, counter, latency: float):
+        self.counter = counter
+        self.latency = latency
+
+    def get_usage_summary(self, subscriber_id: str):
+        with self.counter.get_lock():
+            self.counter.value += 1
+        time.sleep(self.latency)
+        # Usage changes every few seconds, so some refreshes produce new versions
+        return {"isSuccess": True, "dataBundle": {"subscriber": subscriber_id, "used": int(time.time() // 5)}}
+
+
+def run_worker(store_path, counter, results, args):
+    async def serve():
+        store = SharedStore(store_path) if store_path else None
+        cache = SLTCache(SimulatedSLTAPI(counter, args.latency), ttl=args.ttl, store=store)
+        accounts = [f"9411{index:07d}" for index in range(args.accounts)]
+        deadline = time.monotonic() + args.duration
+        lookups = 0
+
+        async def client():
+            nonlocal lookups
+            while time.monotonic() < deadline:
+                await cache.get("get_usage_summary", random.choice(accounts))
+                lookups += 1
+                # Yield like a request handler doing other work between lookups
+                await asyncio.sleep(0)
+
+        await asyncio.gather(*(client() for _ in range(args.concurrency)))
+        results.put(lookups)
+
+    asyncio.run(serve())
+
+
+def run(workers: int, shared: bool, args) -> tuple:
+    counter = multiprocessing.Value("i", 0)
+    results = multiprocessing.Queue()
+    store_path = None
+    if shared:
+        store_path = os.path.join(tempfile.mkdtemp(prefix="bench_workers_"), "shared.db")
+        SharedStore(store_path)  # Create the schema before the workers race for it
+    processes = [
+        multiprocessing.Process(target=run_worker, args=(store_path, counter, results, args))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    lookups = sum(results.get() for _ in processes)
+    for process in processes:
+        process.join()
+    return lookups / args.duration, counter.value
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per run")
+    parser.add_argument("--ttl", type=float, default=1.0, help="Cache TTL in seconds (short, to force refreshes)")
+    parser.add_argument("--latency", type=float, default=0.2, help="Simulated SLT call latency in seconds")
+    parser.add_argument("--accounts", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent lookups per worker")
+    parser.add_argument("--workers", default="1,2,4,8")
+    args = parser.parse_args()
+
+    print(f"{'workers':>7} {'store':>9} {'lookups/s':>12} {'SLT calls':>10}")
+    for workers in (int(value) for value in args.workers.split(",")):
+        for shared in (False, True):
+            throughput, upstream = run(workers, shared, args)
+            print(f"{workers:>7} {'shared' if shared else 'isolated':>9} {throughput:>12,.0f} {upstream:>10}")
+
+
+if __name__ == "__main__":
+    main()
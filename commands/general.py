@@ -1,17 +1,23 @@
-from config.config import USERNAME, PASSWORD, SUBSCRIBER_ID, TP_NO, ACCOUNT_NO
+from config.config import SUBSCRIBER_ID, TP_NO, ACCOUNT_NO
 from config.timezone_config import get_current_time
-from myslt.api import SLTAPI
+from myslt.cache import get_shared_cache
+from commands.throttle import CommandThrottle, ResultCache, handle_command_error
+from tasks.usage_chart import get_chart_renderer, RANGES, DEFAULT_RANGE
 from logging_config import setup_logging
 import logging
+import discord
 from discord.ext import commands
+import io
 import traceback
 
 # Set up logging
 logger = logging.getLogger(__name__)  # Module-specific logger
 
-# Initialize SLT API
+# Process-wide SLT client behind the shared snapshot cache (also used by the slash
+# commands, the notification tasks and, in single-process mode, the API)
 try:
-    slt_api = SLTAPI(USERNAME, PASSWORD)
+    slt_cache = get_shared_cache()
+    slt_api = slt_cache.slt_api
     logger.info("SLTAPI initialized successfully", extra={'event_type': 'slt_api_init_success'})
 except Exception as e:
     logger.critical(
@@ -24,13 +30,92 @@ except Exception as e:
         }
     )
     slt_api = None  # Handle gracefully in commands
+    slt_cache = None
+
+
+def format_age(seconds):
+    """Formats an age in seconds as a short human-readable string."""
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m"
+    return f"{seconds // 3600}h {seconds % 3600 // 60}m"
+
+
+def format_usage_message(usage):
+    """Formats a usage summary response for Discord."""
+    used = usage['dataBundle']['my_package_summary']['used']
+    limit = usage['dataBundle']['my_package_summary']['limit']
+    return f"Usage: {used}GB out of {limit}GB."
+
+
+def format_profile_message(profile):
+    """Formats a profile response for Discord."""
+    fullname = profile['dataBundle']['fullname']
+    package = profile['dataBundle']['subscriber_package_display']
+    return f"Profile: {fullname}, Package: {package}"
+
+
+def format_bill_status_message(bill_status):
+    """Formats a bill status response for Discord."""
+    return f"Bill status: {bill_status['dataBundle']['bill_code_desc']}"
+
+
+def format_vas_message(vas_bundles, bundle=None):
+    """Formats a VAS bundles response for Discord, optionally limited to one bundle by name."""
+    usage_details = vas_bundles.get("dataBundle", {}).get("usageDetails", [])
+    if bundle:
+        usage_details = [detail for detail in usage_details if detail.get("name") == bundle]
+    if not usage_details:
+        return "No active VAS bundles found."
+
+    message = "**Active VAS Bundles:**\n"
+    for detail in usage_details:
+        name = detail.get("name", "N/A")
+        used = detail.get("used", "0.0")
+        expiry = detail.get("expiry_date", "N/A")
+        message += (
+            f"- **{name}**\n"
+            f"  - Used: {used}GB\n"
+            f"  - Expires: {expiry}\n\n"
+        )
+    return message
 
 
 class GeneralCommands(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.throttle = CommandThrottle()
+        self.results = ResultCache()
         logger.info("GeneralCommands Cog initialized", extra={'event_type': 'cog_init'})
 
+    async def cog_before_invoke(self, ctx):
+        """Apply per-user and per-guild cooldowns to every command in this cog when it runs."""
+        self.throttle.check(ctx)
+
+    async def cog_command_error(self, ctx, error):
+        await handle_command_error(ctx, error)
+
+    async def send_cached(self, ctx, command_name):
+        """Reply with a recently rendered result for this command, if there is one."""
+        cached = self.results.get(command_name)
+        if cached is None:
+            return False
+        message, age = cached
+        logger.debug(
+            f"Serving cached {command_name} result",
+            extra={
+                'event_type': 'command_cache_hit',
+                'command': command_name,
+                'user_id': str(ctx.author.id),
+                'age_seconds': round(age, 1),
+                'hit_rate': round(self.results.hit_rate, 4)
+            }
+        )
+        await ctx.send(f"{message}\n_(cached result from {format_age(age)} ago)_")
+        return True
+
     def check_slt_api(self):
         """Helper method to validate SLT API initialization."""
         if slt_api is None:
@@ -60,6 +145,8 @@ class GeneralCommands(commands.Cog):
         
         try:
             self.check_slt_api()
+            if await self.send_cached(ctx, command_name):
+                return
             
             logger.debug(
                 "Fetching usage data from SLT API", 
@@ -71,7 +158,7 @@ class GeneralCommands(commands.Cog):
                 }
             )
             
-            usage = slt_api.get_usage_summary(SUBSCRIBER_ID)
+            usage = (await slt_cache.get("get_usage_summary", SUBSCRIBER_ID)).data
             
             if not usage.get("isSuccess", False):
                 logger.error(
@@ -102,7 +189,9 @@ class GeneralCommands(commands.Cog):
                 }
             )
             
-            await ctx.send(f"Usage: {used}GB out of {limit}GB.")
+            message = format_usage_message(usage)
+            self.results.set(command_name, message)
+            await ctx.send(message)
             
         except RuntimeError as e:
             await ctx.send(str(e))
@@ -139,6 +228,8 @@ class GeneralCommands(commands.Cog):
         
         try:
             self.check_slt_api()
+            if await self.send_cached(ctx, command_name):
+                return
             
             logger.debug(
                 "Fetching profile data from SLT API", 
@@ -150,7 +241,7 @@ class GeneralCommands(commands.Cog):
                 }
             )
             
-            profile = slt_api.get_profile(SUBSCRIBER_ID)
+            profile = (await slt_cache.get("get_profile", SUBSCRIBER_ID)).data
             
             if not profile.get("isSuccess", False):
                 logger.error(
@@ -166,9 +257,6 @@ class GeneralCommands(commands.Cog):
                 await ctx.send("Failed to retrieve profile data. The SLT API returned an unsuccessful response.")
                 return
                 
-            fullname = profile['dataBundle']['fullname']
-            package = profile['dataBundle']['subscriber_package_display']
-            
             logger.debug(
                 "Profile data retrieved successfully", 
                 extra={
@@ -179,7 +267,9 @@ class GeneralCommands(commands.Cog):
                 }
             )
             
-            await ctx.send(f"Profile: {fullname}, Package: {package}")
+            message = format_profile_message(profile)
+            self.results.set(command_name, message)
+            await ctx.send(message)
             
         except RuntimeError as e:
             await ctx.send(str(e))
@@ -216,6 +306,8 @@ class GeneralCommands(commands.Cog):
         
         try:
             self.check_slt_api()
+            if await self.send_cached(ctx, command_name):
+                return
             
             logger.debug(
                 "Fetching bill data from SLT API", 
@@ -227,7 +319,7 @@ class GeneralCommands(commands.Cog):
                 }
             )
             
-            bill_status = slt_api.get_bill_status(TP_NO, ACCOUNT_NO)
+            bill_status = (await slt_cache.get("get_bill_status", TP_NO, ACCOUNT_NO)).data
             
             if not bill_status.get("isSuccess", False):
                 logger.error(
@@ -256,7 +348,9 @@ class GeneralCommands(commands.Cog):
                 }
             )
             
-            await ctx.send(f"Bill status: {desc}")
+            message = format_bill_status_message(bill_status)
+            self.results.set(command_name, message)
+            await ctx.send(message)
             
         except RuntimeError as e:
             await ctx.send(str(e))
@@ -293,6 +387,8 @@ class GeneralCommands(commands.Cog):
         
         try:
             self.check_slt_api()
+            if await self.send_cached(ctx, command_name):
+                return
             
             logger.debug(
                 "Fetching VAS data from SLT API", 
@@ -304,7 +400,7 @@ class GeneralCommands(commands.Cog):
                 }
             )
             
-            vas_bundles = slt_api.get_vas_bundles(SUBSCRIBER_ID)
+            vas_bundles = (await slt_cache.get("get_vas_bundles", SUBSCRIBER_ID)).data
             
             if not vas_bundles.get("isSuccess", False):
                 logger.error(
@@ -335,18 +431,9 @@ class GeneralCommands(commands.Cog):
                 await ctx.send("No active VAS bundles found.")
                 return
 
-            # Build the response message
-            message = "**Active VAS Bundles:**\n"
-            for detail in usage_details:
-                name = detail.get("name", "N/A")
-                used = detail.get("used", "0.0")
-                expiry = detail.get("expiry_date", "N/A")
-                message += (
-                    f"- **{name}**\n"
-                    f"  - Used: {used}GB\n"
-                    f"  - Expires: {expiry}\n\n"
-                )
-            
+            message = format_vas_message(vas_bundles)
+            self.results.set(command_name, message)
+
             logger.debug(
                 "VAS bundles data retrieved successfully", 
                 extra={
@@ -387,6 +474,63 @@ class GeneralCommands(commands.Cog):
             )
             await ctx.send("An error occurred while retrieving VAS bundles information.")
 
+    @commands.command(name="usage_chart")
+    async def usage_chart(self, ctx, range_name: str = DEFAULT_RANGE):
+        """Command to render day/night usage over time as a chart."""
+        command_name = "usage_chart"
+        self.log_command(ctx, command_name)
+
+        if range_name not in RANGES:
+            await ctx.send(f"Unknown range `{range_name}`. Use one of: {', '.join(RANGES)}")
+            return
+
+        try:
+            async with ctx.typing():
+                png = await get_chart_renderer().render(SUBSCRIBER_ID, range_name)
+            if png is None:
+                await ctx.send("No usage history recorded yet. Check back after the next usage poll.")
+                return
+            await ctx.send(file=discord.File(io.BytesIO(png), filename=f"usage_{range_name}.png"))
+        except Exception as e:
+            logger.error(
+                f"Error executing {command_name} command",
+                exc_info=True,
+                extra={
+                    'event_type': 'command_execution_error',
+                    'command': command_name,
+                    'user_id': str(ctx.author.id),
+                    'error': str(e),
+                    'error_type': type(e).__name__
+                }
+            )
+            await ctx.send("An error occurred while rendering the usage chart.")
+
+    @commands.command(name="cache_stats")
+    async def cache_stats(self, ctx):
+        """Command to report command result cache and SLT cache hit rates."""
+        self.log_command(ctx, "cache_stats")
+        results = self.results.stats()
+        message = (
+            "**Cache Statistics**\n"
+            f"Command results: {results['hits']} hits / {results['misses']} misses "
+            f"({results['hit_rate'] * 100:.1f}% hit rate, {results['entries']} entries)\n"
+        )
+        if slt_cache is not None:
+            upstream = slt_cache.stats()
+            message += (
+                f"SLT snapshots: {upstream['hits']} hits / {upstream['misses']} misses "
+                f"({upstream['hit_rate'] * 100:.1f}% hit rate, {upstream['coalesced']} coalesced)"
+            )
+        logger.info(
+            "Cache statistics reported",
+            extra={
+                'event_type': 'cache_stats',
+                'result_cache': results,
+                'slt_cache': slt_cache.stats() if slt_cache is not None else None
+            }
+        )
+        await ctx.send(message)
+
 
 async def setup(bot):
     """Register the cog with the bot."""
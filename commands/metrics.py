@@ -0,0 +1,90 @@
+from config.config import METRICS_PORT
+from metrics import BOT_COMMAND_SECONDS, BOT_COMMANDS_IN_PROGRESS, start_metrics_server
+import logging
+import time
+import discord
+from discord.ext import commands
+
+logger = logging.getLogger(__name__)  # Module-specific logger
+
+
+class BotMetrics(commands.Cog):
+    """
+    Records prefix and slash command latency and the number of commands in progress,
+    and serves /metrics on METRICS_PORT when it is set.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.server = None
+        logger.info("BotMetrics Cog initialized", extra={'event_type': 'cog_init'})
+
+    async def cog_load(self):
+        if METRICS_PORT is None:
+            return
+        try:
+            self.server = start_metrics_server(METRICS_PORT)
+        except OSError as e:
+            # e.g. another shard process already serves this port
+            logger.warning(
+                f"Could not serve metrics on port {METRICS_PORT}: {e}",
+                extra={'event_type': 'metrics_server_failed', 'port': METRICS_PORT}
+            )
+
+    def cog_unload(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server = None
+
+    def finish(self, ctx, result):
+        started = getattr(ctx, "metrics_started", None)
+        if started is None:
+            return
+        ctx.metrics_started = None
+        BOT_COMMANDS_IN_PROGRESS.dec()
+        BOT_COMMAND_SECONDS.labels(ctx.command.qualified_name, result).observe(time.perf_counter() - started)
+
+    # ---- Listeners ----
+    @commands.Cog.listener()
+    async def on_command(self, ctx):
+        ctx.metrics_started = time.perf_counter()
+        BOT_COMMANDS_IN_PROGRESS.inc()
+
+    @commands.Cog.listener()
+    async def on_command_completion(self, ctx):
+        self.finish(ctx, "ok")
+
+    @commands.Cog.listener()
+    async def on_command_error(self, ctx, error):
+        result = "cooldown" if isinstance(error, commands.CommandOnCooldown) else "error"
+        self.finish(ctx, result)
+        # Any on_command_error listener replaces discord.py's default traceback printing,
+        # so report errors that neither the command nor its cog handled
+        if ctx.command is not None and ctx.command.has_error_handler():
+            return
+        if ctx.cog is not None and ctx.cog.has_error_handler():
+            return
+        if isinstance(error, commands.CommandNotFound):
+            logger.debug(str(error), extra={'event_type': 'command_not_found'})
+            return
+        original = getattr(error, "original", error)
+        logger.error(
+            f"Unhandled error in {ctx.command} command",
+            exc_info=(type(original), original, original.__traceback__),
+            extra={
+                'event_type': 'command_unhandled_error',
+                'command': str(ctx.command),
+                'error': str(original),
+                'error_type': type(original).__name__
+            }
+        )
+
+    @commands.Cog.listener()
+    async def on_app_command_completion(self, interaction: discord.Interaction, command):
+        # Slash commands have no start hook; measure from the interaction's creation
+        elapsed = (discord.utils.utcnow() - interaction.created_at).total_seconds()
+        BOT_COMMAND_SECONDS.labels(f"/{command.qualified_name}", "ok").observe(max(elapsed, 0.0))
+
+
+async def setup(bot):
+    await bot.add_cog(BotMetrics(bot))
@@ -1,36 +1,52 @@
 from config.config import (
-    USERNAME, PASSWORD, SUBSCRIBER_ID, TP_NO, ACCOUNT_NO,
+    SUBSCRIBER_ID, TP_NO, ACCOUNT_NO,
     GENERAL_CHANNEL_ID, DAILY_SUMMARY_CHANNEL_ID,
     ALERTS_CHANNEL_ID, BILLS_CHANNEL_ID, ADD_ON_USAGE_CHANNEL_ID,
+    REMINDER_OFFSET_DAYS, USAGE_POLL_INTERVAL,
 )
 from config.timezone_config import get_current_time
-from myslt.api import SLTAPI
-from logging_config import setup_logging
+from myslt.cache import get_shared_cache
+from myslt.history import get_usage_history
+from myslt.poller import get_shared_poller
+from myslt.leader import NOTIFICATIONS, get_leader
 import logging
 from discord.ext import commands, tasks
 from datetime import timedelta
 import asyncio
 from tasks.spike_detection import detect_spikes
-from tasks.summary import daily_summary
-from tasks.bills_notify import fetch_bill_info_and_format
+from tasks.summary import daily_summary, extract_usage_details
+from tasks.bills_notify import fetch_bill_info_cached, format_bill_info
+from commands.throttle import CommandThrottle, handle_command_error
+from tasks.deadlines import DeadlineTracker, BILL_DUE, VAS_EXPIRY
+from metrics import timed_task, track_task
 
-# Set up logging
-setup_logging()
 logger = logging.getLogger(__name__)
 
-# Initialize SLT API
+# Process-wide SLT client and cache, shared with the other cogs (and the API in single-process mode)
 try:
-    slt_api = SLTAPI(USERNAME, PASSWORD)
+    slt_cache = get_shared_cache()
+    slt_api = slt_cache.slt_api
     logger.info("SLTAPI initialized successfully.")
 except Exception as e:
     logger.critical(f"Failed to initialize SLTAPI: {e}")
     slt_api = None
+    slt_cache = None
 
 
 class NotificationsCommands(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.threshold = None
+        self.deadlines = DeadlineTracker(timedelta(days=days) for days in REMINDER_OFFSET_DAYS)
+        self.deadlines_changed = asyncio.Event()
+        self.deadline_scheduler = None
+        self.throttle = CommandThrottle()
+        self.history = get_usage_history()
+        # History writes in flight, referenced so they are not garbage collected mid-write
+        self._history_writes = set()
+        self.usage_poller = None
+        # Only bot processes join this election, so an API worker never holds it
+        self.leader = get_leader(NOTIFICATIONS)
         logger.info("NotificationsCommands Cog initialized.")
 
         # Start background tasks
@@ -39,14 +55,37 @@ class NotificationsCommands(commands.Cog):
         self.bills_notification_task.start()
         self.vas_bundles_notification_task.start()
 
+    async def cog_load(self):
+        """Start the deadline reminder scheduler once the cog is loaded."""
+        self.deadline_scheduler = asyncio.create_task(self.run_deadline_scheduler())
+        if slt_cache is not None:
+            slt_cache.subscribe(self.record_usage_snapshot)
+            self.usage_poller = get_shared_poller(
+                slt_cache, [("get_usage_summary", SUBSCRIBER_ID)], USAGE_POLL_INTERVAL, leader_only=True
+            )
+            self.usage_poller.start()
+
     def cog_unload(self):
         """Cancel all background tasks when the cog is unloaded."""
         self.spike_detection_task.cancel()
         self.daily_summary_task.cancel()
         self.bills_notification_task.cancel()
         self.vas_bundles_notification_task.cancel()
+        if self.deadline_scheduler:
+            self.deadline_scheduler.cancel()
+        if self.usage_poller:
+            self.usage_poller.stop()
+        if slt_cache is not None:
+            slt_cache.unsubscribe(self.record_usage_snapshot)
         logger.info("NotificationsCommands Cog unloaded.")
 
+    async def cog_before_invoke(self, ctx):
+        """Apply per-user and per-guild cooldowns to every command in this cog when it runs."""
+        self.throttle.check(ctx)
+
+    async def cog_command_error(self, ctx, error):
+        await handle_command_error(ctx, error)
+
     def get_channel(self, channel_id):
         """Fetch a Discord channel by ID, logging a warning if not found."""
         channel = self.bot.get_channel(channel_id)
@@ -67,10 +106,98 @@ class NotificationsCommands(commands.Cog):
             target += timedelta(days=1)
         await asyncio.sleep((target - now).total_seconds())
 
+    def is_leader(self, task_name):
+        """
+        Check, right before acting, that this replica is the leader, so scheduled
+        notifications are sent by one replica only. Followers skip the run.
+        """
+        if self.leader.confirm():
+            return True
+        logger.debug(
+            f"Skipping {task_name}: another replica is the leader.",
+            extra={'event_type': 'task_skipped_follower', 'task': task_name}
+        )
+        return False
+
+    def record_usage_snapshot(self, key, snapshot):
+        """Store every new usage snapshot in the usage history (on the leader only)."""
+        if key[0] != "get_usage_summary" or not self.leader.is_leader():
+            return
+        usage_details = extract_usage_details(snapshot.data)
+        if usage_details:
+            task = asyncio.create_task(asyncio.to_thread(self.history.record_usage, key[1], usage_details))
+            self._history_writes.add(task)
+            task.add_done_callback(self.history_write_done)
+
+    def history_write_done(self, task):
+        """Forget a finished usage history write, logging it if it failed."""
+        self._history_writes.discard(task)
+        if task.cancelled() or task.exception() is None:
+            return
+        error = task.exception()
+        logger.error(
+            "Error recording usage snapshot",
+            exc_info=error,
+            extra={
+                'event_type': 'usage_history_write_failed',
+                'error': str(error),
+                'error_type': type(error).__name__
+            }
+        )
+
+    async def record_snapshot(self, kind, account, data):
+        """Keep a copy of a fetched bill or VAS snapshot in the history store for exports."""
+        try:
+            await asyncio.to_thread(self.history.record_snapshot, account, kind, data)
+        except Exception as e:
+            logger.error(f"Error recording {kind} snapshot: {e}")
+
+    def update_deadlines(self, kind, account, data):
+        """Feed a fresh bill or VAS snapshot into the deadline tracker, waking the scheduler on change."""
+        if kind == BILL_DUE:
+            changed = self.deadlines.update_bills(account, data)
+        else:
+            changed = self.deadlines.update_vas(account, data)
+        if changed:
+            self.deadlines_changed.set()
+
+    async def run_deadline_scheduler(self):
+        """Sleep until the next bill due or VAS expiry reminder, then send it."""
+        await self.bot.wait_until_ready()
+        while True:
+            try:
+                self.deadlines_changed.clear()
+                wake_at = self.deadlines.next_wakeup()
+                timeout = None
+                if wake_at is not None:
+                    timeout = max(0.0, (wake_at - get_current_time()).total_seconds())
+                try:
+                    await asyncio.wait_for(self.deadlines_changed.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+
+                due = self.deadlines.pop_due(get_current_time())
+                if due and not self.is_leader("deadline_reminders"):
+                    continue
+                for reminder in due:
+                    channel_id = BILLS_CHANNEL_ID if reminder.kind == BILL_DUE else ADD_ON_USAGE_CHANNEL_ID
+                    channel = self.get_channel(channel_id)
+                    if channel:
+                        await channel.send(reminder.format_message())
+                        logger.info(f"Deadline reminder sent for {reminder.kind} '{reminder.name}'.")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in deadline scheduler: {e}")
+                await asyncio.sleep(60)
+
     # ---- Tasks ----
     @tasks.loop(minutes=5)
+    @timed_task("spike_detection")
     async def spike_detection_task(self):
         """Periodic spike detection task."""
+        if not self.is_leader("spike_detection"):
+            return
         try:
             self.check_api_initialized()
             usage_diff = 0.5  # Example value
@@ -89,22 +216,32 @@ class NotificationsCommands(commands.Cog):
         try:
             self.check_api_initialized()
             await self.wait_until_time(22, 0)
-            api_response = slt_api.get_usage_summary(SUBSCRIBER_ID)
-            result = daily_summary(api_response)
-            channel = self.get_channel(DAILY_SUMMARY_CHANNEL_ID) or self.get_channel(GENERAL_CHANNEL_ID)
-            if channel:
-                await channel.send(result)
-                logger.info("Daily summary sent.")
+            if not self.is_leader("daily_summary"):
+                return
+            with track_task("daily_summary"):
+                api_response = (await slt_cache.get("get_usage_summary", SUBSCRIBER_ID)).data
+                result = daily_summary(api_response)
+                channel = self.get_channel(DAILY_SUMMARY_CHANNEL_ID) or self.get_channel(GENERAL_CHANNEL_ID)
+                if channel:
+                    await channel.send(result)
+                    logger.info("Daily summary sent.")
         except Exception as e:
             logger.error(f"Error in daily_summary_task: {e}")
 
     @tasks.loop(hours=24)
+    @timed_task("bills_notification")
     async def bills_notification_task(self):
-        """Notify about bills on specific days."""
+        """Refresh the bill due date and notify about bills on specific days."""
+        if not self.is_leader("bills_notification"):
+            return
         try:
             self.check_api_initialized()
+            data = await fetch_bill_info_cached(slt_cache, TP_NO, ACCOUNT_NO)
+            if data:
+                self.update_deadlines(BILL_DUE, ACCOUNT_NO, data)
+                await self.record_snapshot("bill", ACCOUNT_NO, data)
             if get_current_time().day in [1, 15]:
-                message = fetch_bill_info_and_format(slt_api, TP_NO, ACCOUNT_NO)
+                message = format_bill_info(data) if data else "Could not retrieve the bill payment information."
                 channel = self.get_channel(BILLS_CHANNEL_ID)
                 if channel:
                     await channel.send(message)
@@ -113,17 +250,22 @@ class NotificationsCommands(commands.Cog):
             logger.error(f"Error in bills_notification_task: {e}")
 
     @tasks.loop(hours=12)
+    @timed_task("vas_bundles_notification")
     async def vas_bundles_notification_task(self):
         """Send regular updates about VAS bundles to the ADD_ON_USAGE_CHANNEL_ID."""
+        if not self.is_leader("vas_bundles_notification"):
+            return
         try:
             self.check_api_initialized()
-            vas_bundles = slt_api.get_vas_bundles(SUBSCRIBER_ID)
+            vas_bundles = (await slt_cache.get("get_vas_bundles", SUBSCRIBER_ID)).data
             if not vas_bundles.get("isSuccess"):
                 logger.warning("Failed to retrieve VAS bundles for notification.")
                 return
 
             data_bundle = vas_bundles.get("dataBundle", {})
             usage_details = data_bundle.get("usageDetails", [])
+            self.update_deadlines(VAS_EXPIRY, SUBSCRIBER_ID, data_bundle)
+            await self.record_snapshot("vas", SUBSCRIBER_ID, data_bundle)
 
             if not usage_details:
                 logger.info("No active VAS bundles for notification.")
@@ -190,7 +332,7 @@ class NotificationsCommands(commands.Cog):
             logger.info(f"[{current_time}] Spike Test notification sent.")
 
             # Daily Summary Test
-            api_response_daily = slt_api.get_usage_summary(SUBSCRIBER_ID)
+            api_response_daily = (await slt_cache.get("get_usage_summary", SUBSCRIBER_ID)).data
             daily_result = daily_summary(api_response_daily)
             daily_channel = self.get_channel(DAILY_SUMMARY_CHANNEL_ID) or ctx.channel
             await daily_channel.send(f"**Daily Summary Test:**\n{daily_result}")
@@ -209,13 +351,14 @@ class NotificationsCommands(commands.Cog):
                 logger.warning(f"[{current_time}] Threshold not set for test_all command.")
 
             # Bills Notification Test
-            bills_message = fetch_bill_info_and_format(slt_api, TP_NO, ACCOUNT_NO)
+            bill_data = await fetch_bill_info_cached(slt_cache, TP_NO, ACCOUNT_NO)
+            bills_message = format_bill_info(bill_data) if bill_data else "Could not retrieve the bill payment information."
             bills_channel = self.get_channel(BILLS_CHANNEL_ID) or ctx.channel
             await bills_channel.send(f"**Bills Notification Test:**\n{bills_message}")
             logger.info(f"[{current_time}] Bills Notification Test sent.")
 
             # VAS Bundles Notification Test
-            vas_bundles = slt_api.get_vas_bundles(SUBSCRIBER_ID)
+            vas_bundles = (await slt_cache.get("get_vas_bundles", SUBSCRIBER_ID)).data
             if vas_bundles.get("isSuccess"):
                 vas_details = vas_bundles.get("dataBundle", {}).get("usageDetails", [])
                 if vas_details:
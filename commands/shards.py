@@ -0,0 +1,115 @@
+from config.config import SHARD_METRICS_INTERVAL
+from collections import Counter
+import logging
+import time
+from discord.ext import commands, tasks
+
+logger = logging.getLogger(__name__)  # Module-specific logger
+
+
+class ShardMetrics(commands.Cog):
+    """
+    Logs latency, event rate and guild count for each shard this process runs,
+    and reports readiness per shard.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.event_counts = Counter()
+        self.window_start = time.monotonic()
+        self.report_shard_metrics.change_interval(seconds=SHARD_METRICS_INTERVAL)
+        self.report_shard_metrics.start()
+        logger.info("ShardMetrics Cog initialized", extra={'event_type': 'cog_init'})
+
+    def cog_unload(self):
+        self.report_shard_metrics.cancel()
+
+    def shard_for(self, guild_id):
+        """Returns the shard that owns a guild (shard 0 for DMs or an unsharded bot)."""
+        if guild_id is None or not self.bot.shard_count:
+            return 0
+        return (int(guild_id) >> 22) % self.bot.shard_count
+
+    def count_event(self, guild_id):
+        self.event_counts[self.shard_for(guild_id)] += 1
+
+    def latencies(self):
+        latencies = getattr(self.bot, "latencies", None)
+        if latencies:
+            return latencies
+        return [(self.bot.shard_id or 0, self.bot.latency)]
+
+    # ---- Listeners ----
+    @commands.Cog.listener()
+    async def on_shard_ready(self, shard_id):
+        guilds = [guild for guild in self.bot.guilds if guild.shard_id == shard_id]
+        logger.info(
+            f"Shard {shard_id} is ready",
+            extra={
+                'event_type': 'shard_ready',
+                'shard_id': shard_id,
+                'shard_count': self.bot.shard_count,
+                'guild_count': len(guilds),
+                'guilds': [{'id': guild.id, 'name': guild.name} for guild in guilds]
+            }
+        )
+
+    @commands.Cog.listener()
+    async def on_shard_disconnect(self, shard_id):
+        logger.warning(f"Shard {shard_id} disconnected", extra={'event_type': 'shard_disconnect', 'shard_id': shard_id})
+
+    @commands.Cog.listener()
+    async def on_shard_resumed(self, shard_id):
+        logger.info(f"Shard {shard_id} resumed", extra={'event_type': 'shard_resumed', 'shard_id': shard_id})
+
+    @commands.Cog.listener()
+    async def on_message(self, message):
+        self.count_event(message.guild.id if message.guild else None)
+
+    @commands.Cog.listener()
+    async def on_interaction(self, interaction):
+        self.count_event(interaction.guild_id)
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_add(self, payload):
+        self.count_event(payload.guild_id)
+
+    @commands.Cog.listener()
+    async def on_raw_message_edit(self, payload):
+        self.count_event(payload.guild_id)
+
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload):
+        self.count_event(payload.guild_id)
+
+    # ---- Tasks ----
+    @tasks.loop(seconds=60)
+    async def report_shard_metrics(self):
+        """Log one metrics record per shard and reset the event counters."""
+        elapsed = max(time.monotonic() - self.window_start, 1e-6)
+        guild_counts = Counter(guild.shard_id or 0 for guild in self.bot.guilds)
+        for shard_id, latency in self.latencies():
+            logger.info(
+                f"Shard {shard_id} metrics",
+                extra={
+                    'event_type': 'shard_metrics',
+                    'shard_id': shard_id,
+                    'shard_count': self.bot.shard_count,
+                    'latency_ms': round(latency * 1000, 2) if latency != float("inf") else None,
+                    'guild_count': guild_counts.get(shard_id, 0),
+                    'events': self.event_counts.get(shard_id, 0),
+                    'events_per_second': round(self.event_counts.get(shard_id, 0) / elapsed, 3)
+                }
+            )
+        self.event_counts.clear()
+        self.window_start = time.monotonic()
+
+    @report_shard_metrics.before_loop
+    async def before_report_shard_metrics(self):
+        await self.bot.wait_until_ready()
+
+
+async def setup(bot):
+    """Register the cog with the bot."""
+    await bot.add_cog(ShardMetrics(bot))
+    logger.info("ShardMetrics Cog loaded", extra={'event_type': 'cog_loaded', 'cog': 'ShardMetrics'})
@@ -0,0 +1,218 @@
+from config.config import SUBSCRIBER_ID, TP_NO, ACCOUNT_NO
+from commands.general import (
+    slt_cache, format_age, format_usage_message, format_profile_message,
+    format_bill_status_message, format_vas_message,
+)
+import asyncio
+import logging
+import discord
+from discord import app_commands
+from discord.ext import commands
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)  # Module-specific logger
+
+
+class AutocompleteIndex:
+    """
+    In-memory index of names served to autocomplete callbacks, so lookups never go upstream.
+    """
+
+    def __init__(self, names=()):
+        self._entries = []
+        self.replace(names)
+
+    def replace(self, names):
+        """Replaces the indexed names, keeping a lowercase copy for prefix and substring matching."""
+        self._entries = sorted({(str(name).lower(), str(name)) for name in names if name})
+
+    def add(self, name):
+        if name and (str(name).lower(), str(name)) not in self._entries:
+            self.replace([display for _, display in self._entries] + [name])
+
+    def search(self, current: str, limit: int = 25) -> List[str]:
+        """Returns names starting with `current` first, then names containing it."""
+        current = (current or "").lower()
+        prefix = [display for lower, display in self._entries if lower.startswith(current)]
+        contains = [display for lower, display in self._entries if current in lower and not lower.startswith(current)]
+        return (prefix + contains)[:limit]
+
+
+class SlashCommands(commands.Cog):
+    """
+    App command equivalents of the prefix commands. Interactions are deferred
+    immediately, cached data is shown right away, and the message is edited
+    once fresher data arrives from SLT.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        # Only configured accounts are suggested: the index is shared by every user, so an
+        # account someone typed must never show up in anyone else's suggestions
+        self.configured_accounts = {SUBSCRIBER_ID}
+        self.accounts = AutocompleteIndex(self.configured_accounts)
+        self.bundles = AutocompleteIndex()
+        self._background = set()
+        if slt_cache is not None:
+            slt_cache.subscribe(self.on_snapshot)
+            cached = slt_cache.peek("get_vas_bundles", SUBSCRIBER_ID)
+            if cached is not None:
+                self.on_snapshot(slt_cache.key("get_vas_bundles", SUBSCRIBER_ID), cached)
+        logger.info("SlashCommands Cog initialized", extra={'event_type': 'cog_init'})
+
+    def cog_unload(self):
+        if slt_cache is not None:
+            slt_cache.unsubscribe(self.on_snapshot)
+        for task in self._background:
+            task.cancel()
+
+    def on_snapshot(self, key, snapshot):
+        """Keep the autocomplete indexes in step with new SLT snapshots of the configured accounts."""
+        method, args = key[0], key[1:]
+        if not args or args[0] not in self.configured_accounts:
+            return
+        if method in ("get_usage_summary", "get_vas_bundles"):
+            self.accounts.add(args[0])
+        if method == "get_vas_bundles":
+            details = snapshot.data.get("dataBundle", {}).get("usageDetails", [])
+            self.bundles.replace(detail.get("name") for detail in details)
+
+    def log_interaction(self, interaction: discord.Interaction, command_name, cache_state):
+        logger.info(
+            f"/{command_name} command executed",
+            extra={
+                'event_type': 'app_command_executed',
+                'command': command_name,
+                'user_id': str(interaction.user.id),
+                'guild_id': str(interaction.guild_id) if interaction.guild_id else None,
+                'channel_id': str(interaction.channel_id),
+                'cache_state': cache_state
+            }
+        )
+
+    @staticmethod
+    def render(snapshot, render, what):
+        if not snapshot.data.get("isSuccess", False):
+            return f"Failed to retrieve {what}. The SLT API returned an unsuccessful response."
+        return render(snapshot.data)
+
+    async def respond(self, interaction: discord.Interaction, command_name, what, method, args, render):
+        """
+        Defer the interaction, then answer from the cache if possible and refresh in the background.
+        """
+        await interaction.response.defer(thinking=True)
+
+        try:
+            if slt_cache is None:
+                raise RuntimeError("SLT API is not initialized.")
+
+            cached = slt_cache.peek(method, *args)
+            if cached is None:
+                self.log_interaction(interaction, command_name, 'miss')
+                snapshot = await slt_cache.get(method, *args)
+                await interaction.edit_original_response(content=self.render(snapshot, render, what))
+                return
+
+            fresh = cached.age < slt_cache.ttl
+            self.log_interaction(interaction, command_name, 'fresh' if fresh else 'stale')
+            content = self.render(cached, render, what)
+            if not fresh:
+                content += f"\n_Cached {format_age(cached.age)} ago, refreshing…_"
+            await interaction.edit_original_response(content=content)
+
+            if not fresh:
+                task = asyncio.create_task(
+                    self.refresh_and_edit(interaction, command_name, what, method, args, render, cached)
+                )
+                self._background.add(task)
+                task.add_done_callback(self._background.discard)
+        except RuntimeError as e:
+            await interaction.edit_original_response(content=str(e))
+        except Exception as e:
+            logger.error(
+                f"Error executing /{command_name} command",
+                exc_info=True,
+                extra={
+                    'event_type': 'app_command_execution_error',
+                    'command': command_name,
+                    'user_id': str(interaction.user.id),
+                    'error': str(e),
+                    'error_type': type(e).__name__
+                }
+            )
+            await interaction.edit_original_response(content=f"An error occurred while fetching {what}.")
+
+    async def refresh_and_edit(self, interaction, command_name, what, method, args, render, cached):
+        """Fetch fresh data and edit the original response with it."""
+        try:
+            snapshot = await slt_cache.refresh(method, *args)
+            await interaction.edit_original_response(content=self.render(snapshot, render, what))
+        except discord.HTTPException as e:
+            # The interaction token is only valid for 15 minutes
+            logger.warning(
+                f"Could not edit /{command_name} response",
+                extra={'event_type': 'app_command_edit_failed', 'command': command_name, 'error': str(e)}
+            )
+        except Exception as e:
+            logger.error(
+                f"Background refresh for /{command_name} failed",
+                exc_info=True,
+                extra={'event_type': 'app_command_refresh_failed', 'command': command_name, 'error': str(e)}
+            )
+            try:
+                await interaction.edit_original_response(
+                    content=self.render(cached, render, what) + f"\n_Cached {format_age(cached.age)} ago, refresh failed._"
+                )
+            except discord.HTTPException as edit_error:
+                logger.warning(
+                    f"Could not edit /{command_name} response",
+                    extra={'event_type': 'app_command_edit_failed', 'command': command_name, 'error': str(edit_error)}
+                )
+
+    async def account_autocomplete(self, interaction: discord.Interaction, current: str):
+        return [app_commands.Choice(name=name, value=name) for name in self.accounts.search(current)]
+
+    async def bundle_autocomplete(self, interaction: discord.Interaction, current: str):
+        return [app_commands.Choice(name=name, value=name) for name in self.bundles.search(current)]
+
+    @app_commands.command(name="usage", description="Show data usage")
+    @app_commands.describe(account="Subscriber ID (defaults to the configured account)")
+    async def usage(self, interaction: discord.Interaction, account: Optional[str] = None):
+        await self.respond(
+            interaction, "usage", "usage data", "get_usage_summary",
+            (account or SUBSCRIBER_ID,), format_usage_message
+        )
+
+    @app_commands.command(name="profile", description="Show profile information")
+    @app_commands.describe(account="Subscriber ID (defaults to the configured account)")
+    async def profile(self, interaction: discord.Interaction, account: Optional[str] = None):
+        await self.respond(
+            interaction, "profile", "profile data", "get_profile",
+            (account or SUBSCRIBER_ID,), format_profile_message
+        )
+
+    @app_commands.command(name="bill", description="Show bill status")
+    async def bill(self, interaction: discord.Interaction):
+        await self.respond(
+            interaction, "bill", "bill data", "get_bill_status",
+            (TP_NO, ACCOUNT_NO), format_bill_status_message
+        )
+
+    @app_commands.command(name="add_on", description="Show active VAS bundles")
+    @app_commands.describe(account="Subscriber ID (defaults to the configured account)", bundle="Only show this bundle")
+    async def add_on(self, interaction: discord.Interaction, account: Optional[str] = None, bundle: Optional[str] = None):
+        await self.respond(
+            interaction, "add_on", "VAS bundles information", "get_vas_bundles",
+            (account or SUBSCRIBER_ID,), lambda data: format_vas_message(data, bundle)
+        )
+
+    usage.autocomplete("account")(account_autocomplete)
+    profile.autocomplete("account")(account_autocomplete)
+    add_on.autocomplete("account")(account_autocomplete)
+    add_on.autocomplete("bundle")(bundle_autocomplete)
+
+
+async def setup(bot):
+    """Register the cog with the bot."""
+    await bot.add_cog(SlashCommands(bot))
+    logger.info("SlashCommands Cog loaded", extra={'event_type': 'cog_loaded', 'cog': 'SlashCommands'})
@@ -0,0 +1,153 @@
+from config.config import (
+    COMMAND_USER_COOLDOWN, COMMAND_GUILD_COOLDOWN, COMMAND_COOLDOWN_OVERRIDES, COMMAND_RESULT_TTL,
+)
+import logging
+import time
+from discord.ext import commands
+
+logger = logging.getLogger(__name__)  # Module-specific logger
+
+
+class CommandThrottle:
+    """
+    Per-command cooldowns applied per user and per guild.
+
+    Each command gets its own pair of cooldown mappings, so spamming `!usage`
+    does not lock a user out of `!bill`. Commands listed in
+    COMMAND_COOLDOWN_OVERRIDES use their own (rate, per) for both buckets.
+
+    Cogs call `check` from `cog_before_invoke`, not `cog_check`: checks also run
+    when `!help` filters the command list, which must not use up anyone's tokens.
+    """
+
+    def __init__(self, user_cooldown=COMMAND_USER_COOLDOWN, guild_cooldown=COMMAND_GUILD_COOLDOWN,
+                 overrides=COMMAND_COOLDOWN_OVERRIDES):
+        self.user_cooldown = user_cooldown
+        self.guild_cooldown = guild_cooldown
+        self.overrides = overrides
+        self._mappings = {}
+
+    def _get_mappings(self, command_name):
+        if command_name not in self._mappings:
+            user_rate, user_per = self.overrides.get(command_name, self.user_cooldown)
+            guild_rate, guild_per = self.overrides.get(command_name, self.guild_cooldown)
+            self._mappings[command_name] = (
+                commands.CooldownMapping.from_cooldown(guild_rate, guild_per, commands.BucketType.guild),
+                commands.CooldownMapping.from_cooldown(user_rate, user_per, commands.BucketType.user),
+            )
+        return self._mappings[command_name]
+
+    def check(self, ctx):
+        """
+        Consume one use for the invoking user and guild, raising CommandOnCooldown if
+        either is exhausted. Both buckets are checked before either is updated, so a
+        rejected command does not use up a token.
+        """
+        current = ctx.message.created_at.timestamp()
+        buckets = []
+        for mapping in self._get_mappings(ctx.command.qualified_name):
+            bucket = mapping.get_bucket(ctx.message, current)
+            if bucket is None:
+                continue
+            retry_after = bucket.get_retry_after(current)
+            if retry_after:
+                raise commands.CommandOnCooldown(bucket, retry_after, mapping.type)
+            buckets.append(bucket)
+        for bucket in buckets:
+            bucket.update_rate_limit(current)
+        return True
+
+
+async def handle_cooldown_error(ctx, error):
+    """
+    Tell the user when a command is on cooldown.
+
+    Returns:
+        bool: True if the error was a cooldown and has been handled.
+    """
+    if not isinstance(error, commands.CommandOnCooldown):
+        return False
+    scope = "this server" if error.type == commands.BucketType.guild else "you"
+    logger.info(
+        f"{ctx.command} command rate limited",
+        extra={
+            'event_type': 'command_cooldown',
+            'command': str(ctx.command),
+            'user_id': str(ctx.author.id),
+            'guild_id': str(ctx.guild.id) if ctx.guild else None,
+            'scope': error.type.name,
+            'retry_after': round(error.retry_after, 2)
+        }
+    )
+    await ctx.send(f"`!{ctx.command}` is on cooldown for {scope}. Try again in {error.retry_after:.0f}s.")
+    return True
+
+
+async def handle_command_error(ctx, error):
+    """
+    Error handler for cogs: replies to cooldowns and bad input, and logs anything else
+    with its traceback (defining `cog_command_error` turns off discord.py's default
+    handler, so nothing else would report it).
+    """
+    if await handle_cooldown_error(ctx, error):
+        return
+    if isinstance(error, commands.UserInputError):
+        await ctx.send(f"{error} Use `!help {ctx.command}` for usage.")
+        return
+    if isinstance(error, commands.CheckFailure):
+        await ctx.send("You can't use this command here.")
+        return
+    original = getattr(error, "original", error)
+    logger.error(
+        f"Unhandled error in {ctx.command} command",
+        exc_info=(type(original), original, original.__traceback__),
+        extra={
+            'event_type': 'command_unhandled_error',
+            'command': str(ctx.command),
+            'user_id': str(ctx.author.id),
+            'error': str(original),
+            'error_type': type(original).__name__
+        }
+    )
+    await ctx.send("An unexpected error occurred while running this command.")
+
+
+class ResultCache:
+    """
+    Short-lived cache of rendered command results, with hit/miss counters.
+    """
+
+    def __init__(self, ttl=COMMAND_RESULT_TTL):
+        self.ttl = ttl
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Returns (message, age_seconds) for a fresh entry, or None."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            message, created_at = entry
+            age = time.monotonic() - created_at
+            if age < self.ttl:
+                self.hits += 1
+                return message, age
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def set(self, key, message):
+        self._entries[key] = (message, time.monotonic())
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hit_rate, 4),
+            'entries': len(self._entries),
+        }
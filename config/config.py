@@ -15,6 +15,84 @@ WEEKLY_RECAP_CHANNEL_ID = int(os.getenv("WEEKLY_RECAP_CHANNEL_ID", 0))
 BILLS_CHANNEL_ID = int(os.getenv("BILLS_CHANNEL_ID", 0))
 ADD_ON_USAGE_CHANNEL_ID = int(os.getenv("ADD_ON_USAGE_CHANNEL_ID", 0))
 
+# Reminder offsets (in days) before bill due dates and VAS expiry dates
+REMINDER_OFFSET_DAYS = [
+    float(days) for days in os.getenv("REMINDER_OFFSET_DAYS", "3,1").split(",") if days.strip()
+]
+
+def _parse_cooldown(value):
+    """Parses a "rate/seconds" cooldown string, e.g. "3/60" for 3 uses per minute."""
+    rate, per = value.split("/")
+    return int(rate), float(per)
+
+# Command cooldowns ("uses/seconds") and rendered result cache TTL (seconds)
+COMMAND_USER_COOLDOWN = _parse_cooldown(os.getenv("COMMAND_USER_COOLDOWN", "3/60"))
+COMMAND_GUILD_COOLDOWN = _parse_cooldown(os.getenv("COMMAND_GUILD_COOLDOWN", "10/60"))
+# Per-command overrides, e.g. "test_all=1/300,usage=5/60"
+COMMAND_COOLDOWN_OVERRIDES = {
+    name.strip(): _parse_cooldown(cooldown)
+    for name, cooldown in (
+        item.split("=") for item in os.getenv("COMMAND_COOLDOWN_OVERRIDES", "test_all=1/300").split(",") if item.strip()
+    )
+}
+COMMAND_RESULT_TTL = float(os.getenv("COMMAND_RESULT_TTL", 60))
+
+# Usage history store and poll interval (seconds)
+HISTORY_DB_PATH = os.getenv("HISTORY_DB_PATH", "data/usage_history.db")
+USAGE_POLL_INTERVAL = float(os.getenv("USAGE_POLL_INTERVAL", 300))
+
+# Live usage stream: heartbeat interval (seconds), per-connection queue size and connection limit
+STREAM_HEARTBEAT_INTERVAL = float(os.getenv("STREAM_HEARTBEAT_INTERVAL", 15))
+STREAM_QUEUE_SIZE = int(os.getenv("STREAM_QUEUE_SIZE", 8))
+STREAM_MAX_SUBSCRIBERS = int(os.getenv("STREAM_MAX_SUBSCRIBERS", 10000))
+
+# Maximum number of concurrent SLT API calls per process
+SLT_MAX_CONCURRENCY = int(os.getenv("SLT_MAX_CONCURRENCY", 4))
+
+# Maximum number of sub-requests in one POST /batch call (with rate limiting on, also at most RATE_LIMIT_BURST)
+BATCH_MAX_REQUESTS = int(os.getenv("BATCH_MAX_REQUESTS", 50))
+
+# API rate limiting: token bucket per API key (X-API-Key) or client IP.
+# RATE_LIMIT_RATE is tokens refilled per second, RATE_LIMIT_BURST the bucket size.
+# RATE_LIMIT_STORE=sqlite shares buckets between API worker processes via RATE_LIMIT_DB_PATH
+# (the default with more than one API_WORKERS, so each worker does not get its own full budget).
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMIT_RATE = float(os.getenv("RATE_LIMIT_RATE", 5))
+RATE_LIMIT_BURST = float(os.getenv("RATE_LIMIT_BURST", 20))
+RATE_LIMIT_STORE = os.getenv(
+    "RATE_LIMIT_STORE", "sqlite" if int(os.getenv("API_WORKERS", 1)) > 1 else "memory"
+).lower()
+RATE_LIMIT_DB_PATH = os.getenv("RATE_LIMIT_DB_PATH", "data/ratelimit.db")
+RATE_LIMIT_TRUST_PROXY = os.getenv("RATE_LIMIT_TRUST_PROXY", "false").lower() == "true"
+# Comma-separated API keys that get their own bucket via X-API-Key; other keys are ignored
+API_KEYS = frozenset(key.strip() for key in os.getenv("API_KEYS", "").split(",") if key.strip())
+
+# Encoded API response cache (number of route/params/snapshot-version entries kept)
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", 256))
+
+# How often per-shard latency, event rate and guild counts are logged (seconds)
+SHARD_METRICS_INTERVAL = float(os.getenv("SHARD_METRICS_INTERVAL", 60))
+
+# Port for the bot's Prometheus /metrics endpoint (disabled if unset; the API serves /metrics itself)
+METRICS_PORT = int(os.getenv("METRICS_PORT")) if os.getenv("METRICS_PORT") else None
+
+# Multi-worker API: API_WORKERS uvicorn worker processes share SLT tokens and snapshots
+# through a SQLite database (SHARED_STORE, on by default when there is more than one worker).
+# One worker, chosen with a file lock at LEADER_LOCK_PATH, runs the usage poller.
+API_WORKERS = int(os.getenv("API_WORKERS", 1))
+SHARED_STORE_ENABLED = os.getenv("SHARED_STORE", "true" if API_WORKERS > 1 else "false").lower() == "true"
+SHARED_STORE_PATH = os.getenv("SHARED_STORE_PATH", "data/shared.db")
+LEADER_LOCK_PATH = os.getenv("LEADER_LOCK_PATH", "data/leader.lock")
+
+# Leader election: "file" (flock, processes on one host), "lease" (SQLite lease with a TTL
+# and fencing tokens, for replicas sharing a volume) or "none" (every process leads).
+# Polling SLT and sending notifications are separate elections (the second among bots
+# only). With "lease", a follower takes over within LEADER_LEASE_TTL * 4/3 seconds of the
+# leader going away.
+LEADER_ELECTION = os.getenv("LEADER_ELECTION", "file").lower()
+LEADER_LEASE_PATH = os.getenv("LEADER_LEASE_PATH", "data/leader.db")
+LEADER_LEASE_TTL = float(os.getenv("LEADER_LEASE_TTL", 15))
+
 # Validate configuration (optional)
 missing_vars = [
     var for var, value in {
@@ -2,11 +2,12 @@ import { Button } from "@/components/ui/button";
 import { Card, CardContent, CardDescription, CardFooter, CardHeader, CardTitle } from "@/components/ui/card";
 import { Alert, AlertDescription, AlertTitle } from "@/components/ui/alert";
 import { useBillStatus } from "@/hooks/useApiData";
+import type { BillStatus } from "@/services/api";
 import { Loader2, AlertCircle, RefreshCw, Receipt, Calendar, Clock, Wallet } from "lucide-react";
 import { useState } from "react";
 
-export function BillCard() {
-  const { data: bill, isLoading, error, refetch } = useBillStatus();
+export function BillCard({ data }: { data?: BillStatus } = {}) {
+  const { data: bill, isLoading, error, refetch } = useBillStatus(data);
   const [paymentProcessing, setPaymentProcessing] = useState(false);
 
   const handlePayBill = () => {
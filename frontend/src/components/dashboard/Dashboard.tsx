@@ -7,17 +7,14 @@ import { Card, CardContent, CardDescription, CardHeader, CardTitle } from "@/com
 import { Tabs, TabsContent, TabsList, TabsTrigger } from "@/components/ui/tabs";
 import { Alert, AlertDescription, AlertTitle } from "@/components/ui/alert";
 import { Gauge, BarChart3, CheckCircle2, Info, AlertCircle } from "lucide-react";
-import { useUsageSummary, useProfile, useBillStatus, useVasBundles } from "@/hooks/useApiData";
+import { useDashboard } from "@/hooks/useApiData";
 
 export function Dashboard() {
-  // For the summary view, we need all the data
-  const { data: usage, isLoading: usageLoading, error: usageError } = useUsageSummary();
-  const { data: profile, isLoading: profileLoading, error: profileError } = useProfile();
-  const { data: bill, isLoading: billLoading, error: billError } = useBillStatus();
-  const { data: vas, isLoading: vasLoading, error: vasError } = useVasBundles();
-  
-  const isLoading = usageLoading || profileLoading || billLoading || vasLoading;
-  const hasError = usageError || profileError || billError || vasError;
+  // For the summary view, we need all the data: fetch it in one round trip
+  const { data: dashboard, isLoading, error } = useDashboard();
+  const { usage, profile, bill, vas } = dashboard;
+
+  const hasError = error || Object.keys(dashboard.errors).length > 0;
 
   // Function to determine health status
   const getStatus = () => {
@@ -28,17 +25,18 @@ export function Dashboard() {
   
   // Get summary information
   const status = getStatus();
-  const activeVasBundles = vas.bundles?.length || 0;
-  const hasBillDue = bill.status?.toLowerCase()?.includes('unpaid');
+  const activeVasBundles = vas?.bundles?.length || 0;
+  const hasBillDue = bill?.status?.toLowerCase()?.includes('unpaid');
+  const usagePercentage = usage?.total_percentage ?? 0;
   
   // Stats for the dashboard
   const stats = [
     {
       title: "Data Usage",
-      value: `${usage.percentage.toFixed(1)}%`,
-      description: `${usage.used}GB of ${usage.limit}GB used`,
+      value: `${usagePercentage.toFixed(1)}%`,
+      description: `${usage?.total_used ?? 0}GB of ${usage?.total_limit ?? 0}GB used`,
       icon: <Gauge className="h-5 w-5" />,
-      color: usage.percentage > 80 ? "text-red-500" : usage.percentage > 60 ? "text-yellow-500" : "text-green-500"
+      color: usagePercentage > 80 ? "text-red-500" : usagePercentage > 60 ? "text-yellow-500" : "text-green-500"
     },
     {
       title: "Active Bundles",
@@ -98,7 +96,7 @@ export function Dashboard() {
       </div>
 
       {/* Bill Alert (show only if there's a bill due) */}
-      {hasBillDue && !billLoading && !billError && (
+      {hasBillDue && !isLoading && bill && (
         <Alert>
           <AlertCircle className="h-4 w-4" />
           <AlertTitle>Payment Due</AlertTitle>
@@ -118,19 +116,19 @@ export function Dashboard() {
         </TabsList>
         
         <TabsContent value="usage">
-          <UsageCard />
+          {!isLoading && <UsageCard data={usage} />}
         </TabsContent>
         
         <TabsContent value="profile">
-          <ProfileCard />
+          {!isLoading && <ProfileCard data={profile} />}
         </TabsContent>
         
         <TabsContent value="bill">
-          <BillCard />
+          {!isLoading && <BillCard data={bill} />}
         </TabsContent>
         
         <TabsContent value="vas">
-          <VASBundleCard />
+          {!isLoading && <VASBundleCard data={vas} />}
         </TabsContent>
       </Tabs>
     </div>
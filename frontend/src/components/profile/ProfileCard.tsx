@@ -2,10 +2,11 @@ import { Button } from "@/components/ui/button";
 import { Card, CardContent, CardDescription, CardFooter, CardHeader, CardTitle } from "@/components/ui/card";
 import { Alert, AlertDescription, AlertTitle } from "@/components/ui/alert";
 import { useProfile } from "@/hooks/useApiData";
+import type { ProfileInfo } from "@/services/api";
 import { Loader2, AlertCircle, RefreshCw, User, Package, Phone, Mail, Smartphone } from "lucide-react";
 
-export function ProfileCard() {
-  const { data: profile, isLoading, error, refetch } = useProfile();
+export function ProfileCard({ data }: { data?: ProfileInfo } = {}) {
+  const { data: profile, isLoading, error, refetch } = useProfile(data);
 
   if (isLoading) {
     return (
@@ -44,7 +45,7 @@ export function ProfileCard() {
     { 
       icon: <Smartphone className="h-4 w-4" />, 
       label: "Mobile No", 
-      value: profile.raw_data?.mobile_no || 'Not provided'
+      value: profile.mobile_no || 'Not provided'
     }
   ];
 
@@ -4,10 +4,11 @@ import { Progress } from "@/components/ui/progress";
 import { Alert, AlertDescription, AlertTitle } from "@/components/ui/alert";
 import { Tabs, TabsContent, TabsList, TabsTrigger } from "@/components/ui/tabs";
 import { useUsageSummary } from "@/hooks/useApiData";
+import type { UsageSummary } from "@/services/api";
 import { Loader2, AlertCircle, RefreshCw, Sun, Moon } from "lucide-react";
 
-export function UsageCard() {
-  const { data: usage, isLoading, error, refetch } = useUsageSummary();
+export function UsageCard({ data }: { data?: UsageSummary } = {}) {
+  const { data: usage, isLoading, error, refetch } = useUsageSummary(undefined, data);
 
   if (isLoading) {
     return (
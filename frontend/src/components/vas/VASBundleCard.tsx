@@ -3,10 +3,11 @@ import { Button } from "@/components/ui/button";
 import { Card, CardContent, CardDescription, CardFooter, CardHeader, CardTitle } from "@/components/ui/card";
 import { Alert, AlertDescription, AlertTitle } from "@/components/ui/alert";
 import { useVasBundles } from "@/hooks/useApiData";
+import type { VASBundles } from "@/services/api";
 import { Loader2, AlertCircle, RefreshCw, Box, Calendar } from "lucide-react";
 
-export function VASBundleCard() {
-  const { data: vasData, isLoading, error, refetch } = useVasBundles();
+export function VASBundleCard({ data }: { data?: VASBundles } = {}) {
+  const { data: vasData, isLoading, error, refetch } = useVasBundles(data);
 
   if (isLoading) {
     return (
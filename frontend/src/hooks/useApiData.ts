@@ -1,15 +1,18 @@
 import { useState, useEffect } from 'react';
-import { api } from '@/services/api';
-import type { UsageSummary } from '@/services/api';
+import { api, subscribeUsage } from '@/services/api';
+import type { UsageSummary, ProfileInfo, BillStatus, VASBundles, DashboardData } from '@/services/api';
 
 // Generic hook for fetching data from any API endpoint
+// If `prefetched` is given (e.g. from the combined dashboard response), it is used
+// instead of fetching on mount; `refetch` still calls the individual endpoint.
 export function useApiData<T>(
   fetchFunction: () => Promise<T>,
   initialData: T,
-  refreshInterval?: number
+  refreshInterval?: number,
+  prefetched?: T
 ) {
-  const [data, setData] = useState<T>(initialData);
-  const [isLoading, setIsLoading] = useState(true);
+  const [data, setData] = useState<T>(prefetched ?? initialData);
+  const [isLoading, setIsLoading] = useState(prefetched === undefined);
   const [error, setError] = useState<Error | null>(null);
 
   const fetchData = async () => {
@@ -26,7 +29,16 @@ export function useApiData<T>(
   };
 
   useEffect(() => {
-    fetchData();
+    if (prefetched !== undefined) {
+      setData(prefetched);
+      setIsLoading(false);
+    }
+  }, [prefetched]);
+
+  useEffect(() => {
+    if (prefetched === undefined) {
+      fetchData();
+    }
 
     // Set up polling if refreshInterval is provided
     if (refreshInterval) {
@@ -37,6 +49,7 @@ export function useApiData<T>(
 
   return {
     data,
+    setData,
     isLoading,
     error,
     refetch: fetchData,
@@ -44,7 +57,7 @@ export function useApiData<T>(
 }
 
 // Specific hooks for each API endpoint
-export function useUsageSummary(refreshInterval?: number) {
+export function useUsageSummary(refreshInterval?: number, prefetched?: UsageSummary) {
   const initialData: UsageSummary = {
     total_used: 0,
     total_limit: 1,
@@ -63,28 +76,38 @@ export function useUsageSummary(refreshInterval?: number) {
     }
   };
   
-  return useApiData(api.getUsageSummary, initialData, refreshInterval);
+  const result = useApiData(api.getUsageSummary, initialData, refreshInterval, prefetched);
+  const { setData } = result;
+
+  // Live updates replace polling: the server pushes a new summary only when usage changes
+  useEffect(() => subscribeUsage(setData), []);
+
+  return result;
 }
 
-export function useProfile() {
+export function useProfile(prefetched?: ProfileInfo) {
   return useApiData(api.getProfileInfo, {
     fullname: '',
     package: '',
     raw_data: {}
-  });
+  }, undefined, prefetched);
 }
 
-export function useBillStatus() {
+export function useBillStatus(prefetched?: BillStatus) {
   return useApiData(api.getBillStatus, {
     status: '',
     raw_data: {}
-  });
+  }, undefined, prefetched);
 }
 
-export function useVasBundles() {
+export function useVasBundles(prefetched?: VASBundles) {
   return useApiData(api.getVASBundles, {
     bundles: []
-  });
+  }, undefined, prefetched);
+}
+
+export function useDashboard() {
+  return useApiData<DashboardData>(api.getDashboard, { errors: {} });
 }
 
 export function useExtraGb() {
@@ -22,14 +22,15 @@ export interface ProfileInfo {
   package: string;
   contact_no?: string;
   email?: string;
-  raw_data: Record<string, any>;
+  mobile_no?: string;
+  raw_data?: Record<string, any>;
 }
 
 export interface BillStatus {
   status: string;
   amount?: number;
   due_date?: string;
-  raw_data: Record<string, any>;
+  raw_data?: Record<string, any>;
 }
 
 export interface VASBundle {
@@ -37,13 +38,21 @@ export interface VASBundle {
   used?: string;
   expiry_date?: string;
   description?: string;
-  raw_data: Record<string, any>;
+  raw_data?: Record<string, any>;
 }
 
 export interface VASBundles {
   bundles: VASBundle[];
 }
 
+export interface DashboardData {
+  usage?: UsageSummary;
+  profile?: ProfileInfo;
+  bill?: BillStatus;
+  vas?: VASBundles;
+  errors: Record<string, string>;
+}
+
 // Generic fetch function with error handling
 async function fetchData<T>(endpoint: string): Promise<T> {
   try {
@@ -60,8 +69,21 @@ async function fetchData<T>(endpoint: string): Promise<T> {
   }
 }
 
+// Subscribe to live usage updates pushed by the server (Server-Sent Events).
+// Returns a function that closes the stream.
+export function subscribeUsage(onUpdate: (usage: UsageSummary) => void): () => void {
+  const source = new EventSource(`${API_BASE_URL}/stream/usage`);
+  source.addEventListener('usage', (event) => {
+    onUpdate(JSON.parse((event as MessageEvent).data) as UsageSummary);
+  });
+  return () => source.close();
+}
+
 // API functions
 export const api = {
+  // Combined dashboard data (one round trip)
+  getDashboard: () => fetchData<DashboardData>('/dashboard'),
+
   // Usage related endpoints
   getUsageSummary: () => fetchData<UsageSummary>('/usage/summary'),
   
@@ -0,0 +1,380 @@
+"""
+Latency percentiles, error rates and token refreshes from the JSON logs.
+
+Log files are read line by line (rotated segments included, gzip or zstd compressed), so
+memory use does not grow with the size of the logs. Each file is parsed in its own
+worker process and the partial results are merged. Latencies are kept in log-scaled
+histograms (2% relative precision), which merge exactly and stay small however many
+records are read. Records kept by log sampling are weighted by 1 / sample_rate.
+
+Usage:
+    python log_analytics.py                          # every log in logs/ and its rotated segments
+    python log_analytics.py --window 15m --from 2026-10-01T00:00
+    python log_analytics.py --app-name api_server --format json
+    python log_analytics.py logs/api_server.log.20261019-000000.gz
+"""
+import argparse
+import glob
+import gzip
+import json
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+WINDOW_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+PERCENTILES = (50, 95, 99)
+
+# Event types that count as failures of an API route or SLT endpoint
+ROUTE_ERROR_EVENTS = {"request_error"}
+ENDPOINT_ERROR_EVENTS = {"slt_api_http_error", "slt_api_request_error"}
+TOKEN_EVENTS = {
+    "slt_api_login_success": "login",
+    "slt_api_login_failed": "login_failed",
+    "slt_api_token_expired": "token_expired",
+    "slt_api_token_refresh_success": "refresh",
+    "slt_api_token_refresh_failed": "refresh_failed",
+    "slt_api_token_refresh_invalid": "refresh_failed",
+}
+
+_GROWTH = 1.02
+_LOG_GROWTH = math.log(_GROWTH)
+
+
+class LatencyHistogram:
+    """Log-scaled histogram of durations: bucket i holds values up to 1.02 ** i ms."""
+
+    __slots__ = ("buckets", "count")
+
+    def __init__(self):
+        self.buckets: Dict[int, float] = {}
+        self.count = 0.0
+
+    def add(self, value: float, weight: float = 1.0):
+        index = math.ceil(math.log(value) / _LOG_GROWTH) if value > 0 else -1000
+        self.buckets[index] = self.buckets.get(index, 0.0) + weight
+        self.count += weight
+
+    def merge(self, other: "LatencyHistogram"):
+        for index, weight in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0.0) + weight
+        self.count += other.count
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        target = self.count * q / 100
+        seen = 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= target:
+                return round(_GROWTH ** index, 2) if index > -1000 else 0.0
+        return round(_GROWTH ** max(self.buckets), 2)
+
+
+class Series:
+    """Request count, error count and latency histogram for one route or endpoint."""
+
+    __slots__ = ("requests", "errors", "latency")
+
+    def __init__(self):
+        self.requests = 0.0
+        self.errors = 0.0
+        self.latency = LatencyHistogram()
+
+    def merge(self, other: "Series"):
+        self.requests += other.requests
+        self.errors += other.errors
+        self.latency.merge(other.latency)
+
+    def summary(self) -> Dict[str, Any]:
+        summary = {
+            "requests": round(self.requests),
+            "errors": round(self.errors),
+            "error_rate": round(self.errors / self.requests, 4) if self.requests else 0.0,
+        }
+        for q in PERCENTILES:
+            summary[f"p{q}_ms"] = self.latency.percentile(q)
+        return summary
+
+
+class LogStats:
+    """
+    Aggregates over a set of log records. Keys are (kind, name, window start), where kind
+    is "route" (API paths) or "endpoint" (SLT API endpoints) and the window start is a Unix
+    timestamp (0 when no window is used).
+    """
+
+    def __init__(self):
+        self.series: Dict[Tuple[str, str, int], Series] = {}
+        self.token_events: Dict[Tuple[int, str], float] = {}
+        self.records = 0
+        self.unparsed = 0
+        self.first: Optional[float] = None
+        self.last: Optional[float] = None
+
+    def _series(self, kind: str, name: str, window: int) -> Series:
+        key = (kind, name, window)
+        series = self.series.get(key)
+        if series is None:
+            series = self.series[key] = Series()
+        return series
+
+    def add(self, record: Dict[str, Any], ts: float, window: int):
+        event_type = record.get("event_type")
+        weight = 1.0 / record.get("sample_rate", 1.0)
+        duration = record.get("duration_ms")
+
+        if event_type == "request_complete":
+            series = self._series("route", record.get("path", "?"), window)
+            series.requests += weight
+            if (record.get("status_code") or 0) >= 500:
+                series.errors += weight
+            if duration is not None:
+                series.latency.add(duration, weight)
+        elif event_type in ROUTE_ERROR_EVENTS:
+            series = self._series("route", record.get("path", "?"), window)
+            series.requests += weight
+            series.errors += weight
+        elif event_type == "slt_api_request_success":
+            series = self._series("endpoint", record.get("api_endpoint", "?"), window)
+            series.requests += weight
+            if duration is not None:
+                series.latency.add(duration, weight)
+        elif event_type in ENDPOINT_ERROR_EVENTS:
+            series = self._series("endpoint", record.get("api_endpoint", "?"), window)
+            series.requests += weight
+            series.errors += weight
+        elif event_type in TOKEN_EVENTS:
+            key = (window, TOKEN_EVENTS[event_type])
+            self.token_events[key] = self.token_events.get(key, 0.0) + weight
+        else:
+            return
+        self.records += 1
+        self.first = ts if self.first is None else min(self.first, ts)
+        self.last = ts if self.last is None else max(self.last, ts)
+
+    def merge(self, other: "LogStats"):
+        for key, series in other.series.items():
+            self._series(*key).merge(series)
+        for key, count in other.token_events.items():
+            self.token_events[key] = self.token_events.get(key, 0.0) + count
+        self.records += other.records
+        self.unparsed += other.unparsed
+        for ts in (other.first, other.last):
+            if ts is not None:
+                self.first = ts if self.first is None else min(self.first, ts)
+                self.last = ts if self.last is None else max(self.last, ts)
+
+    def report(self) -> Dict[str, Any]:
+        """Overall per-route and per-endpoint summaries plus a per-window time series."""
+        totals: Dict[Tuple[str, str], Series] = {}
+        windows: Dict[int, Dict[str, Any]] = {}
+        for (kind, name, window), series in self.series.items():
+            totals.setdefault((kind, name), Series()).merge(series)
+            bucket = windows.setdefault(window, {"routes": Series(), "endpoints": Series(), "token_events": {}})
+            bucket["routes" if kind == "route" else "endpoints"].merge(series)
+        token_totals: Dict[str, float] = {}
+        for (window, event), count in self.token_events.items():
+            token_totals[event] = token_totals.get(event, 0.0) + count
+            bucket = windows.setdefault(window, {"routes": Series(), "endpoints": Series(), "token_events": {}})
+            bucket["token_events"][event] = round(count)
+
+        def by_name(kind):
+            return {name: series.summary() for (k, name), series in sorted(totals.items()) if k == kind}
+
+        return {
+            "records": self.records,
+            "unparsed_lines": self.unparsed,
+            "first": _iso(self.first),
+            "last": _iso(self.last),
+            "routes": by_name("route"),
+            "endpoints": by_name("endpoint"),
+            "token_events": {event: round(count) for event, count in sorted(token_totals.items())},
+            "windows": [
+                {
+                    "start": _iso(window) if window else None,
+                    "routes": bucket["routes"].summary(),
+                    "endpoints": bucket["endpoints"].summary(),
+                    "token_events": bucket["token_events"],
+                }
+                for window, bucket in sorted(windows.items())
+            ],
+        }
+
+
+def _iso(ts: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(ts).isoformat(timespec="seconds") if ts is not None else None
+
+
+def _loads(line: str) -> Dict[str, Any]:
+    return orjson.loads(line) if orjson is not None else json.loads(line)
+
+
+def open_log(path: str):
+    """Opens a log file for line-by-line reading, decompressing gzip and zstd segments."""
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError(f"Reading {path} requires the optional 'zstandard' package")
+        return zstandard.open(path, "rt", encoding="utf-8", errors="replace")
+    return open(path, "r", encoding="utf-8", errors="replace")
+
+
+def parse_file(path: str, window: int = 0, since: Optional[float] = None,
+               until: Optional[float] = None) -> LogStats:
+    """
+    Streams one log file into a LogStats.
+
+    Args:
+        path (str): Log file, plain or .gz.
+        window (int): Window length in seconds (0 for a single window).
+        since (float, optional): Skip records before this Unix timestamp.
+        until (float, optional): Skip records at or after this Unix timestamp.
+
+    Returns:
+        LogStats: The aggregates for this file.
+    """
+    stats = LogStats()
+    # Timestamps are parsed once per second of log output
+    cached_second, cached_epoch = None, 0.0
+    with open_log(path) as lines:
+        for line in lines:
+            # Cheap pre-filter: only structured records can match an event of interest
+            if '"event_type"' not in line:
+                continue
+            try:
+                record = _loads(line)
+                timestamp = record["timestamp"]
+                second = timestamp[:19]
+                if second != cached_second:
+                    cached_second, cached_epoch = second, datetime.fromisoformat(second).timestamp()
+                ts = cached_epoch + float("0" + timestamp[19:]) if len(timestamp) > 19 else cached_epoch
+            except (ValueError, KeyError, TypeError):
+                stats.unparsed += 1
+                continue
+            if (since is not None and ts < since) or (until is not None and ts >= until):
+                continue
+            stats.add(record, ts, int(ts // window * window) if window else 0)
+    return stats
+
+
+def find_log_files(log_dir: str, app_names: Optional[List[str]] = None) -> List[str]:
+    """
+    The application logs (all of them, or those of `app_names`) and their rotated
+    segments, oldest first. Error logs are left out since every record in them is
+    also in the main log.
+    """
+    paths = []
+    for app_name in app_names or ["*"]:
+        paths.extend(glob.glob(os.path.join(log_dir, f"{app_name}.log*")))
+    # Leave out segments the log writer is still compressing
+    paths = {path for path in paths if not path.endswith(".tmp") and "_error.log" not in os.path.basename(path)}
+    return sorted(paths, key=lambda path: os.path.getmtime(path))
+
+
+def analyze(paths: List[str], window: int = 0, since: Optional[float] = None, until: Optional[float] = None,
+            workers: Optional[int] = None) -> LogStats:
+    """Parses `paths` in a process pool (one file per task) and merges the results."""
+    stats = LogStats()
+    if len(paths) <= 1 or workers == 1:
+        for path in paths:
+            stats.merge(parse_file(path, window, since, until))
+        return stats
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(parse_file, path, window, since, until) for path in paths]
+        for future in futures:
+            stats.merge(future.result())
+    return stats
+
+
+def parse_window(value: str) -> int:
+    """Parses a window length like "90s", "15m", "1h" or "1d" (or plain seconds); "0" means none."""
+    value = value.strip().lower()
+    if value and value[-1] in WINDOW_UNITS:
+        return int(float(value[:-1]) * WINDOW_UNITS[value[-1]])
+    return int(value)
+
+
+def parse_time(value: str) -> float:
+    """Parses an ISO 8601 date or datetime in local time (the log timestamps' zone)."""
+    return datetime.fromisoformat(value).timestamp()
+
+
+def _format_ms(value: Optional[float]) -> str:
+    return f"{value:.1f}" if value is not None else "-"
+
+
+def _table(title: str, rows: Dict[str, Dict[str, Any]]) -> List[str]:
+    lines = [title, f"{'':<32} {'requests':>9} {'err%':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"]
+    for name, summary in rows.items():
+        lines.append(
+            f"{name[:32]:<32} {summary['requests']:>9} {summary['error_rate'] * 100:>6.2f}% "
+            f"{_format_ms(summary['p50_ms']):>9} {_format_ms(summary['p95_ms']):>9} {_format_ms(summary['p99_ms']):>9}"
+        )
+    return lines
+
+
+def format_text(report: Dict[str, Any]) -> str:
+    lines = [f"{report['records']} records from {report['first']} to {report['last']}"]
+    if report["unparsed_lines"]:
+        lines.append(f"{report['unparsed_lines']} lines could not be parsed")
+    lines.append("")
+    lines.extend(_table("API routes", report["routes"]))
+    lines.append("")
+    lines.extend(_table("SLT endpoints", report["endpoints"]))
+    lines.append("")
+    lines.append("Token events: " + (", ".join(f"{event}={count}" for event, count in report["token_events"].items()) or "none"))
+    if len(report["windows"]) > 1:
+        lines.append("")
+        lines.append(f"{'window':<20} {'requests':>9} {'err%':>7} {'p95 ms':>9} {'SLT calls':>10} {'SLT p95':>9} {'refreshes':>10}")
+        for window in report["windows"]:
+            routes, endpoints = window["routes"], window["endpoints"]
+            refreshes = window["token_events"].get("refresh", 0) + window["token_events"].get("refresh_failed", 0)
+            lines.append(
+                f"{window['start']:<20} {routes['requests']:>9} {routes['error_rate'] * 100:>6.2f}% "
+                f"{_format_ms(routes['p95_ms']):>9} {endpoints['requests']:>10} "
+                f"{_format_ms(endpoints['p95_ms']):>9} {refreshes:>10}"
+            )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="*", help="Log files (defaults to the app logs and their rotated segments in --log-dir)")
+    parser.add_argument("--log-dir", default="logs")
+    parser.add_argument("--app-name", action="append", help="Only read this application's logs, e.g. api_server (repeatable)")
+    parser.add_argument("--window", type=parse_window, default=3600, help="Time window, e.g. 15m, 1h, 1d, 0 for none (default 1h)")
+    parser.add_argument("--from", dest="since", type=parse_time, default=None, help="Range start (ISO 8601, local time)")
+    parser.add_argument("--to", dest="until", type=parse_time, default=None, help="Range end (ISO 8601, local time)")
+    parser.add_argument("--workers", type=int, default=None, help="Parser processes (defaults to the CPU count)")
+    parser.add_argument("--format", choices=("text", "json"), default="text")
+    args = parser.parse_args(argv)
+
+    paths = args.paths or find_log_files(args.log_dir, args.app_name)
+    if not paths:
+        parser.error(f"No log files found in {args.log_dir}")
+
+    report = analyze(paths, args.window, args.since, args.until, args.workers).report()
+    if args.format == "json":
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        print(format_text(report))
+
+
+if __name__ == "__main__":
+    main()
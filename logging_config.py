@@ -1,26 +1,90 @@
 import logging
 import sys
 import json
-from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
+from logging.handlers import QueueHandler, RotatingFileHandler, TimedRotatingFileHandler
+import atexit
+import copy
+import gzip
+import heapq
+import itertools
 import os
+import queue
+import re
+import shutil
+import threading
+import time
 from datetime import datetime
 import traceback
 
+# Queue mode: handlers run on a background writer thread instead of the logging thread
+LOG_QUEUE = os.getenv("LOG_QUEUE", "true").lower() == "true"
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", 10000))
+LOG_QUEUE_POLICY = os.getenv("LOG_QUEUE_POLICY", "drop").lower()  # "drop" or "block" when the queue is full
+LOG_QUEUE_BATCH = int(os.getenv("LOG_QUEUE_BATCH", 256))
+
+# Sampling: "event_type=rate,..." keeps that fraction of INFO/DEBUG records of each event type
+LOG_SAMPLE_RATES = os.getenv("LOG_SAMPLE_RATES", "")
+# Identical WARNING+ records beyond LOG_REPEAT_LIMIT per LOG_REPEAT_WINDOW seconds are suppressed
+LOG_REPEAT_LIMIT = int(os.getenv("LOG_REPEAT_LIMIT", 5))
+LOG_REPEAT_WINDOW = float(os.getenv("LOG_REPEAT_WINDOW", 60))
+
+# Rotated segments: compressed in the background ("gzip", "zstd" or "none") and pruned by total size and age
+LOG_COMPRESSION = os.getenv("LOG_COMPRESSION", "gzip").lower()
+LOG_RETENTION_BYTES = int(os.getenv("LOG_RETENTION_BYTES", 200 * 1024 * 1024))
+LOG_RETENTION_DAYS = float(os.getenv("LOG_RETENTION_DAYS", 14))
+LOG_ROTATE_DAILY = os.getenv("LOG_ROTATE_DAILY", "false").lower() == "true"
+# Segments written to within this many seconds are left alone: with several worker processes
+# logging to one file, the others keep writing to a segment after one of them renamed it
+LOG_SEGMENT_QUIET_SECONDS = float(os.getenv("LOG_SEGMENT_QUIET_SECONDS", 10))
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+# Attributes every LogRecord has; anything else on a record came from `extra={...}`
+RESERVED_RECORD_ATTRS = frozenset(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'taskName', '_log_filtered'}
+
+
+def _json_dumps(record_dict):
+    if orjson is not None:
+        return orjson.dumps(record_dict, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(record_dict, default=str)
+
+
 class JSONFormatter(logging.Formatter):
     """
     Formatter that outputs JSON strings after parsing the log record.
+
+    Every attribute passed through `extra={...}` (event_type, duration_ms, ...) is
+    emitted as a top-level field. orjson is used when it is installed.
     """
     def __init__(self, fmt_dict=None):
         self.fmt_dict = fmt_dict if fmt_dict else {}
         super().__init__()
+        # Timestamps are formatted once per second; only the microseconds change in between.
+        # (second, prefix) is swapped as one tuple so concurrent handlers never see a mismatch.
+        self._cached_timestamp = (None, '')
         
     def format(self, record):
-        record_dict = self.__get_record_dict(record)
-        return json.dumps(record_dict)
+        return _json_dumps(self.__get_record_dict(record))
+
+    def format_timestamp(self, created):
+        second = int(created)
+        cached_second, prefix = self._cached_timestamp
+        if second != cached_second:
+            prefix = datetime.fromtimestamp(second).strftime('%Y-%m-%dT%H:%M:%S')
+            self._cached_timestamp = (second, prefix)
+        return f"{prefix}.{int((created - second) * 1000000):06d}"
     
     def __get_record_dict(self, record):
         record_dict = {
-            'timestamp': datetime.fromtimestamp(record.created).isoformat(),
+            'timestamp': self.format_timestamp(record.created),
             'level': record.levelname,
             'name': record.name,
             'message': record.getMessage(),
@@ -39,6 +103,11 @@ class JSONFormatter(logging.Formatter):
                 'traceback': traceback.format_exception(*record.exc_info)
             }
             
+        # Add the structured fields passed via `extra`
+        for key, value in record.__dict__.items():
+            if key not in RESERVED_RECORD_ATTRS:
+                record_dict[key] = value
+
         # Add any custom fields
         for key, value in self.fmt_dict.items():
             if hasattr(record, key):
@@ -46,86 +115,687 @@ class JSONFormatter(logging.Formatter):
                 
         return record_dict
 
+
+def parse_sample_rates(value):
+    """
+    Parses "event_type=rate,..." into a dict of keep rates between 0 and 1.
+
+    Raises:
+        ValueError: If an entry is malformed or a rate is out of range.
+    """
+    rates = {}
+    for entry in filter(None, (part.strip() for part in value.split(','))):
+        event_type, separator, rate = entry.partition('=')
+        if not separator or not event_type.strip():
+            raise ValueError(f"Invalid log sample rate '{entry}', expected event_type=rate")
+        rate = float(rate)
+        if not 0.0 <= rate <= 1.0:
+            raise ValueError(f"Log sample rate for '{event_type.strip()}' must be between 0 and 1")
+        rates[event_type.strip()] = rate
+    return rates
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Drops high-volume records before they are copied, queued or formatted.
+
+    - INFO/DEBUG records whose event_type has a sample rate are kept at that rate
+      (deterministically: a rate of 0.01 keeps every 100th record). Kept records carry
+      a `sample_rate` field so counts can be scaled back up. Records with an HTTP
+      status_code of 400 or above are never sampled.
+    - WARNING and above are always kept, except that identical messages from the same
+      logger are limited to `repeat_limit` per `repeat_window` seconds. The first record
+      after a suppressed stretch reports how many were dropped in a `suppressed` field.
+
+    The decision is stored on the record, so a filter shared by several handlers
+    decides (and counts) each record once.
+    """
+
+    def __init__(self, sample_rates=None, repeat_limit=LOG_REPEAT_LIMIT, repeat_window=LOG_REPEAT_WINDOW,
+                 max_tracked=1000):
+        super().__init__()
+        self.sample_rates = dict(sample_rates or {})
+        self.repeat_limit = repeat_limit
+        self.repeat_window = repeat_window
+        self.max_tracked = max_tracked
+        # event_type -> accumulated fraction; a record is kept each time it reaches 1
+        self._credit = dict.fromkeys(self.sample_rates, 1.0)
+        # (logger, level, message) -> [window start, records in window, suppressed]
+        self._repeats = {}
+        self._lock = threading.Lock()
+        self.sampled_out = 0
+        self.suppressed = 0
+
+    def filter(self, record):
+        decision = getattr(record, '_log_filtered', None)
+        if decision is None:
+            decision = self._decide(record)
+            record._log_filtered = decision
+        return decision
+
+    def _decide(self, record):
+        if record.levelno >= logging.WARNING:
+            return self.repeat_limit <= 0 or self._allow_repeat(record)
+
+        rate = self.sample_rates.get(getattr(record, 'event_type', None))
+        if rate is None or rate >= 1.0:
+            return True
+        status_code = getattr(record, 'status_code', None)
+        if isinstance(status_code, int) and status_code >= 400:
+            return True
+        event_type = record.event_type
+        # Unlocked: concurrent threads can at worst keep or skip one extra record
+        credit = self._credit[event_type] + rate
+        if credit >= 1.0:
+            self._credit[event_type] = credit - 1.0
+            record.sample_rate = rate
+            return True
+        self._credit[event_type] = credit
+        self.sampled_out += 1
+        return False
+
+    def _allow_repeat(self, record):
+        key = (record.name, record.levelno, record.getMessage())
+        now = record.created
+        with self._lock:
+            state = self._repeats.get(key)
+            if state is None or now - state[0] >= self.repeat_window:
+                suppressed = state[2] if state else 0
+                if state is None and len(self._repeats) >= self.max_tracked:
+                    self._prune(now)
+                self._repeats[key] = [now, 1, 0]
+                if suppressed:
+                    record.suppressed = suppressed
+                    record.msg = f"{record.msg} ({suppressed} similar messages suppressed)"
+                return True
+            if state[1] < self.repeat_limit:
+                state[1] += 1
+                return True
+            state[2] += 1
+            self.suppressed += 1
+            return False
+
+    def _prune(self, now):
+        # Expired windows that suppressed nothing have nothing left to report
+        for key, (start, _, suppressed) in list(self._repeats.items()):
+            if now - start >= self.repeat_window and not suppressed:
+                del self._repeats[key]
+
+
+class BatchFlushMixin:
+    """
+    Lets a stream handler skip its per-record flush while the queue listener writes
+    a batch; the listener flushes once at the end of the batch instead.
+    """
+    deferred = False
+
+    def flush(self):
+        if not self.deferred:
+            super().flush()
+
+
+class BatchStreamHandler(BatchFlushMixin, logging.StreamHandler):
+    pass
+
+
+COMPRESSED_SUFFIXES = {'gzip': '.gz', 'zstd': '.zst'}
+
+
+def _segment_pattern(base_filename):
+    # base.20261019-051000[-1] for rotated segments, base.N for the numbered backups of older versions
+    return re.compile(re.escape(os.path.basename(base_filename)) + r'\.(\d{8}-\d{6}(?:-\d+)?|\d+)(\.gz|\.zst)?$')
+
+
+def list_segments(base_filename):
+    """Rotated segments of a log file as (path, compressed) pairs, newest first."""
+    directory = os.path.dirname(base_filename) or '.'
+    pattern = _segment_pattern(base_filename)
+    segments = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            match = pattern.match(entry.name)
+            if match and entry.is_file():
+                segments.append((entry.stat().st_mtime, entry.path, bool(match.group(2))))
+    segments.sort(reverse=True)
+    return [(path, compressed) for _, path, compressed in segments]
+
+
+def compress_segment(path, compression):
+    """
+    Compresses a rotated segment next to itself, keeping its mtime, and removes the original.
+
+    Returns:
+        str: The compressed file, or None if another process compressed the segment first.
+    """
+    target = path + COMPRESSED_SUFFIXES[compression]
+    # Per-process temporary name: every worker's compressor sweeps the same directory
+    temporary = f"{target}.{os.getpid()}.tmp"
+    try:
+        source = open(path, 'rb')
+    except FileNotFoundError:
+        return None
+    with source:
+        if compression == 'zstd':
+            with open(temporary, 'wb') as destination:
+                zstandard.ZstdCompressor(level=3).copy_stream(source, destination)
+        else:
+            with gzip.open(temporary, 'wb', compresslevel=6) as destination:
+                shutil.copyfileobj(source, destination, 1024 * 1024)
+        stat = os.fstat(source.fileno())
+    os.utime(temporary, (stat.st_atime, stat.st_mtime))
+    os.replace(temporary, target)
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    return target
+
+
+def prune_segments(base_filename, retention_bytes=0, retention_days=0, backup_count=0, now=None,
+                   quiet_seconds=0):
+    """
+    Deletes the oldest rotated segments once the segments together exceed `retention_bytes`,
+    are older than `retention_days` or number more than `backup_count` (0 disables a limit).
+    Segments modified within `quiet_seconds` are kept, as another process may still write to them.
+
+    Returns:
+        int: The number of segments deleted.
+    """
+    now = now or time.time()
+    total = 0
+    deleted = 0
+    for index, (path, _) in enumerate(list_segments(base_filename)):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        total += stat.st_size
+        if now - stat.st_mtime < quiet_seconds:
+            continue
+        if ((retention_bytes and total > retention_bytes)
+                or (retention_days and now - stat.st_mtime > retention_days * 86400)
+                or (backup_count and index >= backup_count)):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            deleted += 1
+    return deleted
+
+
+class SegmentCompressor:
+    """
+    Background thread that compresses rotated log segments and applies retention, so a
+    rollover in the writing thread costs one rename instead of a rename chain and no I/O.
+
+    A segment is only compressed or deleted once nothing has written to it for the
+    handler's `quiet_seconds`: API worker processes share one log file, and after one of
+    them rotates it the others keep appending to the renamed segment until they rotate
+    too. Work on segments that are still being written to is retried later.
+    """
+
+    def __init__(self):
+        self.queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, handler):
+        """Queues compression of every uncompressed segment of `handler`'s file, then pruning."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="log-compressor", daemon=True)
+                self._thread.start()
+        self.queue.put((handler.baseFilename, handler.compression, handler.retention_bytes,
+                        handler.retention_days, handler.backupCount, handler.quiet_seconds))
+
+    def wait(self):
+        """Blocks until every queued segment has been compressed and pruned."""
+        self.queue.join()
+
+    @staticmethod
+    def process(base_filename, compression, retention_bytes, retention_days, backup_count, quiet_seconds):
+        """
+        Compresses and prunes the quiet segments of one log file.
+
+        Returns:
+            float: Seconds until the segments still being written to should be retried, or 0.
+        """
+        now = time.time()
+        retry_in = 0.0
+        if compression in COMPRESSED_SUFFIXES:
+            for path, compressed in list_segments(base_filename):
+                if compressed:
+                    continue
+                try:
+                    idle = now - os.stat(path).st_mtime
+                except FileNotFoundError:
+                    continue
+                if idle < quiet_seconds:
+                    retry_in = max(retry_in, quiet_seconds - idle)
+                    continue
+                compress_segment(path, compression)
+        prune_segments(base_filename, retention_bytes, retention_days, backup_count, quiet_seconds=quiet_seconds)
+        return retry_in
+
+    def _run(self):
+        # Submissions waiting for a segment to go quiet: (due, sequence, item). Their
+        # task_done() is deferred until they have been processed, so wait() covers them.
+        delayed = []
+        sequence = itertools.count()
+        while True:
+            timeout = max(0.0, delayed[0][0] - time.monotonic()) if delayed else None
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                item = heapq.heappop(delayed)[2]
+            retry_in = 0.0
+            try:
+                retry_in = self.process(*item)
+            except Exception as e:
+                # Logging from here could recurse into the handler being rotated
+                sys.stderr.write(f"Log segment compression failed for {item[0]}: {e}\n")
+            if retry_in:
+                heapq.heappush(delayed, (time.monotonic() + retry_in, next(sequence), item))
+            else:
+                self.queue.task_done()
+
+
+_compressor = SegmentCompressor()
+
+
+def wait_for_log_compression():
+    """Blocks until pending log segment compression and pruning have finished."""
+    _compressor.wait()
+
+
+class CompressingRotatingFileHandler(BatchFlushMixin, RotatingFileHandler):
+    """
+    Rotating file handler for sustained JSON log volume.
+
+    - A rollover renames the file to a timestamped segment (base.YYYYmmdd-HHMMSS); the
+      segment is compressed (gzip, or zstd with the `zstandard` package) and old segments
+      are pruned by total size and age on a background thread, once no process has written
+      to it for `quiet_seconds`.
+    - The size check uses the stream position instead of formatting each record twice,
+      so a file may overshoot `maxBytes` by one record.
+    - With `rotate_daily`, the file also rolls over at local midnight.
+    """
+
+    def __init__(self, filename, maxBytes=0, backupCount=0, compression='gzip',
+                 retention_bytes=0, retention_days=0, rotate_daily=False,
+                 quiet_seconds=LOG_SEGMENT_QUIET_SECONDS, **kwargs):
+        super().__init__(filename, maxBytes=maxBytes, backupCount=backupCount, **kwargs)
+        self.quiet_seconds = quiet_seconds
+        self.compression = compression
+        self.retention_bytes = retention_bytes
+        self.retention_days = retention_days
+        self.rotate_daily = rotate_daily
+        self.next_rollover = self.compute_next_rollover()
+        # Pick up segments left uncompressed by an earlier process
+        _compressor.submit(self)
+
+    @staticmethod
+    def compute_next_rollover(now=None):
+        tomorrow = time.localtime((now or time.time()) + 86400)
+        return time.mktime((tomorrow.tm_year, tomorrow.tm_mon, tomorrow.tm_mday, 0, 0, 0, 0, 0, -1))
+
+    def shouldRollover(self, record):
+        if self.rotate_daily and record.created >= self.next_rollover:
+            return True
+        if self.maxBytes <= 0:
+            return False
+        if self.stream is None:
+            self.stream = self._open()
+        return self.stream.tell() >= self.maxBytes
+
+    def segment_name(self):
+        name = f"{self.baseFilename}.{time.strftime('%Y%m%d-%H%M%S')}"
+        candidate, counter = name, 0
+        while any(os.path.exists(candidate + suffix) for suffix in ('', '.gz', '.zst')):
+            counter += 1
+            candidate = f"{name}-{counter}"
+        return candidate
+
+    def doRollover(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        if os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename) > 0:
+            os.rename(self.baseFilename, self.segment_name())
+            _compressor.submit(self)
+        self.next_rollover = self.compute_next_rollover()
+        if not self.delay:
+            self.stream = self._open()
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    Puts records on a bounded queue for the background writer.
+
+    When the queue is full, records are dropped and counted (policy "drop"),
+    or the logging thread waits for space (policy "block").
+    """
+
+    def __init__(self, log_queue, policy="drop"):
+        super().__init__(log_queue)
+        self.policy = policy
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Merge the message arguments now, while they still hold their current values.
+        # Unlike the stdlib version, exc_info is kept so the JSON formatter can structure it.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        record.message = record.msg
+        return record
+
+    def enqueue(self, record):
+        if self.policy == "block":
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class BatchingQueueListener:
+    """
+    Background thread that takes records off the queue in batches, passes them to
+    the real handlers and flushes each handler once per batch.
+    """
+
+    _STOP = object()
+
+    def __init__(self, log_queue, handlers, queue_handler=None, batch_size=256):
+        self.queue = log_queue
+        self.handlers = handlers
+        self.queue_handler = queue_handler
+        self.batch_size = batch_size
+        self._reported_drops = 0
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Writes out everything still queued, then stops the thread."""
+        if self._thread is None:
+            return
+        self.queue.put(self._STOP)
+        self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            stopping = any(record is self._STOP for record in batch)
+            self._write([record for record in batch if record is not self._STOP])
+            if stopping:
+                return
+
+    def _write(self, records):
+        dropped = self.queue_handler.dropped if self.queue_handler else 0
+        if dropped > self._reported_drops:
+            records.append(logging.makeLogRecord({
+                'name': __name__,
+                'levelno': logging.WARNING,
+                'levelname': 'WARNING',
+                'msg': f"Dropped {dropped - self._reported_drops} log records (log queue full)",
+                'event_type': 'log_records_dropped',
+                'dropped_total': dropped,
+            }))
+            self._reported_drops = dropped
+
+        for handler in self.handlers:
+            handler.deferred = True
+        try:
+            for record in records:
+                for handler in self.handlers:
+                    if record.levelno >= handler.level:
+                        handler.handle(record)
+        finally:
+            for handler in self.handlers:
+                handler.deferred = False
+                handler.flush()
+
+
+_listener = None
+
+
+def stop_log_listener():
+    """Flushes and stops the background log writer, if one is running."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_log_listener)
+
+
+def get_dropped_log_count():
+    """Number of records dropped because the log queue was full."""
+    return _listener.queue_handler.dropped if _listener is not None else 0
+
+
+def get_filtered_log_counts():
+    """Records removed by sampling and by repeated-warning suppression since logging was set up."""
+    if _sampling_filter is None:
+        return {'sampled': 0, 'suppressed': 0}
+    return {'sampled': _sampling_filter.sampled_out, 'suppressed': _sampling_filter.suppressed}
+
+
+# Process-wide logging registry: the active configuration and the handlers opened for it.
+# Handlers are keyed by destination, so each log file is opened once per process.
+DEFAULT_LOGGING_CONFIG = {
+    'log_level': logging.INFO,
+    'log_to_console': True,
+    'log_to_file': True,
+    'log_dir': 'logs',
+    'app_name': 'myslt',
+    'json_logs': True,
+    'max_bytes': 10485760,  # 10MB
+    'backup_count': 0,  # Segments are limited by retention_bytes and retention_days
+    'use_queue': LOG_QUEUE,
+    'sample_rates': parse_sample_rates(LOG_SAMPLE_RATES),
+    'compression': LOG_COMPRESSION,
+    'retention_bytes': LOG_RETENTION_BYTES,
+    'retention_days': LOG_RETENTION_DAYS,
+    'rotate_daily': LOG_ROTATE_DAILY,
+}
+_active_config = None
+_sampling_filter = None
+_handlers = {}
+_registry_lock = threading.RLock()
+
+
+def _get_handler(key, factory):
+    handler = _handlers.get(key)
+    if handler is None:
+        handler = _handlers[key] = factory()
+    return handler
+
+
+def get_logging_config():
+    """The active logging configuration, or None if setup_logging has not run yet."""
+    return dict(_active_config) if _active_config else None
+
+
 def setup_logging(
-    log_level=logging.INFO,
-    log_to_console=True,
-    log_to_file=True,
-    log_dir='logs',
-    app_name='myslt',
-    json_logs=True,
-    max_bytes=10485760,  # 10MB
-    backup_count=5
+    log_level=None,
+    log_to_console=None,
+    log_to_file=None,
+    log_dir=None,
+    app_name=None,
+    json_logs=None,
+    max_bytes=None,
+    backup_count=None,
+    use_queue=None,
+    sample_rates=None,
+    compression=None,
+    retention_bytes=None,
+    retention_days=None,
+    rotate_daily=None
 ):
     """
     Set up logging with options for console and file output, JSON formatting, and rotation
+
+    Logging is configured once per process. A later call only changes the settings it
+    passes explicitly (anything left as None keeps its current value), and a call that
+    changes nothing is a no-op, so modules can call it freely without clobbering the
+    configuration chosen by the entry point. File handlers are shared per path.
     
     Args:
-        log_level: Minimum log level to capture
-        log_to_console: Whether to log to console
-        log_to_file: Whether to log to file
-        log_dir: Directory for log files
-        app_name: Name of the application (used in log filenames)
-        json_logs: Whether to format logs as JSON
-        max_bytes: Maximum size of each log file
-        backup_count: Number of backup files to keep
+        log_level: Minimum log level to capture (default INFO)
+        log_to_console: Whether to log to console (default True)
+        log_to_file: Whether to log to file (default True)
+        log_dir: Directory for log files (default "logs")
+        app_name: Name of the application (used in log filenames, default "myslt")
+        json_logs: Whether to format logs as JSON (default True)
+        max_bytes: Maximum size of each log file (default 10MB)
+        backup_count: Maximum number of rotated segments to keep (default 0, no count limit)
+        use_queue: Whether handlers run on a background writer thread behind a bounded
+            queue (defaults to the LOG_QUEUE environment variable, on unless "false")
+        sample_rates: Keep rates per event_type for INFO/DEBUG records, e.g.
+            {'request_complete': 0.01} (defaults to the LOG_SAMPLE_RATES environment variable)
+        compression: How rotated segments are compressed in the background: "gzip",
+            "zstd" (needs the zstandard package, else gzip is used) or "none" (default LOG_COMPRESSION)
+        retention_bytes: Total size of rotated segments to keep, oldest deleted first
+            (default LOG_RETENTION_BYTES, 200MB; 0 for no limit)
+        retention_days: Age after which rotated segments are deleted (default LOG_RETENTION_DAYS, 14; 0 for no limit)
+        rotate_daily: Whether to also start a new segment at local midnight (default LOG_ROTATE_DAILY)
+
+    Returns:
+        logging.Logger: The root logger.
     """
+    global _listener, _active_config, _sampling_filter
+    requested = {
+        'log_level': log_level,
+        'log_to_console': log_to_console,
+        'log_to_file': log_to_file,
+        'log_dir': log_dir,
+        'app_name': app_name,
+        'json_logs': json_logs,
+        'max_bytes': max_bytes,
+        'backup_count': backup_count,
+        'use_queue': use_queue,
+        'sample_rates': sample_rates,
+        'compression': compression,
+        'retention_bytes': retention_bytes,
+        'retention_days': retention_days,
+        'rotate_daily': rotate_daily,
+    }
     # Get the root logger
     logger = logging.getLogger()
-    
-    # Clear any existing handlers
-    if logger.hasHandlers():
+
+    with _registry_lock:
+        config = dict(_active_config or DEFAULT_LOGGING_CONFIG)
+        config.update({key: value for key, value in requested.items() if value is not None})
+        if config['compression'] == 'zstd' and zstandard is None:
+            config['compression'] = 'gzip'
+        if config == _active_config:
+            return logger
+
+        # Stop any previous background writer, then detach the current handlers
+        stop_log_listener()
         logger.handlers.clear()
-    
-    # Set the log level
-    logger.setLevel(log_level)
-    
-    # Define text log format
-    text_formatter = logging.Formatter(
-        '%(asctime)s [%(levelname)s] %(name)s - %(message)s (%(filename)s:%(lineno)d)'
-    )
-    
-    # Create JSON formatter
-    json_formatter = JSONFormatter()
-    
-    # Create a console handler
-    if log_to_console:
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setLevel(log_level)
-        console_handler.setFormatter(json_formatter if json_logs else text_formatter)
-        logger.addHandler(console_handler)
-    
-    # Create a file handler with rotation
-    if log_to_file:
-        # Create log directory if it doesn't exist
-        if not os.path.exists(log_dir):
-            os.makedirs(log_dir)
-        
-        # Daily rotation logs with a size limit
-        log_file = os.path.join(log_dir, f"{app_name}.log")
-        file_handler = RotatingFileHandler(
-            log_file, 
-            maxBytes=max_bytes,
-            backupCount=backup_count
-        )
-        file_handler.setLevel(log_level)
-        file_handler.setFormatter(json_formatter if json_logs else text_formatter)
-        logger.addHandler(file_handler)
-        
-        # Create an error log file for ERROR and CRITICAL messages
-        error_log_file = os.path.join(log_dir, f"{app_name}_error.log")
-        error_file_handler = RotatingFileHandler(
-            error_log_file,
-            maxBytes=max_bytes,
-            backupCount=backup_count
+
+        # Set the log level
+        logger.setLevel(config['log_level'])
+
+        # Define text log format
+        text_formatter = logging.Formatter(
+            '%(asctime)s [%(levelname)s] %(name)s - %(message)s (%(filename)s:%(lineno)d)'
         )
-        error_file_handler.setLevel(logging.ERROR)
-        error_file_handler.setFormatter(json_formatter if json_logs else text_formatter)
-        logger.addHandler(error_file_handler)
-    
-    # Prevent message propagation to the root logger
-    logger.propagate = False
-    
+        # Create JSON formatter
+        formatter = JSONFormatter() if config['json_logs'] else text_formatter
+
+        handlers = []
+        # Create a console handler
+        if config['log_to_console']:
+            console_handler = _get_handler(('console',), lambda: BatchStreamHandler(sys.stdout))
+            console_handler.setLevel(config['log_level'])
+            handlers.append(console_handler)
+
+        # Create file handlers with rotation
+        if config['log_to_file']:
+            log_dir = config['log_dir']
+            # Create log directory if it doesn't exist
+            os.makedirs(log_dir, exist_ok=True)
+
+            log_file = os.path.abspath(os.path.join(log_dir, f"{config['app_name']}.log"))
+            file_handler = _get_handler(('file', log_file), lambda: CompressingRotatingFileHandler(
+                log_file,
+                maxBytes=config['max_bytes'],
+                backupCount=config['backup_count'],
+                compression=config['compression'],
+                retention_bytes=config['retention_bytes'],
+                retention_days=config['retention_days'],
+                rotate_daily=config['rotate_daily']
+            ))
+            file_handler.setLevel(config['log_level'])
+            handlers.append(file_handler)
+
+            # Create an error log file for ERROR and CRITICAL messages
+            error_log_file = os.path.abspath(os.path.join(log_dir, f"{config['app_name']}_error.log"))
+            error_file_handler = _get_handler(('file', error_log_file), lambda: CompressingRotatingFileHandler(
+                error_log_file,
+                maxBytes=config['max_bytes'],
+                backupCount=config['backup_count'],
+                compression=config['compression'],
+                retention_bytes=config['retention_bytes'],
+                retention_days=config['retention_days'],
+                rotate_daily=config['rotate_daily']
+            ))
+            error_file_handler.setLevel(logging.ERROR)
+            handlers.append(error_file_handler)
+
+        for handler in handlers:
+            handler.setFormatter(formatter)
+            if isinstance(handler, CompressingRotatingFileHandler):
+                handler.maxBytes = config['max_bytes']
+                handler.backupCount = config['backup_count']
+                handler.compression = config['compression']
+                handler.retention_bytes = config['retention_bytes']
+                handler.retention_days = config['retention_days']
+                handler.rotate_daily = config['rotate_daily']
+
+        # Sampling runs on the first handler a record reaches, before it is copied or formatted
+        for handler in _handlers.values():
+            handler.removeFilter(_sampling_filter)
+        _sampling_filter = SamplingFilter(config['sample_rates'])
+
+        # Close handlers the new configuration no longer uses
+        for key, handler in list(_handlers.items()):
+            if handler not in handlers:
+                handler.close()
+                del _handlers[key]
+
+        # Move the handlers behind a queue so logging calls never do file I/O
+        if config['use_queue']:
+            queue_handler = BoundedQueueHandler(queue.Queue(LOG_QUEUE_SIZE), LOG_QUEUE_POLICY)
+            queue_handler.addFilter(_sampling_filter)
+            logger.addHandler(queue_handler)
+            _listener = BatchingQueueListener(queue_handler.queue, handlers, queue_handler, LOG_QUEUE_BATCH)
+            _listener.start()
+        else:
+            for handler in handlers:
+                handler.addFilter(_sampling_filter)
+                logger.addHandler(handler)
+
+        # Prevent message propagation to the root logger
+        logger.propagate = False
+        _active_config = config
+
     # Log initial message
-    logger.info(f"Logging initialized for {app_name} application")
+    logger.info(f"Logging initialized for {config['app_name']} application")
     
     return logger
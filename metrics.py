@@ -0,0 +1,367 @@
+"""
+In-process metrics in the Prometheus text exposition format.
+
+Metric children are created once per label set and then updated in place under
+their own lock, since values are recorded from worker threads (SLT calls run in
+`asyncio.to_thread`) as well as the event loop. An update takes an uncontended lock
+and a histogram observation is a bisect into preallocated buckets. `labels()` is a
+dict lookup keyed by the label tuple, which is allocated on every call, so hot paths
+with fixed labels should keep the child; `myslt_api_request_seconds` is labelled by
+response status and pays for one tuple and lookup per API request.
+
+Values live in the process that records them. With API_WORKERS > 1 every uvicorn
+worker has its own registry and `/metrics` returns only the worker that answered
+the scrape.
+"""
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+import logging
+import math
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Latency buckets in seconds, from fast cache hits up to slow SLT calls
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+TASK_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class _Metric:
+    TYPE = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._default = self._new_child()
+            self._children[()] = self._default
+        (registry or REGISTRY).register(self)
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values):
+        """Returns the child for a label set, creating it on first use. Hold on to it in hot paths."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(tuple(str(value) for value in values), self._new_child())
+                self._children[values] = child
+        return child
+
+    def _label_text(self, values: Tuple[str, ...], extra: str = "") -> str:
+        pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(self.labelnames, values)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def _unique_children(self) -> Iterator[Tuple[Tuple[str, ...], object]]:
+        seen = set()
+        for values, child in list(self._children.items()):
+            if id(child) not in seen:
+                seen.add(id(child))
+                yield tuple(str(value) for value in values), child
+
+    def samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.TYPE}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class _CounterChild:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+
+class Counter(_Metric):
+    TYPE = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        self._default.inc(amount)
+
+    def samples(self):
+        for values, child in self._unique_children():
+            yield f"{self.name}{self._label_text(values)} {_format_value(child.value)}"
+
+
+class _GaugeChild:
+    __slots__ = ("value", "function", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self.function: Optional[Callable[[], float]] = None
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float):
+        self.value = value
+
+    def set_function(self, function: Callable[[], float]):
+        """Reads the value from `function` at scrape time instead of storing it."""
+        self.function = function
+
+    def get(self) -> float:
+        if self.function is not None:
+            try:
+                return float(self.function())
+            except Exception:
+                return math.nan
+        return self.value
+
+
+class Gauge(_Metric):
+    TYPE = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def inc(self, amount: float = 1.0):
+        self._default.inc(amount)
+
+    def dec(self, amount: float = 1.0):
+        self._default.dec(amount)
+
+    def set(self, value: float):
+        self._default.set(value)
+
+    def set_function(self, function: Callable[[], float]):
+        self._default.function = function
+
+    def samples(self):
+        for values, child in self._unique_children():
+            yield f"{self.name}{self._label_text(values)} {_format_value(child.get())}"
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum", "count", "_lock")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def snapshot(self) -> Tuple[List[int], float, int]:
+        """Returns (counts, sum, count) read together, so a scrape never sees a half-recorded observation."""
+        with self._lock:
+            return list(self.counts), self.sum, self.count
+
+    @contextmanager
+    def time(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+
+class Histogram(_Metric):
+    TYPE = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS, registry=None):
+        self.bounds = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self):
+        return _HistogramChild(self.bounds)
+
+    def observe(self, value: float):
+        self._default.observe(value)
+
+    def samples(self):
+        for values, child in self._unique_children():
+            counts, total, count = child.snapshot()
+            cumulative = 0
+            for bound, bucket_count in zip(self.bounds + (math.inf,), counts):
+                cumulative += bucket_count
+                le = 'le="' + _format_value(bound) + '"'
+                yield f"{self.name}_bucket{self._label_text(values, le)} {cumulative}"
+            yield f"{self.name}_sum{self._label_text(values)} {_format_value(total)}"
+            yield f"{self.name}_count{self._label_text(values)} {count}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric):
+        self._metrics.append(metric)
+
+    def render(self) -> str:
+        """Renders every registered metric in the Prometheus text format."""
+        return "\n".join(metric.render() for metric in self._metrics) + "\n"
+
+
+REGISTRY = Registry()
+
+# ---- SLT API ----
+SLT_REQUEST_SECONDS = Histogram(
+    "myslt_slt_request_seconds", "SLT API request latency by endpoint", ("endpoint",)
+)
+SLT_REQUEST_ERRORS = Counter(
+    "myslt_slt_request_errors_total", "Failed SLT API requests by endpoint", ("endpoint",)
+)
+SLT_TOKEN_EVENTS = Counter(
+    "myslt_slt_token_events_total", "SLT logins, token refreshes and tokens taken from other workers by outcome", ("event", "result")
+)
+
+# ---- SLT cache ----
+CACHE_LOOKUPS = Counter(
+    "myslt_cache_lookups_total", "SLT cache lookups by method and result (hit, shared, miss, coalesced)", ("method", "result")
+)
+CACHE_ENTRIES = Gauge("myslt_cache_entries", "Snapshots held in the SLT cache")
+
+# ---- API ----
+API_REQUEST_SECONDS = Histogram(
+    "myslt_api_request_seconds", "API request latency by route", ("method", "route", "status")
+)
+
+API_RATE_LIMITED = Counter(
+    "myslt_api_rate_limited_total", "API requests rejected by the rate limiter"
+)
+
+# ---- Discord bot ----
+BOT_COMMAND_SECONDS = Histogram(
+    "myslt_bot_command_seconds", "Discord command latency by command and outcome", ("command", "result")
+)
+BOT_COMMANDS_IN_PROGRESS = Gauge(
+    "myslt_bot_commands_in_progress", "Discord commands currently waiting on a reply"
+)
+
+# ---- Background tasks ----
+TASK_SECONDS = Histogram(
+    "myslt_task_seconds", "Background task run duration by task and outcome", ("task", "result"), TASK_BUCKETS
+)
+
+
+# ---- Logging ----
+def _dropped_log_records() -> int:
+    from logging_config import get_dropped_log_count
+    return get_dropped_log_count()
+
+LOG_RECORDS_DROPPED = Gauge(
+    "myslt_log_records_dropped", "Log records dropped because the log queue was full"
+)
+LOG_RECORDS_DROPPED.set_function(_dropped_log_records)
+
+def _filtered_log_records(reason: str) -> Callable[[], int]:
+    def read() -> int:
+        from logging_config import get_filtered_log_counts
+        return get_filtered_log_counts()[reason]
+    return read
+
+LOG_RECORDS_FILTERED = Gauge(
+    "myslt_log_records_filtered", "Log records removed by sampling or repeated-warning suppression", ("reason",)
+)
+for _reason in ("sampled", "suppressed"):
+    LOG_RECORDS_FILTERED.labels(_reason).set_function(_filtered_log_records(_reason))
+
+
+@contextmanager
+def track_task(name: str):
+    """Records the duration of one background task run, labelled ok or error."""
+    start = time.perf_counter()
+    result = "ok"
+    try:
+        yield
+    except Exception:
+        result = "error"
+        raise
+    finally:
+        TASK_SECONDS.labels(name, result).observe(time.perf_counter() - start)
+
+
+def timed_task(name: str):
+    """Decorator for `tasks.loop` coroutines recording each run with `track_task`."""
+    def decorator(function):
+        @wraps(function)
+        async def wrapper(*args, **kwargs):
+            with track_task(name):
+                return await function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(port: int, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """
+    Serves /metrics from a daemon thread, for processes without the API server (the bot).
+
+    Args:
+        port (int): Port to listen on.
+        host (str): Interface to bind.
+
+    Returns:
+        ThreadingHTTPServer: The running server; call `shutdown()` to stop it.
+    """
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    logger.info(f"Metrics server listening on port {port}", extra={'event_type': 'metrics_server_started', 'port': port})
+    return server
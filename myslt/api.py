@@ -3,8 +3,11 @@ from dotenv import load_dotenv
 import os
 import logging
 import json
+import threading
+import time
 from datetime import datetime, timedelta
 from logging_config import setup_logging
+from metrics import SLT_REQUEST_SECONDS, SLT_REQUEST_ERRORS, SLT_TOKEN_EVENTS
 
 # Load environment variables
 load_dotenv()
@@ -16,12 +19,18 @@ class SLTAPI:
     BASE_URL = "https://omniscapp.slt.lk/slt/ext/api/"
     CLIENT_ID = "b7402e9d66808f762ccedbe42c20668e"
 
-    def __init__(self, username, password):
+    def __init__(self, username, password, token_store=None):
         self.username = username
         self.password = password
         self.access_token = None
         self.refresh_token = None
         self.token_expiry = None  # To track token expiry
+        # Optional SharedStore through which API worker processes share one login
+        self.token_store = token_store
+        # Serializes refreshes between the threads sharing this client (cache fetches run in threads)
+        self._token_lock = threading.Lock()
+        # Keep-alive connections shared by concurrent fetches
+        self.session = requests.Session()
         
         logger.info(
             "Initializing SLTAPI client", 
@@ -31,7 +40,13 @@ class SLTAPI:
             }
         )
         
-        self.login()  # Automatically login on initialization
+        # Automatically login on initialization (reusing another worker's tokens if possible)
+        if token_store is None:
+            self.login()
+        else:
+            with token_store.token_lock():
+                if not self._adopt_shared_tokens():
+                    self.login()
 
     def login(self):
         """
@@ -78,6 +93,8 @@ class SLTAPI:
                 self.refresh_token = data["refreshToken"]
                 expires_in = data.get("expiresIn", 3600)  # Default expiry to 1 hour
                 self.token_expiry = datetime.now() + timedelta(seconds=expires_in)
+                self._share_tokens()
+                SLT_TOKEN_EVENTS.labels("login", "success").inc()
                 
                 logger.info(
                     "Login successful", 
@@ -95,6 +112,7 @@ class SLTAPI:
                         'response_keys': list(data.keys())
                     }
                 )
+                SLT_TOKEN_EVENTS.labels("login", "failure").inc()
                 raise Exception("Invalid login response: Missing tokens")
                 
         except requests.exceptions.RequestException as e:
@@ -108,6 +126,7 @@ class SLTAPI:
                     'response_text': response.text[:200] if 'response' in locals() else None
                 }
             )
+            SLT_TOKEN_EVENTS.labels("login", "failure").inc()
             raise Exception(f"Login failed: {str(e)}")
 
     def _get_headers(self):
@@ -124,7 +143,7 @@ class SLTAPI:
                     'current_time': datetime.now().isoformat()
                 }
             )
-            self.refresh_access_token()
+            self.renew_access_token(self.access_token)
             
         # Check if token available
         if not self.access_token:
@@ -162,8 +181,10 @@ class SLTAPI:
         for attempt in range(2):  # Allow one retry after token refresh
             try:
                 start_time = datetime.now()
-                response = requests.get(url, headers=self._get_headers(), params=params, timeout=10)
+                headers = self._get_headers()
+                response = self.session.get(url, headers=headers, params=params, timeout=10)
                 duration_ms = (datetime.now() - start_time).total_seconds() * 1000
+                SLT_REQUEST_SECONDS.labels(endpoint).observe(duration_ms / 1000)
                 
                 # Log response metadata without sensitive content
                 logger.debug(
@@ -197,6 +218,7 @@ class SLTAPI:
                 
             except requests.exceptions.HTTPError as e:
                 status_code = e.response.status_code if hasattr(e, 'response') else None
+                SLT_REQUEST_ERRORS.labels(endpoint).inc()
                 
                 # Special handling for 401 on first attempt - refresh token
                 if status_code == 401 and attempt == 0:
@@ -210,7 +232,7 @@ class SLTAPI:
                             'attempt': attempt + 1
                         }
                     )
-                    self.refresh_access_token()
+                    self.renew_access_token(headers["Authorization"][len("Bearer "):])
                 else:
                     logger.error(
                         f"HTTP error from {endpoint}",
@@ -228,6 +250,7 @@ class SLTAPI:
                     raise Exception(f"Failed to fetch data from {endpoint}: {str(e)}")
                     
             except requests.exceptions.RequestException as e:
+                SLT_REQUEST_ERRORS.labels(endpoint).inc()
                 logger.error(
                     f"Request exception for {endpoint}",
                     exc_info=True,
@@ -254,6 +277,54 @@ class SLTAPI:
         )
         raise Exception(f"Failed to fetch data from {endpoint} after retries.")
 
+    def _adopt_shared_tokens(self) -> bool:
+        """Takes unexpired tokens another worker stored, if they differ from ours."""
+        if self.token_store is None:
+            return False
+        row = self.token_store.load_tokens(self.username)
+        if row is None:
+            return False
+        access_token, refresh_token, expiry = row
+        if access_token == self.access_token or expiry <= time.time():
+            return False
+        self.access_token = access_token
+        self.refresh_token = refresh_token
+        self.token_expiry = datetime.fromtimestamp(expiry)
+        SLT_TOKEN_EVENTS.labels("shared", "success").inc()
+        logger.info(
+            "Using SLT tokens shared by another worker",
+            extra={
+                'event_type': 'slt_api_token_shared',
+                'token_expiry': self.token_expiry.isoformat()
+            }
+        )
+        return True
+
+    def _share_tokens(self):
+        if self.token_store is not None:
+            self.token_store.save_tokens(
+                self.username, self.access_token, self.refresh_token, self.token_expiry.timestamp()
+            )
+
+    def renew_access_token(self, stale_token=None):
+        """
+        Refreshes the access token, unless another thread of this process or another
+        worker sharing the token store already has (refreshes are serialized across both).
+
+        Args:
+            stale_token (str, optional): The token found expired or rejected; if the
+                current token differs, another thread has already renewed it.
+        """
+        with self._token_lock:
+            if stale_token is not None and self.access_token != stale_token:
+                return
+            if self.token_store is None:
+                self.refresh_access_token()
+                return
+            with self.token_store.token_lock():
+                if not self._adopt_shared_tokens():
+                    self.refresh_access_token()
+
     def refresh_access_token(self):
         """
         Refreshes the access token using the refresh token.
@@ -286,6 +357,8 @@ class SLTAPI:
                 self.access_token = data.get("accessToken")
                 expires_in = data.get("expiresIn", 3600)  # Default expiry to 1 hour
                 self.token_expiry = datetime.now() + timedelta(seconds=expires_in)
+                self._share_tokens()
+                SLT_TOKEN_EVENTS.labels("refresh", "success").inc()
                 
                 logger.info(
                     "Access token refreshed successfully", 
@@ -303,6 +376,7 @@ class SLTAPI:
                         'response_keys': list(data.keys())
                     }
                 )
+                SLT_TOKEN_EVENTS.labels("refresh", "failure").inc()
                 raise Exception("Invalid token refresh response: Missing accessToken")
                 
         except requests.exceptions.RequestException as e:
@@ -316,6 +390,7 @@ class SLTAPI:
                     'response_text': response.text[:200] if 'response' in locals() else None
                 }
             )
+            SLT_TOKEN_EVENTS.labels("refresh", "failure").inc()
             raise Exception(f"Failed to refresh token: {str(e)}")
 
 
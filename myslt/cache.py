@@ -0,0 +1,272 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from metrics import CACHE_ENTRIES, CACHE_LOOKUPS
+
+logger = logging.getLogger(__name__)
+
+
+class Snapshot:
+    """
+    A cached SLT API response together with its cache key, version and fetch time.
+    """
+
+    def __init__(self, data: dict, version: int, digest: str, fetched_at: float, key: Tuple = ()):
+        self.key = key
+        self.data = data
+        self.version = version
+        self.digest = digest
+        self.fetched_at = fetched_at
+
+    @property
+    def age(self) -> float:
+        """Seconds since the snapshot was fetched."""
+        return time.monotonic() - self.fetched_at
+
+
+class SLTCache:
+    """
+    Async, single-flight cache in front of an `SLTAPI` client.
+
+    Blocking SLT calls run in a worker thread, concurrent requests for the same
+    key share one upstream call, and each key carries a version that is bumped
+    only when the upstream content actually changes. At most `max_concurrency`
+    upstream calls run at once; the rest wait their turn.
+
+    With a `SharedStore`, snapshots and their versions are shared with the other
+    worker processes: a local miss is served from the store when the store has a
+    fresh enough copy, and a worker only calls SLT for a key when no other worker
+    is already fetching it.
+    """
+
+    DEFAULT_TTL = 300  # 5 minutes
+    DEFAULT_MAX_CONCURRENCY = 4
+    # How long a worker may hold a key's fetch claim, and how often waiting workers check the store
+    FETCH_CLAIM_SECONDS = 15.0
+    FETCH_WAIT_INTERVAL = 0.05
+
+    def __init__(self, slt_api, ttl: float = DEFAULT_TTL, max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 store=None):
+        self.slt_api = slt_api
+        self.ttl = ttl
+        self.max_concurrency = max_concurrency
+        self.store = store
+        self._upstream: Optional[asyncio.Semaphore] = None
+        self._snapshots: Dict[Tuple, Snapshot] = {}
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+        self._listeners: List[Callable[[Tuple, Snapshot], Any]] = []
+        CACHE_ENTRIES.set_function(lambda: len(self._snapshots))
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.shared_hits = 0
+
+    @staticmethod
+    def key(method: str, *args) -> Tuple:
+        return (method,) + tuple(args)
+
+    def peek(self, method: str, *args) -> Optional[Snapshot]:
+        """Returns the cached snapshot for a call, however old, without going upstream."""
+        return self._snapshots.get(self.key(method, *args))
+
+    def subscribe(self, listener: Callable[[Tuple, Snapshot], Any]):
+        """Registers a callback invoked with (key, snapshot) whenever a key gets a new version."""
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[Tuple, Snapshot], Any]):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    async def get(self, method: str, *args, max_age: Optional[float] = None) -> Snapshot:
+        """
+        Returns a snapshot no older than `max_age` (defaults to the cache TTL),
+        fetching from SLT if needed.
+        """
+        max_age = self.ttl if max_age is None else max_age
+        snapshot = self.peek(method, *args)
+        if snapshot is not None and snapshot.age < max_age:
+            self.hits += 1
+            CACHE_LOOKUPS.labels(method, "hit").inc()
+            return snapshot
+        if self.store is not None:
+            snapshot = self.sync(method, *args)
+            if snapshot is not None and snapshot.age < max_age:
+                self.shared_hits += 1
+                CACHE_LOOKUPS.labels(method, "shared").inc()
+                return snapshot
+        self.misses += 1
+        CACHE_LOOKUPS.labels(method, "miss").inc()
+        return await self.refresh(method, *args)
+
+    def sync(self, method: str, *args) -> Optional[Snapshot]:
+        """
+        Adopts the shared store's snapshot for a call if it is newer than the local one
+        (notifying listeners of a new version), and returns the local snapshot.
+        """
+        key = self.key(method, *args)
+        local = self._snapshots.get(key)
+        meta = self.store.get_snapshot_meta(key)
+        if meta is None:
+            return local
+        digest, version, fetched_at = meta
+        # Snapshot ages are monotonic; translate the store's wall-clock fetch time
+        local_fetched_at = time.monotonic() - max(0.0, time.time() - fetched_at)
+        if local is not None and local.version == version:
+            if local_fetched_at > local.fetched_at:
+                local.fetched_at = local_fetched_at
+            return local
+        if local is not None and local.version > version:
+            return local
+        shared = self.store.get_snapshot(key)
+        if shared is None:
+            return local
+        data, digest, version, fetched_at = shared
+        return self._publish(key, Snapshot(data, version, digest, local_fetched_at, key))
+
+    async def refresh(self, method: str, *args) -> Snapshot:
+        """Fetches a call from SLT, joining an in-flight fetch for the same key if there is one."""
+        key = self.key(method, *args)
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            CACHE_LOOKUPS.labels(method, "coalesced").inc()
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            snapshot = None
+            if self.store is not None and not self.store.claim_fetch(key, self.FETCH_CLAIM_SECONDS):
+                # Another worker is fetching this key; use its result rather than calling SLT again
+                snapshot = await self._wait_for_shared(key)
+            if snapshot is None:
+                snapshot = await self._fetch(key)
+            future.set_result(snapshot)
+            return snapshot
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved in case no one else was waiting
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    async def _fetch(self, key: Tuple) -> Snapshot:
+        try:
+            if self._upstream is None:
+                self._upstream = asyncio.Semaphore(self.max_concurrency)
+            async with self._upstream:
+                data = await asyncio.to_thread(getattr(self.slt_api, key[0]), *key[1:])
+            return self._store(key, data)
+        finally:
+            if self.store is not None:
+                self.store.release_fetch(key)
+
+    async def _wait_for_shared(self, key: Tuple) -> Optional[Snapshot]:
+        """Waits for another worker's fetch of `key` to land in the store; None if it never does."""
+        started = time.time()
+        meta = self.store.get_snapshot_meta(key)
+        previous = meta[2] if meta else None
+        while time.time() - started < self.FETCH_CLAIM_SECONDS:
+            await asyncio.sleep(self.FETCH_WAIT_INTERVAL)
+            meta = self.store.get_snapshot_meta(key)
+            if meta is not None and meta[2] != previous:
+                self.coalesced += 1
+                CACHE_LOOKUPS.labels(key[0], "coalesced").inc()
+                return self.sync(*key)
+            # The claim was released without a new snapshot (the fetch failed): fetch ourselves
+            if self.store.claim_fetch(key, self.FETCH_CLAIM_SECONDS):
+                meta = self.store.get_snapshot_meta(key)
+                if meta is not None and meta[2] != previous:
+                    self.store.release_fetch(key)
+                    return self.sync(*key)
+                return None
+        return None
+
+    def _store(self, key: Tuple, data: dict) -> Snapshot:
+        digest = hashlib.sha1(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+        previous = self._snapshots.get(key)
+        # Only successful responses are worth serving to later callers
+        successful = isinstance(data, dict) and data.get("isSuccess", False)
+
+        if self.store is not None and successful:
+            # The store assigns versions, so every worker agrees on them (and on ETags)
+            version = self.store.put_snapshot(key, data, digest, time.time())
+            changed = previous is None or previous.version != version
+            snapshot = Snapshot(previous.data if not changed else data, version, digest, time.monotonic(), key)
+        elif previous is not None and previous.digest == digest:
+            snapshot = Snapshot(previous.data, previous.version, digest, time.monotonic(), key)
+            changed = False
+        else:
+            version = previous.version + 1 if previous is not None else 1
+            snapshot = Snapshot(data, version, digest, time.monotonic(), key)
+            changed = True
+
+        if not successful:
+            return snapshot
+        if not changed:
+            self._snapshots[key] = snapshot
+            return snapshot
+        return self._publish(key, snapshot)
+
+    def _publish(self, key: Tuple, snapshot: Snapshot) -> Snapshot:
+        """Stores a new snapshot version and notifies the listeners."""
+        self._snapshots[key] = snapshot
+        logger.debug(
+            f"New snapshot for {key[0]}",
+            extra={
+                'event_type': 'slt_cache_snapshot',
+                'api_method': key[0],
+                'version': snapshot.version
+            }
+        )
+        for listener in self._listeners:
+            try:
+                listener(key, snapshot)
+            except Exception:
+                logger.error(
+                    "Snapshot listener failed",
+                    exc_info=True,
+                    extra={'event_type': 'slt_cache_listener_error', 'api_method': key[0]}
+                )
+        return snapshot
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'coalesced': self.coalesced,
+            'shared_hits': self.shared_hits,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'entries': len(self._snapshots),
+        }
+
+
+_shared_cache: Optional[SLTCache] = None
+
+
+def get_shared_cache(slt_api=None) -> SLTCache:
+    """
+    Returns the process-wide SLT cache, creating it around `slt_api` on first use.
+    If no client is given, one is created from the configured credentials. When
+    SHARED_STORE is on, tokens and snapshots are shared with the other workers.
+    """
+    global _shared_cache
+    if _shared_cache is None:
+        from config.config import SLT_MAX_CONCURRENCY
+        from myslt.shared_store import get_shared_store
+        store = get_shared_store()
+        if slt_api is None:
+            from config.config import USERNAME, PASSWORD
+            from myslt.api import SLTAPI
+            slt_api = SLTAPI(USERNAME, PASSWORD, token_store=store)
+        _shared_cache = SLTCache(slt_api, max_concurrency=SLT_MAX_CONCURRENCY, store=store)
+    return _shared_cache
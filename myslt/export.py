@@ -0,0 +1,200 @@
+"""
+Streaming export of the usage, bill and VAS history.
+
+Rows are read from the history store in chunks and pushed through generators, so
+memory use stays flat however long the exported range is.
+
+Usage:
+    python -m myslt.export usage --format csv --from 2026-01-01 --to 2026-07-01 -o usage.csv
+    python -m myslt.export vas --format ndjson --account 94112345678
+    python -m myslt.export usage --format parquet -o usage.parquet   # requires pyarrow
+"""
+import argparse
+import csv
+import io
+import json
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover - optional dependency
+    pyarrow = None
+
+from myslt.history import LOCAL_UTC_OFFSET, SNAPSHOT_COLUMNS, USAGE_COLUMNS, UsageHistory, get_usage_history
+
+KINDS = ("usage", "bill", "vas")
+FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+# Rows per output chunk (and per Parquet row group)
+CHUNK_ROWS = 5000
+
+LOCAL_TZ = timezone(timedelta(seconds=LOCAL_UTC_OFFSET))
+
+
+def columns_for(kind: str) -> Tuple[str, ...]:
+    return USAGE_COLUMNS if kind == "usage" else SNAPSHOT_COLUMNS
+
+
+def iter_records(history: UsageHistory, kind: str, since: float = 0.0, until: Optional[float] = None,
+                 accounts: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Yields stored rows as dicts with the timestamp as an ISO 8601 string in Sri Lanka time.
+    """
+    columns = columns_for(kind)
+    for row in history.iter_rows(kind, since, until, accounts, chunk_size=CHUNK_ROWS):
+        record = dict(zip(columns, row))
+        record["ts"] = datetime.fromtimestamp(record["ts"], LOCAL_TZ).isoformat()
+        yield record
+
+
+def chunked(records: Iterator[Dict[str, Any]], size: int = CHUNK_ROWS) -> Iterator[List[Dict[str, Any]]]:
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def encode_csv(records: Iterator[Dict[str, Any]], columns: Tuple[str, ...]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns)
+    writer.writeheader()
+    for chunk in chunked(records):
+        writer.writerows(chunk)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def encode_ndjson(records: Iterator[Dict[str, Any]], columns: Tuple[str, ...]) -> Iterator[bytes]:
+    for chunk in chunked(records):
+        yield "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in chunk).encode("utf-8")
+
+
+class _DrainableSink(io.RawIOBase):
+    """Write-only file object whose contents are handed out and cleared after each row group."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def encode_parquet(records: Iterator[Dict[str, Any]], columns: Tuple[str, ...]) -> Iterator[bytes]:
+    """Writes one Parquet row group per chunk and yields the bytes as they are produced."""
+    schema = pyarrow.schema([
+        (column, pyarrow.float64() if column.endswith(("_used", "_limit")) else pyarrow.string())
+        for column in columns
+    ])
+    sink = _DrainableSink()
+    writer = pyarrow.parquet.ParquetWriter(sink, schema, compression="zstd")
+    try:
+        for chunk in chunked(records):
+            writer.write_table(pyarrow.Table.from_pylist(chunk, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+ENCODERS = {
+    "csv": encode_csv,
+    "ndjson": encode_ndjson,
+    "parquet": encode_parquet,
+}
+
+
+def export_chunks(kind: str, fmt: str, since: float = 0.0, until: Optional[float] = None,
+                  accounts: Optional[List[str]] = None, history: Optional[UsageHistory] = None) -> Iterator[bytes]:
+    """
+    Streams an export as encoded byte chunks.
+
+    Args:
+        kind (str): One of KINDS.
+        fmt (str): One of FORMATS.
+        since (float): Start of the range (Unix timestamp).
+        until (float, optional): End of the range (Unix timestamp), defaults to now.
+        accounts (List[str], optional): Only export these accounts.
+        history (UsageHistory, optional): The store to read, defaults to the shared one.
+
+    Returns:
+        Iterator[bytes]: The encoded output, chunk by chunk.
+
+    Raises:
+        ValueError: If the kind or format is unknown.
+        RuntimeError: If Parquet is requested but pyarrow is not installed.
+    """
+    if kind not in KINDS:
+        raise ValueError(f"Unknown export kind '{kind}'. Use one of: {', '.join(KINDS)}")
+    if fmt not in ENCODERS:
+        raise ValueError(f"Unknown export format '{fmt}'. Use one of: {', '.join(FORMATS)}")
+    if fmt == "parquet" and pyarrow is None:
+        raise RuntimeError("Parquet export requires the optional 'pyarrow' package")
+    history = history or get_usage_history()
+    records = iter_records(history, kind, since, until, accounts)
+    return ENCODERS[fmt](records, columns_for(kind))
+
+
+def parse_time(value: str) -> float:
+    """Parses an ISO 8601 date or datetime (Sri Lanka time unless it has an offset) to a Unix timestamp."""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=LOCAL_TZ)
+    return parsed.timestamp()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("kind", choices=KINDS)
+    parser.add_argument("--format", choices=list(FORMATS), default="csv")
+    parser.add_argument("--from", dest="since", type=parse_time, default=0.0, help="Range start (ISO 8601)")
+    parser.add_argument("--to", dest="until", type=parse_time, default=None, help="Range end (ISO 8601)")
+    parser.add_argument("--account", action="append", help="Only export this account (repeatable)")
+    parser.add_argument("--db", help="History database path (defaults to HISTORY_DB_PATH)")
+    parser.add_argument("-o", "--output", help="Output file (defaults to stdout)")
+    args = parser.parse_args(argv)
+
+    history = UsageHistory(args.db) if args.db else None
+    try:
+        chunks = export_chunks(args.kind, args.format, args.since, args.until, args.account, history)
+    except (ValueError, RuntimeError) as e:
+        parser.error(str(e))
+
+    output = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        for chunk in chunks:
+            output.write(chunk)
+    finally:
+        if args.output:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
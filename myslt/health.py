@@ -0,0 +1,57 @@
+import json
+import math
+import os
+import time
+from typing import Any, Dict, Optional
+
+# How often a supervised bot process writes its heartbeat file (seconds)
+HEARTBEAT_INTERVAL = 5.0
+
+
+def write_heartbeat(path: str, status: Dict[str, Any]):
+    """
+    Atomically replaces the heartbeat file at `path` with `status` and the current time.
+
+    Args:
+        path (str): The heartbeat file, usually set by the runner in BOT_HEARTBEAT_FILE.
+        status (dict): JSON-serializable component state (latency, readiness, pollers).
+    """
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    payload = dict(status, time=time.time(), pid=os.getpid())
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(payload, f)
+    os.replace(tmp_path, path)
+
+
+def read_heartbeat(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Returns the last heartbeat written to `path`, with its `age` in seconds, or None
+    if there is none (or it cannot be read).
+    """
+    try:
+        with open(path) as f:
+            heartbeat = json.load(f)
+    except (OSError, ValueError):
+        return None
+    heartbeat['age'] = time.time() - heartbeat.get('time', 0)
+    return heartbeat
+
+
+def bot_status(bot) -> Dict[str, Any]:
+    """
+    Health of a Discord bot in this process: gateway connection, latency and the
+    freshness of the process-wide SLT pollers.
+    """
+    from myslt.poller import poller_status
+
+    latency = bot.latency
+    return {
+        'ready': bot.is_ready(),
+        'closed': bot.is_closed(),
+        # discord.py reports nan/inf until the first heartbeat is acknowledged
+        'latency': round(latency, 3) if math.isfinite(latency) else None,
+        'stale_pollers': [status['targets'] for status in poller_status() if status['stale']],
+    }
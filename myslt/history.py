@@ -0,0 +1,352 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS usage_samples (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    account TEXT NOT NULL,
+    ts REAL NOT NULL,
+    total_used REAL NOT NULL,
+    total_limit REAL NOT NULL,
+    standard_used REAL NOT NULL,
+    standard_limit REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_usage_samples_account_ts ON usage_samples (account, ts);
+CREATE TABLE IF NOT EXISTS usage_hourly (
+    account TEXT NOT NULL,
+    hour INTEGER NOT NULL,
+    day_used REAL NOT NULL DEFAULT 0,
+    night_used REAL NOT NULL DEFAULT 0,
+    samples INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (account, hour)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    account TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    ts REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_snapshots_kind_ts ON snapshots (kind, ts);
+"""
+
+USAGE_COLUMNS = ("account", "ts", "total_used", "total_limit", "standard_used", "standard_limit")
+SNAPSHOT_COLUMNS = ("account", "ts", "kind", "data")
+
+# Buckets are aligned to Sri Lanka local time (Asia/Colombo, UTC+05:30, no DST)
+LOCAL_UTC_OFFSET = 19800
+HOUR = 3600
+DAY = 86400
+BUCKETS = {"hour": HOUR, "day": DAY}
+
+
+def bucket_start(ts: float, size: int = HOUR) -> float:
+    """Returns the start of the local-time bucket of `size` seconds that contains `ts`."""
+    return (ts + LOCAL_UTC_OFFSET) // size * size - LOCAL_UTC_OFFSET
+
+
+def usage_delta(previous: Optional[Tuple[float, float]], total_used: float, standard_used: float) -> Tuple[float, float]:
+    """
+    Daytime (Standard) and nighttime usage between two cumulative samples.
+
+    Args:
+        previous: (total_used, standard_used) of the previous sample, or None for the first one.
+        total_used: Cumulative total usage of the new sample.
+        standard_used: Cumulative Standard usage of the new sample.
+
+    Returns:
+        Tuple[float, float]: (day_used, night_used) in GB. A drop in total usage is treated
+        as a new billing cycle, so the new values are the usage since the reset.
+    """
+    if previous is None:
+        return 0.0, 0.0
+    night_used = max(total_used - standard_used, 0.0)
+    if total_used < previous[0]:
+        return standard_used, night_used
+    # Clamp rounding noise in the reported values to zero
+    previous_night = max(previous[0] - previous[1], 0.0)
+    return max(standard_used - previous[1], 0.0), max(night_used - previous_night, 0.0)
+
+
+class UsageHistory:
+    """
+    SQLite-backed time series of usage samples per account.
+
+    The database runs in WAL mode so the API process can read while the bot writes.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        if self._needs_rollup():
+            self.rebuild_rollups()
+
+    def record_usage(self, account: str, usage_details: dict, ts: Optional[float] = None) -> int:
+        """
+        Stores one usage sample.
+
+        Args:
+            account (str): The subscriber ID.
+            usage_details (dict): Output of `tasks.summary.extract_usage_details`.
+            ts (float, optional): Unix timestamp of the sample, defaults to now.
+
+        Returns:
+            int: The id of the stored sample.
+        """
+        ts = time.time() if ts is None else ts
+        with self._lock:
+            previous = self._conn.execute(
+                "SELECT total_used, standard_used FROM usage_samples WHERE account = ? ORDER BY ts DESC LIMIT 1",
+                (account,)
+            ).fetchone()
+            cursor = self._conn.execute(
+                "INSERT INTO usage_samples (account, ts, total_used, total_limit, standard_used, standard_limit) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    account, ts,
+                    usage_details["total_used"], usage_details["total_limit"],
+                    usage_details["standard_used"], usage_details["standard_limit"],
+                )
+            )
+            day_used, night_used = usage_delta(previous, usage_details["total_used"], usage_details["standard_used"])
+            self._add_to_rollup(account, ts, day_used, night_used)
+            self._conn.commit()
+        return cursor.lastrowid
+
+    def record_snapshot(self, account: str, kind: str, data: dict, ts: Optional[float] = None) -> int:
+        """
+        Stores a raw SLT snapshot (e.g. a bill status or VAS bundle response) for later export.
+
+        Args:
+            account (str): The account the snapshot belongs to.
+            kind (str): Snapshot type, e.g. "bill" or "vas".
+            data (dict): The `dataBundle` of the SLT response.
+            ts (float, optional): Unix timestamp of the snapshot, defaults to now.
+
+        Returns:
+            int: The id of the stored snapshot.
+        """
+        ts = time.time() if ts is None else ts
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO snapshots (account, kind, ts, data) VALUES (?, ?, ?, ?)",
+                (account, kind, ts, json.dumps(data, separators=(",", ":"), default=str))
+            )
+            self._conn.commit()
+        return cursor.lastrowid
+
+    def iter_rows(self, kind: str, since: float = 0.0, until: Optional[float] = None,
+                  accounts: Optional[List[str]] = None, chunk_size: int = 1000) -> Iterator[Tuple]:
+        """
+        Streams stored rows in time order without loading the range into memory.
+
+        Args:
+            kind (str): "usage" for usage samples (USAGE_COLUMNS), otherwise a snapshot kind (SNAPSHOT_COLUMNS).
+            since (float): Start of the range (Unix timestamp, inclusive).
+            until (float, optional): End of the range (Unix timestamp, inclusive), defaults to now.
+            accounts (List[str], optional): Only rows for these accounts; all accounts if None.
+            chunk_size (int): Rows fetched from SQLite at a time.
+        """
+        until = time.time() if until is None else until
+        if kind == "usage":
+            query = f"SELECT {', '.join(USAGE_COLUMNS)} FROM usage_samples WHERE ts >= ? AND ts <= ?"
+            params = [since, until]
+        else:
+            query = f"SELECT {', '.join(SNAPSHOT_COLUMNS)} FROM snapshots WHERE kind = ? AND ts >= ? AND ts <= ?"
+            params = [kind, since, until]
+        if accounts:
+            query += f" AND account IN ({', '.join('?' for _ in accounts)})"
+            params.extend(accounts)
+        query += " ORDER BY ts"
+
+        conn = self._reader()
+        try:
+            cursor = conn.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            conn.close()
+
+    def _add_to_rollup(self, account: str, ts: float, day_used: float, night_used: float):
+        self._conn.execute(
+            "INSERT INTO usage_hourly (account, hour, day_used, night_used, samples) VALUES (?, ?, ?, ?, 1) "
+            "ON CONFLICT (account, hour) DO UPDATE SET "
+            "day_used = day_used + excluded.day_used, night_used = night_used + excluded.night_used, "
+            "samples = samples + 1",
+            (account, int(bucket_start(ts)), day_used, night_used)
+        )
+
+    def _needs_rollup(self) -> bool:
+        with self._lock:
+            has_samples = self._conn.execute("SELECT 1 FROM usage_samples LIMIT 1").fetchone()
+            has_rollups = self._conn.execute("SELECT 1 FROM usage_hourly LIMIT 1").fetchone()
+        return bool(has_samples) and not has_rollups
+
+    def rebuild_rollups(self):
+        """Recomputes the hourly rollup table from the raw samples (for databases created before it existed)."""
+        with self._lock:
+            self._conn.execute("DELETE FROM usage_hourly")
+            previous: Dict[str, Tuple[float, float]] = {}
+            rows = self._conn.execute(
+                "SELECT account, ts, total_used, standard_used FROM usage_samples ORDER BY account, ts"
+            )
+            for account, ts, total_used, standard_used in rows.fetchall():
+                day_used, night_used = usage_delta(previous.get(account), total_used, standard_used)
+                self._add_to_rollup(account, ts, day_used, night_used)
+                previous[account] = (total_used, standard_used)
+            self._conn.commit()
+        logger.info("Rebuilt hourly usage rollups", extra={'event_type': 'usage_rollup_rebuild'})
+
+    def samples(self, account: str, since: float, until: Optional[float] = None) -> List[Tuple]:
+        """
+        Returns (id, ts, total_used, total_limit, standard_used, standard_limit) rows in time order.
+        """
+        until = time.time() if until is None else until
+        with self._lock:
+            return self._conn.execute(
+                "SELECT id, ts, total_used, total_limit, standard_used, standard_limit FROM usage_samples "
+                "WHERE account = ? AND ts >= ? AND ts <= ? ORDER BY ts",
+                (account, since, until)
+            ).fetchall()
+
+    def _reader(self) -> sqlite3.Connection:
+        """
+        A separate connection for long reads, so streaming a result does not hold the writer lock.
+
+        Streaming responses resume the reading generator on any threadpool thread, so
+        the connection is not tied to the thread that opened it; each generator has
+        a single consumer at a time.
+        """
+        return sqlite3.connect(self.path, check_same_thread=False)
+
+    def iter_buckets(self, account: str, since: float, until: float, bucket: str = "hour",
+                     chunk_size: int = 1000) -> Iterator[Tuple[float, float, float, int]]:
+        """
+        Streams (bucket_start, day_used, night_used, samples) rows from the hourly rollups in time order.
+
+        Args:
+            account (str): The subscriber ID.
+            since (float): Start of the range (Unix timestamp, inclusive).
+            until (float): End of the range (Unix timestamp, exclusive).
+            bucket (str): "hour" or "day" (days are aggregated from hours in SQL).
+            chunk_size (int): Rows fetched from SQLite at a time.
+        """
+        size = BUCKETS[bucket]
+        conn = self._reader()
+        try:
+            cursor = conn.execute(
+                "SELECT ((hour + :offset) / :size) * :size - :offset AS bucket, "
+                "SUM(day_used), SUM(night_used), SUM(samples) FROM usage_hourly "
+                "WHERE account = :account AND hour >= :since AND hour < :until "
+                "GROUP BY bucket ORDER BY bucket",
+                {
+                    "offset": LOCAL_UTC_OFFSET, "size": size, "account": account,
+                    # Floor to the bucket width so a range starting mid-day still gets whole days
+                    "since": bucket_start(since, size), "until": until,
+                }
+            )
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            conn.close()
+
+    def usage_stats(self, account: str, since: float, until: float) -> Dict:
+        """
+        Aggregates the hourly rollups over a range.
+
+        Returns:
+            dict: Totals, hourly percentiles, the local hour of day with the highest average usage,
+            and the average daily burn, all in GB.
+        """
+        params = {"account": account, "since": bucket_start(since), "until": until, "offset": LOCAL_UTC_OFFSET}
+        conn = self._reader()
+        try:
+            day_used, night_used, hours, first_hour, last_hour = conn.execute(
+                "SELECT COALESCE(SUM(day_used), 0), COALESCE(SUM(night_used), 0), COUNT(*), MIN(hour), MAX(hour) "
+                "FROM usage_hourly WHERE account = :account AND hour >= :since AND hour < :until",
+                params
+            ).fetchone()
+            hourly = [row[0] for row in conn.execute(
+                "SELECT day_used + night_used AS used FROM usage_hourly "
+                "WHERE account = :account AND hour >= :since AND hour < :until ORDER BY used",
+                params
+            )]
+            peak = conn.execute(
+                "SELECT ((hour + :offset) % 86400) / 3600 AS hour_of_day, "
+                "AVG(day_used + night_used) AS average FROM usage_hourly "
+                "WHERE account = :account AND hour >= :since AND hour < :until "
+                "GROUP BY hour_of_day ORDER BY average DESC LIMIT 1",
+                params
+            ).fetchone()
+        finally:
+            conn.close()
+
+        total_used = day_used + night_used
+        days = max((last_hour - first_hour + HOUR) / DAY, 1.0) if hours else 0.0
+        return {
+            "total_used": round(total_used, 3),
+            "day_used": round(day_used, 3),
+            "night_used": round(night_used, 3),
+            "hours": hours,
+            "hourly_p50": round(percentile(hourly, 50), 3),
+            "hourly_p95": round(percentile(hourly, 95), 3),
+            "hourly_p99": round(percentile(hourly, 99), 3),
+            "peak_hour": int(peak[0]) if peak else None,
+            "peak_hour_average": round(peak[1], 3) if peak else None,
+            "average_daily_burn": round(total_used / days, 3) if days else 0.0,
+        }
+
+    def last_sample_id(self, account: str) -> Optional[int]:
+        """Returns the id of the newest sample for an account, or None if there are none."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MAX(id) FROM usage_samples WHERE account = ?", (account,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Linear-interpolated percentile of an already sorted list (0.0 if empty)."""
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (rank - lower)
+
+
+_history: Optional[UsageHistory] = None
+
+
+def get_usage_history() -> UsageHistory:
+    """Returns the process-wide usage history store at HISTORY_DB_PATH."""
+    global _history
+    if _history is None:
+        from config.config import HISTORY_DB_PATH
+        _history = UsageHistory(HISTORY_DB_PATH)
+    return _history
@@ -0,0 +1,260 @@
+import atexit
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class FileLeaderLock:
+    """
+    Picks one leader among the processes on a host with a non-blocking `flock`.
+
+    The lock is released by the kernel when its holder exits, however it exits, so
+    a follower that keeps calling `is_leader()` takes over on its next call. Without
+    `fcntl` (Windows) every process considers itself the leader.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self._file = None
+
+    @property
+    def held(self) -> bool:
+        return self._file is not None or fcntl is None
+
+    def is_leader(self) -> bool:
+        """Returns True if this process holds the lock, trying to take it if it does not."""
+        if self.held:
+            return True
+        lock_file = open(self.path, "a+")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        lock_file.seek(0)
+        lock_file.truncate()
+        lock_file.write(f"{os.getpid()}\n")
+        lock_file.flush()
+        self._file = lock_file
+        logger.info(
+            "This process is now the leader",
+            extra={'event_type': 'leader_acquired', 'lock': self.path, 'pid': os.getpid()}
+        )
+        return True
+
+    def confirm(self) -> bool:
+        """Re-checks leadership right before acting on it (for the lock, holding it is enough)."""
+        return self.is_leader()
+
+    def release(self):
+        if self._file is not None:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+            logger.info("Leadership released", extra={'event_type': 'leader_released', 'lock': self.path})
+
+
+class LeaseElection:
+    """
+    Leader election between replicas (e.g. containers sharing a volume) through a
+    lease row in SQLite.
+
+    The leader renews its lease every `ttl / 3` seconds from a background thread. If
+    it stops renewing (crash, freeze, lost volume), another replica takes the lease
+    once it has expired, so failover takes at most `ttl + ttl / 3` seconds. Each new
+    leader gets a fencing token one higher than the previous one; `confirm()` checks
+    in the database that this replica's token is still current, so a leader that was
+    paused past its lease cannot act on stale leadership.
+
+    A replica stops considering itself the leader `margin` seconds before its lease
+    runs out, to absorb clock skew and a late renewal.
+    """
+
+    def __init__(self, path: str, name: str = "poller", ttl: float = 15.0, margin: float = 2.0):
+        self.path = path
+        self.name = name
+        self.ttl = ttl
+        self.margin = min(margin, ttl / 3)
+        self.holder = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.fencing_token: Optional[int] = None
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS leases (name TEXT PRIMARY KEY, holder TEXT NOT NULL, "
+            "token INTEGER NOT NULL, expires REAL NOT NULL)"
+        )
+        # Monotonic time until which this replica may act as leader
+        self._valid_until = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Starts the background acquire/renew thread (idempotent)."""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="leader-lease", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.try_acquire()
+            except sqlite3.Error as e:
+                logger.warning(
+                    "Leader lease renewal failed",
+                    extra={'event_type': 'leader_lease_error', 'error': str(e)}
+                )
+            self._stop.wait(self.ttl / 3)
+
+    def try_acquire(self) -> bool:
+        """Takes the lease if it is free or expired, or renews it if this replica holds it."""
+        started = time.monotonic()
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT holder, token, expires FROM leases WHERE name = ?", (self.name,)
+                ).fetchone()
+                if row is not None and row[0] != self.holder and row[2] > now:
+                    self._conn.execute("COMMIT")
+                    acquired, token = False, None
+                else:
+                    token = row[1] if row is not None and row[0] == self.holder else (row[1] + 1 if row else 1)
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO leases (name, holder, token, expires) VALUES (?, ?, ?, ?)",
+                        (self.name, self.holder, token, now + self.ttl)
+                    )
+                    self._conn.execute("COMMIT")
+                    acquired = True
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        was_leader = self.fencing_token is not None
+        if acquired:
+            self._valid_until = started + self.ttl - self.margin
+            if token != self.fencing_token:
+                self.fencing_token = token
+                logger.info(
+                    "This replica is now the leader",
+                    extra={'event_type': 'leader_acquired', 'holder': self.holder, 'fencing_token': token}
+                )
+        elif was_leader:
+            self._demote()
+        return acquired
+
+    def _demote(self):
+        logger.warning(
+            "Leadership lost",
+            extra={'event_type': 'leader_lost', 'holder': self.holder, 'fencing_token': self.fencing_token}
+        )
+        self.fencing_token = None
+        self._valid_until = 0.0
+
+    def is_leader(self) -> bool:
+        """Cheap check (no I/O): True while this replica holds an unexpired lease."""
+        self.start()
+        return self.fencing_token is not None and time.monotonic() < self._valid_until
+
+    def confirm(self) -> bool:
+        """Checks in the database that this replica still holds the lease with its fencing token."""
+        if not self.is_leader():
+            return False
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT holder, token, expires FROM leases WHERE name = ?", (self.name,)
+            ).fetchone()
+        if row is None or row[0] != self.holder or row[1] != self.fencing_token or row[2] <= time.time():
+            self._demote()
+            return False
+        return True
+
+    def release(self):
+        """Stops renewing and gives the lease up so another replica can take over at once."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self.fencing_token is not None:
+            with self._lock:
+                self._conn.execute(
+                    "UPDATE leases SET expires = 0 WHERE name = ? AND holder = ?", (self.name, self.holder)
+                )
+            logger.info("Leadership released", extra={'event_type': 'leader_released', 'holder': self.holder})
+            self.fencing_token = None
+            self._valid_until = 0.0
+
+
+class NoElection:
+    """Every process is the leader (LEADER_ELECTION=none)."""
+
+    fencing_token = None
+
+    def is_leader(self) -> bool:
+        return True
+
+    def confirm(self) -> bool:
+        return True
+
+    def release(self):
+        pass
+
+
+# Elections by name: "poller" (SLT polling, joined by API workers and bots) and
+# "notifications" (sending Discord notifications, joined by bot processes only)
+POLLER = "poller"
+NOTIFICATIONS = "notifications"
+
+_leaders = {}
+
+
+def get_leader(name: str = POLLER):
+    """
+    Returns the process-wide leader election `name`, of the kind configured by
+    LEADER_ELECTION: "file" (flock, processes on one host), "lease" (SQLite lease at
+    LEADER_LEASE_PATH, replicas sharing a volume) or "none".
+
+    Each name is a separate election, so the process leading one need not lead the
+    other. The poller election uses LEADER_LOCK_PATH; other names lock a sibling file
+    (e.g. data/leader-notifications.lock).
+    """
+    leader = _leaders.get(name)
+    if leader is None:
+        from config.config import (
+            LEADER_ELECTION, LEADER_LOCK_PATH, LEADER_LEASE_PATH, LEADER_LEASE_TTL,
+        )
+        if LEADER_ELECTION == "lease":
+            leader = LeaseElection(LEADER_LEASE_PATH, name=name, ttl=LEADER_LEASE_TTL)
+            leader.start()
+            # Hand the lease over right away on a clean exit instead of letting it expire
+            atexit.register(leader.release)
+        elif LEADER_ELECTION == "none":
+            leader = NoElection()
+        else:
+            path = LEADER_LOCK_PATH
+            if name != POLLER:
+                root, ext = os.path.splitext(LEADER_LOCK_PATH)
+                path = f"{root}-{name}{ext}"
+            leader = FileLeaderLock(path)
+        _leaders[name] = leader
+    return leader
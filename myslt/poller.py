@@ -0,0 +1,156 @@
+import asyncio
+import logging
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from metrics import track_task
+
+logger = logging.getLogger(__name__)
+
+# How often a follower picks up the leader's snapshots from the shared store (seconds)
+FOLLOWER_SYNC_INTERVAL = 2.0
+# A running poller is stale once its last success is older than this many intervals
+STALE_AFTER_INTERVALS = 3
+
+
+class SnapshotPoller:
+    """
+    Periodically refreshes a fixed set of SLT calls through an `SLTCache`.
+
+    Consumers do not poll themselves; they subscribe to the cache and are
+    notified whenever a refresh produces a new snapshot version. Each `start()`
+    adds a user and each `stop()` removes one; polling stops with the last user.
+
+    With `is_leader`, only the process for which it returns True calls SLT; the
+    others read the leader's snapshots from the cache's shared store, or stay idle
+    if the cache has no store.
+    """
+
+    def __init__(self, cache, targets: Iterable[Tuple], interval: float,
+                 is_leader: Optional[Callable[[], bool]] = None):
+        self.cache = cache
+        self.targets = [tuple(target) for target in targets]
+        self.interval = interval
+        self.is_leader = is_leader
+        self.last_success: Optional[float] = None
+        self.started_at: Optional[float] = None
+        # Follower without a shared store: nothing to poll or sync, never stale
+        self.idle = False
+        self._task: Optional[asyncio.Task] = None
+        self._users = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start polling on the running event loop; if it is already running, just add a user."""
+        self._users += 1
+        if not self.running:
+            self.started_at = time.time()
+            self._task = asyncio.create_task(self._run())
+        return self._task
+
+    def stop(self):
+        """Remove a user, cancelling the polling task once no users are left."""
+        self._users = max(0, self._users - 1)
+        if self._users == 0 and self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    @property
+    def stale(self) -> bool:
+        """True if the poller is running but has not succeeded for STALE_AFTER_INTERVALS intervals."""
+        if not self.running or self.idle:
+            return False
+        stale_after = STALE_AFTER_INTERVALS * max(self.interval, FOLLOWER_SYNC_INTERVAL)
+        return time.time() - max(self.last_success or 0, self.started_at) > stale_after
+
+    async def poll_once(self):
+        results = await asyncio.gather(
+            *(self.cache.refresh(method, *args) for method, *args in self.targets),
+            return_exceptions=True
+        )
+        failures = [result for result in results if isinstance(result, Exception)]
+        for target, result in zip(self.targets, results):
+            if isinstance(result, Exception):
+                logger.warning(
+                    f"Poll of {target[0]} failed",
+                    extra={'event_type': 'poller_refresh_failed', 'api_method': target[0], 'error': str(result)}
+                )
+        if len(failures) < len(self.targets):
+            self.last_success = time.time()
+
+    def sync_once(self):
+        """Follower side of a poll: adopts the leader's snapshots from the shared store."""
+        snapshots = [self.cache.sync(method, *args) for method, *args in self.targets]
+        ages = [snapshot.age for snapshot in snapshots if snapshot is not None]
+        if ages:
+            self.last_success = time.time() - min(ages)
+
+    async def _run(self):
+        logger.info(
+            "Snapshot poller started",
+            extra={
+                'event_type': 'poller_started',
+                'targets': [target[0] for target in self.targets],
+                'interval_seconds': self.interval
+            }
+        )
+        while True:
+            leader = self.is_leader is None or self.is_leader()
+            idle = not leader and getattr(self.cache, "store", None) is None
+            if self.idle and not idle:
+                # Measure staleness from when this process became active again
+                self.started_at = time.time()
+            self.idle = idle
+            try:
+                if leader:
+                    with track_task("snapshot_poll"):
+                        await self.poll_once()
+                elif not idle:
+                    self.sync_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Snapshot poller iteration failed", exc_info=True,
+                             extra={'event_type': 'poller_error', 'error': str(e)})
+            await asyncio.sleep(self.interval if leader else min(self.interval, FOLLOWER_SYNC_INTERVAL))
+
+
+_shared_pollers: Dict[Tuple, SnapshotPoller] = {}
+
+
+def get_shared_poller(cache, targets: Iterable[Tuple], interval: float, leader_only: bool = False) -> SnapshotPoller:
+    """
+    Returns the process-wide poller for `targets` on `cache`, so components running in
+    one process (the bot and the API in single-process mode) trigger one set of SLT calls.
+    A shared poller runs at the shortest interval any caller asked for. When the cache
+    shares a store with other processes, or `leader_only` is set, only the leader
+    (see `myslt.leader.get_leader`) polls SLT.
+    """
+    key = (id(cache), tuple(tuple(target) for target in targets))
+    poller = _shared_pollers.get(key)
+    if poller is None or poller.cache is not cache:
+        is_leader = None
+        if leader_only or getattr(cache, "store", None) is not None:
+            from myslt.leader import get_leader
+            is_leader = get_leader().is_leader
+        poller = _shared_pollers[key] = SnapshotPoller(cache, key[1], interval, is_leader)
+    poller.interval = min(poller.interval, interval)
+    return poller
+
+
+def poller_status() -> List[Dict]:
+    """Returns the state of every process-wide poller, for health checks."""
+    now = time.time()
+    return [
+        {
+            'targets': [target[0] for target in poller.targets],
+            'running': poller.running,
+            'interval_seconds': poller.interval,
+            'last_success_age': round(now - poller.last_success, 1) if poller.last_success else None,
+            'stale': poller.stale,
+        }
+        for poller in _shared_pollers.values()
+    ]
@@ -0,0 +1,190 @@
+import contextlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tokens (
+    username TEXT PRIMARY KEY,
+    access_token TEXT NOT NULL,
+    refresh_token TEXT,
+    expiry REAL NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    key TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    fetched_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS fetch_claims (
+    key TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+class SharedStore:
+    """
+    SQLite database (WAL mode) through which the API worker processes on one host
+    share SLT tokens and cached snapshots.
+
+    - Tokens: the first worker logs in and the others reuse its tokens; logins and
+      refreshes are serialized across processes with a file lock.
+    - Snapshots: every fetched SLT response is published with a version that is bumped
+      only when the content changes, so all workers hand out the same ETags.
+    - Fetch claims: a worker about to call SLT for a key claims it first; the others
+      wait for the result instead of making the same call.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self.owner = f"{os.getpid()}"
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        # The database holds SLT tokens: keep it private to the service user
+        with contextlib.suppress(OSError):
+            os.chmod(path, 0o600)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    @staticmethod
+    def encode_key(key: Tuple) -> str:
+        return json.dumps(list(key), separators=(",", ":"))
+
+    # ---- Tokens ----
+
+    @contextlib.contextmanager
+    def token_lock(self):
+        """Exclusive cross-process lock held while logging in or refreshing tokens."""
+        if fcntl is None:
+            yield
+            return
+        with open(self.path + ".token.lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def load_tokens(self, username: str) -> Optional[Tuple[str, Optional[str], float]]:
+        """Returns (access_token, refresh_token, expiry as a Unix timestamp) or None."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT access_token, refresh_token, expiry FROM tokens WHERE username = ?", (username,)
+            ).fetchone()
+
+    def save_tokens(self, username: str, access_token: str, refresh_token: Optional[str], expiry: float):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO tokens (username, access_token, refresh_token, expiry, updated) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (username) DO UPDATE SET access_token = excluded.access_token, "
+                "refresh_token = excluded.refresh_token, expiry = excluded.expiry, updated = excluded.updated",
+                (username, access_token, refresh_token, expiry, time.time())
+            )
+
+    # ---- Snapshots ----
+
+    def get_snapshot(self, key: Tuple) -> Optional[Tuple[Dict[str, Any], str, int, float]]:
+        """Returns (data, digest, version, fetched_at as a Unix timestamp) for `key`, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, digest, version, fetched_at FROM snapshots WHERE key = ?", (self.encode_key(key),)
+            ).fetchone()
+        if row is None:
+            return None
+        data, digest, version, fetched_at = row
+        return json.loads(data), digest, version, fetched_at
+
+    def get_snapshot_meta(self, key: Tuple) -> Optional[Tuple[str, int, float]]:
+        """Returns (digest, version, fetched_at) without reading the data."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT digest, version, fetched_at FROM snapshots WHERE key = ?", (self.encode_key(key),)
+            ).fetchone()
+
+    def put_snapshot(self, key: Tuple, data: Dict[str, Any], digest: str, fetched_at: float) -> int:
+        """
+        Publishes a fetched snapshot.
+
+        Returns:
+            int: Its shared version, bumped only if the digest differs from the stored one.
+        """
+        encoded_key = self.encode_key(key)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT digest, version FROM snapshots WHERE key = ?", (encoded_key,)
+                ).fetchone()
+                if row is not None and row[0] == digest:
+                    version = row[1]
+                    self._conn.execute(
+                        "UPDATE snapshots SET fetched_at = MAX(fetched_at, ?) WHERE key = ?", (fetched_at, encoded_key)
+                    )
+                else:
+                    version = row[1] + 1 if row is not None else 1
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO snapshots (key, data, digest, version, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                        (encoded_key, json.dumps(data, default=str), digest, version, fetched_at)
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return version
+
+    # ---- Fetch claims ----
+
+    def claim_fetch(self, key: Tuple, seconds: float) -> bool:
+        """Claims the upstream fetch of `key` for `seconds`; False if another live worker holds it."""
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO fetch_claims (key, owner, expires) VALUES (?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET owner = excluded.owner, expires = excluded.expires "
+                "WHERE fetch_claims.expires < ? OR fetch_claims.owner = excluded.owner",
+                (self.encode_key(key), self.owner, now + seconds, now)
+            )
+            return cursor.rowcount == 1
+
+    def release_fetch(self, key: Tuple):
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM fetch_claims WHERE key = ? AND owner = ?", (self.encode_key(key), self.owner)
+            )
+
+
+_store = None
+
+
+def get_shared_store() -> Optional[SharedStore]:
+    """Returns the process-wide shared store at SHARED_STORE_PATH, or None if SHARED_STORE is off."""
+    global _store
+    if _store is None:
+        from config.config import SHARED_STORE_ENABLED, SHARED_STORE_PATH
+        if not SHARED_STORE_ENABLED:
+            return None
+        _store = SharedStore(SHARED_STORE_PATH)
+        logger.info(
+            "Shared SLT store opened",
+            extra={'event_type': 'shared_store_init', 'path': SHARED_STORE_PATH, 'pid': os.getpid()}
+        )
+    return _store
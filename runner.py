@@ -1,11 +1,19 @@
+import argparse
 import asyncio
+import contextlib
 import logging
 import multiprocessing
-import subprocess
+import signal
 import sys
+import time
+from typing import List, Optional
+import urllib.error
+import urllib.request
 from dotenv import load_dotenv
 import os
 
+from myslt.health import read_heartbeat
+
 # Load environment variables
 load_dotenv()
 
@@ -16,64 +24,313 @@ logging.basicConfig(
 )
 logger = logging.getLogger("runner")
 
-def run_api_server():
-    """Runs the FastAPI server in a separate process"""
-    logger.info("Starting FastAPI server...")
-    # Use subprocess instead of direct uvicorn.run to avoid signal handler issues
-    try:
-        subprocess.run([
-            sys.executable, "-m", "uvicorn", 
-            "api.app:app", "--host", "0.0.0.0", 
-            "--port", "8000"
-        ], check=True)
-    except subprocess.CalledProcessError as e:
-        logger.error(f"API server process failed: {e}")
-    except KeyboardInterrupt:
-        logger.info("API server stopped via keyboard interrupt")
+# "multi" runs the API in its own process; "single" runs the bot and the API on one event loop
+RUNNER_MODE = os.getenv("RUNNER_MODE", "multi").lower()
+API_HOST = os.getenv("API_HOST", "0.0.0.0")
+API_PORT = int(os.getenv("API_PORT", 8000))
+# uvicorn worker processes for the API in multi mode (they share SLT state via SHARED_STORE)
+API_WORKERS = int(os.getenv("API_WORKERS", 1))
+# Seconds to wait for the bot and API to stop on their own before cancelling them
+SHUTDOWN_TIMEOUT = float(os.getenv("SHUTDOWN_TIMEOUT", 10))
+
+# Supervisor (multi mode): components are health-checked every HEALTH_CHECK_INTERVAL seconds,
+# starting STARTUP_GRACE seconds after they start, and restarted after HEALTH_CHECK_FAILURES
+# failed checks in a row or when they exit. Restarts back off from RESTART_BACKOFF_BASE up to
+# RESTART_BACKOFF_MAX seconds; the backoff resets once a component stays up RESTART_RESET_AFTER.
+HEALTH_CHECK_INTERVAL = float(os.getenv("HEALTH_CHECK_INTERVAL", 10))
+HEALTH_CHECK_FAILURES = int(os.getenv("HEALTH_CHECK_FAILURES", 3))
+STARTUP_GRACE = float(os.getenv("STARTUP_GRACE", 60))
+RESTART_BACKOFF_BASE = float(os.getenv("RESTART_BACKOFF_BASE", 1))
+RESTART_BACKOFF_MAX = float(os.getenv("RESTART_BACKOFF_MAX", 60))
+RESTART_RESET_AFTER = float(os.getenv("RESTART_RESET_AFTER", 300))
+# The bot is unhealthy if its heartbeat is older than this or its gateway latency is higher
+BOT_HEARTBEAT_TIMEOUT = float(os.getenv("BOT_HEARTBEAT_TIMEOUT", 30))
+BOT_MAX_LATENCY = float(os.getenv("BOT_MAX_LATENCY", 10))
+HEARTBEAT_DIR = os.getenv("HEARTBEAT_DIR", "data/health")
+
+class Component:
+    """A supervised child process and the health probe the supervisor runs against it."""
+
+    def __init__(self, name, argv, probe, env=None):
+        self.name = name
+        self.argv = argv
+        self.probe = probe
+        self.env = env
+        self.process = None
+        self.started_at = None
+        # Restarts in a row, reset once the component stays up for RESTART_RESET_AFTER
+        self.restarts = 0
+
+    async def start(self):
+        self.process = await asyncio.create_subprocess_exec(*self.argv, env=self.env)
+        self.started_at = time.monotonic()
+        logger.info(
+            f"Started {self.name} (PID: {self.process.pid})",
+            extra={'event_type': 'supervisor_component_start', 'component': self.name, 'pid': self.process.pid}
+        )
+
+    async def stop(self):
+        """Terminates the process, killing it if it is still running after SHUTDOWN_TIMEOUT."""
+        if self.process is None or self.process.returncode is not None:
+            return
+        self.process.terminate()
+        try:
+            await asyncio.wait_for(self.process.wait(), SHUTDOWN_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"{self.name} didn't terminate gracefully, forcing...",
+                extra={'event_type': 'supervisor_component_kill', 'component': self.name}
+            )
+            self.process.kill()
+            await self.process.wait()
+
+    def restart_delay(self) -> float:
+        """No delay for the first restart, then RESTART_BACKOFF_BASE doubling up to RESTART_BACKOFF_MAX."""
+        if self.restarts == 0:
+            return 0.0
+        return min(RESTART_BACKOFF_MAX, RESTART_BACKOFF_BASE * 2 ** (self.restarts - 1))
 
-async def run_discord_bot():
-    """Runs the Discord bot"""
-    logger.info("Starting Discord bot...")
+def probe_api() -> Optional[str]:
+    """Calls the API's /health; returns why it is unhealthy, or None."""
+    host = "127.0.0.1" if API_HOST in ("0.0.0.0", "::", "") else API_HOST
     try:
-        # Import bot-related modules here to avoid circular imports
-        from Bot import main
-        await main()
-    except Exception as e:
-        logger.error(f"Error in Discord bot: {e}", exc_info=True)
+        with urllib.request.urlopen(f"http://{host}:{API_PORT}/health", timeout=5):
+            return None
+    except urllib.error.HTTPError as e:
+        return f"/health returned {e.code}"
+    except OSError as e:
+        return f"/health unreachable: {e}"
 
-async def main():
-    """Main function to run both services"""
-    # Start the API server in a separate process
-    api_process = multiprocessing.Process(target=run_api_server)
-    api_process.daemon = True
-    api_process.start()
-    logger.info(f"API server process started (PID: {api_process.pid})")
-
-    # Run the Discord bot in the main thread
+def probe_bot(component: Component, heartbeat_file: str) -> Optional[str]:
+    """Checks the bot's heartbeat file; returns why it is unhealthy, or None."""
+    heartbeat = read_heartbeat(heartbeat_file)
+    if heartbeat is None or heartbeat.get('pid') != component.process.pid:
+        return "no heartbeat"
+    if heartbeat['age'] > BOT_HEARTBEAT_TIMEOUT:
+        return f"last heartbeat {heartbeat['age']:.0f}s ago"
+    if heartbeat.get('latency') is None:
+        return "not connected to the Discord gateway"
+    if heartbeat['latency'] > BOT_MAX_LATENCY:
+        return f"gateway latency {heartbeat['latency']:.1f}s"
+    if heartbeat.get('stale_pollers'):
+        return f"stale pollers: {heartbeat['stale_pollers']}"
+    return None
+
+def api_component() -> Component:
+    argv = [
+        sys.executable, "-m", "uvicorn", "api.app:app",
+        "--host", API_HOST, "--port", str(API_PORT), "--workers", str(API_WORKERS)
+    ]
+    return Component("api", argv, lambda: asyncio.to_thread(probe_api))
+
+def bot_components() -> List[Component]:
+    """One component per bot process; with BOT_SHARD_PROCESSES > 1 the shards are split as in Bot.run_shard_cluster."""
+    shard_count = int(os.getenv("BOT_SHARD_COUNT", 0))
+    shard_processes = int(os.getenv("BOT_SHARD_PROCESSES", 1))
+    groups = [None]
+    if shard_processes > 1 and shard_count:
+        groups = [
+            [shard_id for shard_id in range(shard_count) if shard_id % shard_processes == index]
+            for index in range(shard_processes)
+        ]
+        groups = [group for group in groups if group]
+
+    components = []
+    for index, shard_ids in enumerate(groups):
+        name = "bot" if shard_ids is None else f"bot-{index}"
+        heartbeat_file = os.path.join(HEARTBEAT_DIR, f"{name}.json")
+        env = dict(os.environ, BOT_HEARTBEAT_FILE=heartbeat_file)
+        if shard_ids is not None:
+            env.update(BOT_SHARD_IDS=",".join(map(str, shard_ids)), BOT_SHARD_PROCESSES="1")
+            if 0 not in shard_ids:
+                # The command tree is global: only the process owning shard 0 syncs it
+                env["SYNC_APP_COMMANDS"] = "false"
+        component = Component(name, [sys.executable, "Bot.py"], None, env)
+        component.probe = lambda component=component, path=heartbeat_file: asyncio.to_thread(probe_bot, component, path)
+        components.append(component)
+    return components
+
+async def watch(component: Component, stop: asyncio.Event) -> Optional[str]:
+    """
+    Waits until the component exits, fails HEALTH_CHECK_FAILURES health checks in a row
+    (checks start after STARTUP_GRACE), or `stop` is set.
+
+    Returns:
+        Optional[str]: Why the component should be restarted, or None on shutdown.
+    """
+    exited = asyncio.create_task(component.process.wait())
+    stopping = asyncio.create_task(stop.wait())
+    failures = 0
     try:
-        await run_discord_bot()
-    except KeyboardInterrupt:
-        logger.info("Keyboard interrupt received. Shutting down...")
-    except Exception as e:
-        logger.error(f"Unexpected error: {e}", exc_info=True)
+        while True:
+            await asyncio.wait({exited, stopping}, timeout=HEALTH_CHECK_INTERVAL, return_when=asyncio.FIRST_COMPLETED)
+            if stopping.done():
+                return None
+            if exited.done():
+                return f"exited with code {component.process.returncode}"
+            if time.monotonic() - component.started_at < STARTUP_GRACE:
+                continue
+            reason = await component.probe()
+            if reason is None:
+                failures = 0
+                continue
+            failures += 1
+            logger.warning(
+                f"{component.name} health check failed ({failures}/{HEALTH_CHECK_FAILURES}): {reason}",
+                extra={'event_type': 'supervisor_health_check_failed', 'component': component.name, 'reason': reason}
+            )
+            if failures >= HEALTH_CHECK_FAILURES:
+                return reason
     finally:
-        # Try to terminate the API process gracefully
-        if api_process.is_alive():
-            logger.info("Terminating API server process...")
-            api_process.terminate()
-            api_process.join(timeout=3)
-            if api_process.is_alive():
-                logger.warning("API process didn't terminate gracefully, forcing...")
-                api_process.kill()
+        exited.cancel()
+        stopping.cancel()
+
+async def supervise(component: Component, stop: asyncio.Event):
+    """Runs `component` until `stop` is set, restarting it with backoff whenever it exits or turns unhealthy."""
+    while not stop.is_set():
+        await component.start()
+        reason = await watch(component, stop)
+        if reason is None:
+            break
+        await component.stop()
+        if time.monotonic() - component.started_at >= RESTART_RESET_AFTER:
+            component.restarts = 0
+        delay = component.restart_delay()
+        component.restarts += 1
+        logger.error(
+            f"{component.name} {reason}, restarting in {delay:.0f}s",
+            extra={
+                'event_type': 'supervisor_restart',
+                'component': component.name,
+                'reason': reason,
+                'restart_count': component.restarts,
+                'delay_seconds': delay
+            }
+        )
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(stop.wait(), delay)
+    await component.stop()
+
+async def main():
+    """
+    Runs the API server and the Discord bot as child processes under a supervisor.
+
+    Each component is restarted, with backoff, when it exits or when its health check
+    fails HEALTH_CHECK_FAILURES times in a row: the API through its /health endpoint
+    (which fails when its pollers stall), the bot through the heartbeat file it writes
+    (gateway connection and latency, poller freshness). On SIGINT/SIGTERM both are
+    terminated gracefully.
+    """
+    stop = asyncio.Event()
+    install_stop_signals(stop)
+    # The bot and the API join one polling election, so the follower needs the shared
+    # store to pick up the leader's snapshots (children inherit this environment)
+    os.environ.setdefault("SHARED_STORE", "true")
+    components = [api_component()] + bot_components()
+    logger.info(
+        "Supervisor started",
+        extra={'event_type': 'supervisor_start', 'components': [component.name for component in components]}
+    )
+    await asyncio.gather(*(supervise(component, stop) for component in components))
+    logger.info("Supervisor stopped", extra={'event_type': 'supervisor_stop'})
+
+def install_stop_signals(stop: asyncio.Event):
+    """Sets `stop` on SIGINT/SIGTERM, using loop signal handlers where the platform has them."""
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            # Windows: no loop signal handlers, so hop back onto the loop from the handler
+            signal.signal(sig, lambda *_: loop.call_soon_threadsafe(stop.set))
+
+async def run_single_process():
+    """
+    Runs the Discord bot and the API server on one event loop in this process.
+
+    Both use the process-wide SLT client, snapshot cache and usage poller, so there is
+    one login, one cache and one set of polling calls. On SIGINT/SIGTERM, or when either
+    side exits, both are shut down gracefully (the API finishes in-flight requests and
+    runs its shutdown hooks, the bot closes its gateway connection).
+    """
+    import uvicorn
+    import Bot
+    from api.app import app
+    from logging_config import setup_logging
+
+    if Bot.SHARD_PROCESSES > 1:
+        logger.critical("Single-process mode cannot be combined with BOT_SHARD_PROCESSES > 1.")
+        return
+
+    # Bot.py and api/app.py each configure logging for their own log file; share one instead
+    setup_logging(app_name='myslt')
+
+    class EmbeddedServer(uvicorn.Server):
+        """uvicorn server that leaves signal handling to the runner."""
+
+        def install_signal_handlers(self):
+            pass
+
+        @contextlib.contextmanager
+        def capture_signals(self):
+            yield
+
+    server = EmbeddedServer(uvicorn.Config(app, host=API_HOST, port=API_PORT, log_config=None))
+    stop = asyncio.Event()
+    install_stop_signals(stop)
+
+    api_task = asyncio.create_task(server.serve(), name="api")
+    bot_task = asyncio.create_task(Bot.main(), name="bot")
+    stop_task = asyncio.create_task(stop.wait(), name="stop")
+    logger.info(
+        "Bot and API server started in a single process",
+        extra={'event_type': 'runner_single_process_start', 'pid': os.getpid(), 'port': API_PORT}
+    )
+
+    done, _ = await asyncio.wait({api_task, bot_task, stop_task}, return_when=asyncio.FIRST_COMPLETED)
+    for task in done - {stop_task}:
+        error = None if task.cancelled() else task.exception()
+        logger.log(
+            logging.ERROR if error else logging.WARNING,
+            f"{task.get_name()} exited, shutting down",
+            exc_info=error,
+            extra={'event_type': 'runner_component_exit', 'component': task.get_name()}
+        )
+    if stop_task in done:
+        logger.info("Shutdown signal received", extra={'event_type': 'runner_shutdown_signal'})
+
+    # Graceful shutdown: uvicorn drains connections, bot.close() makes bot.start() return
+    server.should_exit = True
+    if not Bot.bot.is_closed():
+        await Bot.bot.close()
+    stop_task.cancel()
+    pending = [task for task in (api_task, bot_task) if not task.done()]
+    if pending:
+        _, still_running = await asyncio.wait(pending, timeout=SHUTDOWN_TIMEOUT)
+        for task in still_running:
+            logger.warning(
+                f"{task.get_name()} did not stop within {SHUTDOWN_TIMEOUT}s, cancelling",
+                extra={'event_type': 'runner_shutdown_timeout', 'component': task.get_name()}
+            )
+            task.cancel()
+        await asyncio.gather(*still_running, return_exceptions=True)
+    logger.info("Single-process runner stopped", extra={'event_type': 'runner_single_process_stop'})
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the Discord bot and the API server.")
+    parser.add_argument(
+        "--mode", choices=("multi", "single"), default=RUNNER_MODE,
+        help="multi: API in a separate process; single: bot and API on one event loop (default RUNNER_MODE)"
+    )
+    args = parser.parse_args()
+
     # Enable multiprocessing for Windows if needed
     if sys.platform.startswith('win'):
         multiprocessing.freeze_support()
-    
+
     try:
-        asyncio.run(main())
+        asyncio.run(run_single_process() if args.mode == "single" else main())
     except KeyboardInterrupt:
         logger.info("Application shutdown requested by user.")
     except Exception as e:
-        logger.error(f"Unhandled exception: {e}", exc_info=True) 
\ No newline at end of file
+        logger.error(f"Unhandled exception: {e}", exc_info=True)
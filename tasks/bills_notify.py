@@ -1,11 +1,8 @@
 from myslt.api import SLTAPI
-from logging_config import setup_logging
 from config.timezone_config import get_current_time
 import logging
 from typing import Optional
 
-# Set up logging using the external configuration
-setup_logging()
 logger = logging.getLogger(__name__)  # Module-specific logger
 
 
@@ -22,16 +19,41 @@ def fetch_bill_info(slt_api: SLTAPI, tp_no: str, account_no: str) -> Optional[di
         Optional[dict]: The bill data from the API if successful, or None if the request failed.
     """
     try:
-        bill_info = slt_api.get_bill_payment_request(tp_no, account_no)
-        if not bill_info.get("isSuccess"):
-            logger.error("Failed to retrieve bill payment information from SLT API.")
-            return None
-        return bill_info.get("dataBundle", {})
+        return extract_bill_info(slt_api.get_bill_payment_request(tp_no, account_no))
     except Exception as e:
         logger.error(f"Error fetching bill information: {e}", exc_info=True)
         return None
 
 
+async def fetch_bill_info_cached(slt_cache, tp_no: str, account_no: str) -> Optional[dict]:
+    """
+    Like `fetch_bill_info`, but through the shared SLT cache, so the call runs off the
+    event loop and is shared with the other commands and the API.
+
+    Args:
+        slt_cache (SLTCache): The process-wide SLT cache.
+        tp_no (str): The telephone number.
+        account_no (str): The account number.
+
+    Returns:
+        Optional[dict]: The bill data if successful, or None if the request failed.
+    """
+    try:
+        snapshot = await slt_cache.get("get_bill_payment_request", tp_no, account_no)
+        return extract_bill_info(snapshot.data)
+    except Exception as e:
+        logger.error(f"Error fetching bill information: {e}", exc_info=True)
+        return None
+
+
+def extract_bill_info(bill_info: dict) -> Optional[dict]:
+    """Returns the `dataBundle` of a bill payment response, or None if the request failed."""
+    if not bill_info.get("isSuccess"):
+        logger.error("Failed to retrieve bill payment information from SLT API.")
+        return None
+    return bill_info.get("dataBundle", {})
+
+
 def format_bill_info(data: dict) -> str:
     """
     Formats the bill data into a user-friendly message.
@@ -0,0 +1,225 @@
+from config.timezone_config import SRI_LANKA_TZ, get_current_time
+from datetime import datetime, timedelta
+import heapq
+import itertools
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)  # Module-specific logger
+
+# Date formats seen in the SLT bill and VAS payloads
+DATE_FORMATS = (
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%d",
+    "%d/%m/%Y %H:%M:%S",
+    "%d/%m/%Y",
+    "%d-%m-%Y",
+    "%d-%b-%Y",
+)
+
+# Year-less formats (e.g. VAS expiry "30-Sep") refer to the next occurrence of that date
+YEARLESS_DATE_FORMATS = (
+    "%d-%b",
+)
+
+# Date-only deadlines are anchored at this local hour so reminders do not fire at midnight
+DEFAULT_DEADLINE_HOUR = 9
+
+BILL_DUE = "bill_due"
+VAS_EXPIRY = "vas_expiry"
+
+
+def parse_deadline(value, now: Optional[datetime] = None) -> Optional[datetime]:
+    """
+    Parses a due or expiry date from an SLT payload into a Sri Lanka timezone datetime.
+
+    Args:
+        value (str): The raw date string.
+        now (datetime, optional): The current time, used to pick the year of year-less dates.
+
+    Returns:
+        Optional[datetime]: The parsed deadline, or None if the value is empty or unrecognized.
+    """
+    if not value or not isinstance(value, str):
+        return None
+    value = value.strip()
+    for fmt in DATE_FORMATS:
+        try:
+            parsed = datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+        if "%H" not in fmt:
+            parsed = parsed.replace(hour=DEFAULT_DEADLINE_HOUR)
+        return SRI_LANKA_TZ.localize(parsed)
+    for fmt in YEARLESS_DATE_FORMATS:
+        today = (now or get_current_time()).date()
+        # This year unless the date has already passed; parsed with the year so 29-Feb works
+        for year in (today.year, today.year + 1):
+            try:
+                parsed = datetime.strptime(f"{value}-{year}", f"{fmt}-%Y")
+            except ValueError:
+                continue
+            if parsed.date() >= today:
+                return SRI_LANKA_TZ.localize(parsed.replace(hour=DEFAULT_DEADLINE_HOUR))
+    logger.warning(f"Unrecognized deadline format: {value!r}")
+    return None
+
+
+class Reminder:
+    """A reminder that is due to be sent for a tracked deadline."""
+
+    def __init__(self, account: str, kind: str, name: str, deadline: datetime, offset: timedelta):
+        self.account = account
+        self.kind = kind
+        self.name = name
+        self.deadline = deadline
+        self.offset = offset
+
+    def format_message(self) -> str:
+        """Formats the reminder into a user-friendly message."""
+        days = self.offset.total_seconds() / 86400
+        when = f"{days:g} day(s)" if days >= 1 else f"{self.offset.total_seconds() / 3600:g} hour(s)"
+        deadline = self.deadline.strftime("%Y-%m-%d %H:%M")
+        if self.kind == BILL_DUE:
+            return (
+                f"**Bill Payment Reminder**\n"
+                f"Your bill is due in {when} ({deadline}).\n\n"
+                "Please ensure timely payment to avoid any interruption in service."
+            )
+        return (
+            f"**📦 VAS Bundle Expiry Reminder**\n"
+            f"**{self.name}** expires in {when} ({deadline})."
+        )
+
+
+class DeadlineTracker:
+    """
+    Keeps upcoming bill due dates and VAS expiry dates in a min-heap of reminder
+    wake-ups per account.
+
+    Each deadline gets one heap entry per reminder offset. When a new snapshot
+    changes or removes a deadline, it gets a new generation and the old entries
+    are discarded lazily as they reach the top of the heap.
+    """
+
+    def __init__(self, offsets: Iterable[timedelta]):
+        self.offsets = sorted(set(offsets), reverse=True)
+        self._heaps: Dict[str, List[Tuple[datetime, int, tuple, int, timedelta]]] = {}
+        # (account, kind, name) -> (deadline, generation)
+        self._live: Dict[tuple, Tuple[datetime, int]] = {}
+        self._counter = itertools.count()
+        # Generations are never reused, so entries of a removed deadline stay stale if it returns
+        self._generations = itertools.count()
+
+    def update_bills(self, account: str, bill_data: Optional[dict], now: Optional[datetime] = None) -> bool:
+        """
+        Updates the bill due date for an account from `fetch_bill_info` data.
+
+        Args:
+            account (str): The account number.
+            bill_data (dict): The `dataBundle` of a bill payment request.
+            now (datetime, optional): The current time.
+
+        Returns:
+            bool: True if the tracked deadlines changed.
+        """
+        deadlines = {}
+        billing_list = (bill_data or {}).get("listofbillingInquiryType", [])
+        if billing_list:
+            due = parse_deadline(billing_list[0].get("paymentDueDate"), now)
+            if due:
+                deadlines["bill"] = due
+        return self._replace(account, BILL_DUE, deadlines, now)
+
+    def update_vas(self, account: str, vas_data: Optional[dict], now: Optional[datetime] = None) -> bool:
+        """
+        Updates the VAS bundle expiry dates for an account.
+
+        Args:
+            account (str): The subscriber ID.
+            vas_data (dict): The `dataBundle` of a VAS bundles request.
+            now (datetime, optional): The current time.
+
+        Returns:
+            bool: True if the tracked deadlines changed.
+        """
+        deadlines = {}
+        for detail in (vas_data or {}).get("usageDetails", []):
+            expiry = parse_deadline(detail.get("expiry_date"), now)
+            if expiry:
+                deadlines[detail.get("name", "N/A")] = expiry
+        return self._replace(account, VAS_EXPIRY, deadlines, now)
+
+    def _replace(self, account: str, kind: str, deadlines: Dict[str, datetime], now: Optional[datetime]) -> bool:
+        now = now or get_current_time()
+        changed = False
+
+        # Drop deadlines that disappeared from the snapshot
+        for key in [k for k in self._live if k[0] == account and k[1] == kind and k[2] not in deadlines]:
+            del self._live[key]
+            changed = True
+
+        heap = self._heaps.setdefault(account, [])
+        for name, deadline in deadlines.items():
+            key = (account, kind, name)
+            current = self._live.get(key)
+            if current and current[0] == deadline:
+                continue
+            generation = next(self._generations)
+            self._live[key] = (deadline, generation)
+            changed = True
+            for offset in self.offsets:
+                fire_at = deadline - offset
+                if fire_at > now:
+                    heapq.heappush(heap, (fire_at, next(self._counter), key, generation, offset))
+
+        if changed:
+            logger.info(
+                f"Deadlines updated for {kind}",
+                extra={
+                    'event_type': 'deadlines_updated',
+                    'kind': kind,
+                    'tracked': len(deadlines)
+                }
+            )
+        return changed
+
+    def _is_stale(self, entry) -> bool:
+        _, _, key, generation, _ = entry
+        live = self._live.get(key)
+        return live is None or live[1] != generation
+
+    def next_wakeup(self) -> Optional[datetime]:
+        """Returns the time of the next reminder across all accounts, or None if nothing is scheduled."""
+        earliest = None
+        for heap in self._heaps.values():
+            while heap and self._is_stale(heap[0]):
+                heapq.heappop(heap)
+            if heap and (earliest is None or heap[0][0] < earliest):
+                earliest = heap[0][0]
+        return earliest
+
+    def pop_due(self, now: Optional[datetime] = None) -> List[Reminder]:
+        """
+        Removes and returns all reminders whose wake-up time has passed.
+
+        Args:
+            now (datetime, optional): The current time.
+
+        Returns:
+            List[Reminder]: The due reminders, earliest first.
+        """
+        now = now or get_current_time()
+        due = []
+        for account, heap in self._heaps.items():
+            while heap and heap[0][0] <= now:
+                entry = heapq.heappop(heap)
+                if self._is_stale(entry):
+                    continue
+                _, _, key, _, offset = entry
+                deadline = self._live[key][0]
+                due.append((entry[0], Reminder(account, key[1], key[2], deadline, offset)))
+        due.sort(key=lambda item: item[0])
+        return [reminder for _, reminder in due]
@@ -1,9 +1,6 @@
-from logging_config import setup_logging
 from config.timezone_config import get_current_time
 import logging
 
-# Set up logging using the external configuration
-setup_logging()
 logger = logging.getLogger(__name__)  # Module-specific logger
 
 def detect_spikes(usage_data, threshold=None):
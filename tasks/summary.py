@@ -1,8 +1,5 @@
-from logging_config import setup_logging
 import logging
 
-# Set up logging using the external configuration
-setup_logging()
 logger = logging.getLogger(__name__)  # Module-specific logger
 
 def extract_usage_details(api_response):
@@ -40,6 +37,24 @@ def extract_usage_details(api_response):
     return extracted if all(extracted.values()) else None
 
 
+def split_day_night(usage_details):
+    """
+    Splits extracted usage details into daytime (Standard) and nighttime usage.
+
+    Args:
+        usage_details (dict): Extracted usage details.
+
+    Returns:
+        dict: Daytime and nighttime used/limit values in GB.
+    """
+    return {
+        "day_used": usage_details["standard_used"],
+        "day_limit": usage_details["standard_limit"],
+        "night_used": max(usage_details["total_used"] - usage_details["standard_used"], 0.0),
+        "night_limit": usage_details["total_limit"] - usage_details["standard_limit"],
+    }
+
+
 def format_summary_message(usage_details):
     """
     Formats usage details into a user-friendly message.
@@ -50,8 +65,9 @@ def format_summary_message(usage_details):
     Returns:
         str: A formatted message with usage summary.
     """
-    night_limit = usage_details["total_limit"] - usage_details["standard_limit"]
-    night_used = max(usage_details["total_used"] - usage_details["standard_used"], 0.0)
+    split = split_day_night(usage_details)
+    night_limit = split["night_limit"]
+    night_used = split["night_used"]
 
     return (
         "Here is your daily data usage summary:\n\n"
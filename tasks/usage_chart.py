@@ -0,0 +1,156 @@
+from tasks.summary import split_day_night
+from concurrent.futures import ProcessPoolExecutor
+from collections import OrderedDict
+from datetime import datetime, timedelta
+import asyncio
+import io
+import logging
+import time
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)  # Module-specific logger
+
+# Supported chart ranges
+RANGES = {
+    "24h": timedelta(hours=24),
+    "7d": timedelta(days=7),
+    "30d": timedelta(days=30),
+}
+DEFAULT_RANGE = "7d"
+
+
+def render_usage_chart(timestamps: List[float], day_used: List[float], night_used: List[float], title: str) -> bytes:
+    """
+    Renders day/night usage over time as a PNG.
+
+    Runs inside a worker process, so it only takes plain lists and imports matplotlib lazily.
+
+    Args:
+        timestamps (list): Unix timestamps of the samples.
+        day_used (list): Daytime (Standard) usage in GB for each sample.
+        night_used (list): Nighttime usage in GB for each sample.
+        title (str): The chart title.
+
+    Returns:
+        bytes: The PNG image.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from config.timezone_config import SRI_LANKA_TZ
+
+    times = [datetime.fromtimestamp(ts, SRI_LANKA_TZ) for ts in timestamps]
+    fig, ax = plt.subplots(figsize=(8, 4), dpi=100)
+    try:
+        ax.stackplot(times, day_used, night_used, labels=["Daytime (Standard)", "Nighttime"], alpha=0.8)
+        ax.set_title(title)
+        ax.set_ylabel("Used (GB)")
+        ax.legend(loc="upper left")
+        ax.grid(True, alpha=0.3)
+        fig.autofmt_xdate()
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format="png", bbox_inches="tight")
+        return buffer.getvalue()
+    finally:
+        plt.close(fig)
+
+
+class UsageChartRenderer:
+    """
+    Renders usage charts in a process pool and caches the PNGs.
+
+    Cache entries are keyed by (account, range, last sample id), so a chart is
+    only re-rendered once a new sample has been recorded.
+    """
+
+    def __init__(self, history, max_workers: int = 1, cache_size: int = 32):
+        self.history = history
+        self.max_workers = max_workers
+        self.cache_size = cache_size
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._cache: "OrderedDict[Tuple, asyncio.Future]" = OrderedDict()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._pool
+
+    async def render(self, account: str, range_name: str = DEFAULT_RANGE) -> Optional[bytes]:
+        """
+        Returns the PNG chart for an account and range, or None if there is no history yet.
+
+        Raises:
+            ValueError: If the range is not one of RANGES.
+        """
+        if range_name not in RANGES:
+            raise ValueError(f"Unknown range '{range_name}'. Use one of: {', '.join(RANGES)}")
+
+        last_id = await asyncio.to_thread(self.history.last_sample_id, account)
+        if last_id is None:
+            return None
+
+        key = (account, range_name, last_id)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            logger.debug("Usage chart cache hit", extra={'event_type': 'usage_chart_cache_hit', 'range': range_name})
+            return await asyncio.shield(cached)
+
+        # Store the future first so concurrent requests share one render
+        future = asyncio.ensure_future(self._render(account, range_name))
+        self._cache[key] = future
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        try:
+            return await asyncio.shield(future)
+        except Exception:
+            self._cache.pop(key, None)
+            raise
+
+    async def _render(self, account: str, range_name: str) -> bytes:
+        since = time.time() - RANGES[range_name].total_seconds()
+        rows = await asyncio.to_thread(self.history.samples, account, since)
+
+        timestamps, day_used, night_used = [], [], []
+        for _, ts, total_used, total_limit, standard_used, standard_limit in rows:
+            split = split_day_night({
+                "total_used": total_used, "total_limit": total_limit,
+                "standard_used": standard_used, "standard_limit": standard_limit,
+            })
+            timestamps.append(ts)
+            day_used.append(split["day_used"])
+            night_used.append(split["night_used"])
+
+        start = time.perf_counter()
+        png = await asyncio.get_running_loop().run_in_executor(
+            self._get_pool(), render_usage_chart, timestamps, day_used, night_used,
+            f"Data usage ({range_name})"
+        )
+        logger.info(
+            "Usage chart rendered",
+            extra={
+                'event_type': 'usage_chart_rendered',
+                'range': range_name,
+                'samples': len(rows),
+                'duration_ms': round((time.perf_counter() - start) * 1000, 2),
+                'size_bytes': len(png)
+            }
+        )
+        return png
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+_renderer: Optional[UsageChartRenderer] = None
+
+
+def get_chart_renderer() -> UsageChartRenderer:
+    """Returns the process-wide chart renderer over the shared usage history."""
+    global _renderer
+    if _renderer is None:
+        from myslt.history import get_usage_history
+        _renderer = UsageChartRenderer(get_usage_history())
+    return _renderer
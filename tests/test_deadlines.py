@@ -0,0 +1,33 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("pytz")
+
+from config.timezone_config import SRI_LANKA_TZ
+from tasks.deadlines import DEFAULT_DEADLINE_HOUR, DeadlineTracker, parse_deadline
+
+
+def local(*args):
+    return SRI_LANKA_TZ.localize(datetime(*args))
+
+
+def test_yearless_date_is_this_year_until_it_passes():
+    now = local(2026, 9, 15, 12, 0)
+
+    assert parse_deadline("30-Sep", now) == local(2026, 9, 30, DEFAULT_DEADLINE_HOUR)
+    assert parse_deadline("15-Sep", now) == local(2026, 9, 15, DEFAULT_DEADLINE_HOUR)
+    assert parse_deadline("31-Aug", now) == local(2027, 8, 31, DEFAULT_DEADLINE_HOUR)
+
+
+def test_yearless_date_rolls_over_at_year_end():
+    assert parse_deadline("05-Jan", local(2026, 12, 20)) == local(2027, 1, 5, DEFAULT_DEADLINE_HOUR)
+    assert parse_deadline("29-Feb", local(2027, 3, 1)) == local(2028, 2, 29, DEFAULT_DEADLINE_HOUR)
+
+
+def test_vas_expiry_without_year_schedules_reminders():
+    now = local(2026, 9, 25, 12, 0)
+    tracker = DeadlineTracker([timedelta(days=1)])
+
+    assert tracker.update_vas("0112345678", {"usageDetails": [{"name": "Extra GB", "expiry_date": "30-Sep"}]}, now)
+    assert tracker.next_wakeup() == local(2026, 9, 29, DEFAULT_DEADLINE_HOUR)
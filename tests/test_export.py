@@ -0,0 +1,41 @@
+import json
+import time
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+
+import myslt.history
+from myslt.export import CHUNK_ROWS
+from myslt.history import UsageHistory
+
+
+@pytest.fixture
+def history(tmp_path, monkeypatch):
+    store = UsageHistory(str(tmp_path / "history.db"))
+    monkeypatch.setattr(myslt.history, "_history", store)
+    return store
+
+
+def test_export_streams_more_than_one_chunk(history):
+    from api.app import app
+
+    # Enough rows for several output chunks, each read from SQLite on whichever
+    # threadpool worker the streaming response resumes the generator on
+    rows = 2 * CHUNK_ROWS + 1
+    start = time.time() - rows - 60
+    history._conn.executemany(
+        "INSERT INTO snapshots (account, kind, ts, data) VALUES (?, ?, ?, ?)",
+        (("0112345678", "bill", start + index, json.dumps({"index": index})) for index in range(rows))
+    )
+    history._conn.commit()
+
+    response = TestClient(app).get("/export/bill", params={"format": "ndjson"})
+
+    assert response.status_code == 200
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert len(records) == rows
+    assert json.loads(records[-1]["data"]) == {"index": rows - 1}
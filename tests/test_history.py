@@ -0,0 +1,58 @@
+import pytest
+
+from myslt.history import DAY, HOUR, LOCAL_UTC_OFFSET, UsageHistory, bucket_start, usage_delta
+
+ACCOUNT = "0112345678"
+# Midnight Sri Lanka time
+LOCAL_MIDNIGHT = 1_760_000_000 // DAY * DAY - LOCAL_UTC_OFFSET
+
+
+@pytest.fixture
+def history(tmp_path):
+    store = UsageHistory(str(tmp_path / "history.db"))
+    yield store
+    store.close()
+
+
+def sample(total_used, standard_used):
+    return {"total_used": total_used, "total_limit": 150.0, "standard_used": standard_used, "standard_limit": 100.0}
+
+
+def test_usage_delta_splits_day_and_night():
+    assert usage_delta(None, 10.0, 6.0) == (0.0, 0.0)
+    assert usage_delta((10.0, 6.0), 13.0, 7.0) == (1.0, 2.0)
+    # A drop in total usage starts a new billing cycle
+    assert usage_delta((50.0, 30.0), 4.0, 1.0) == (1.0, 3.0)
+
+
+def test_rollups_add_up_per_hour(history):
+    history.record_usage(ACCOUNT, sample(10.0, 6.0), ts=LOCAL_MIDNIGHT + 60)
+    history.record_usage(ACCOUNT, sample(11.0, 6.5), ts=LOCAL_MIDNIGHT + 120)
+    history.record_usage(ACCOUNT, sample(14.0, 8.0), ts=LOCAL_MIDNIGHT + HOUR + 60)
+
+    rows = list(history.iter_buckets(ACCOUNT, LOCAL_MIDNIGHT, LOCAL_MIDNIGHT + DAY))
+
+    assert rows == [
+        (LOCAL_MIDNIGHT, 0.5, 0.5, 2),
+        (LOCAL_MIDNIGHT + HOUR, 1.5, 1.5, 1),
+    ]
+    stats = history.usage_stats(ACCOUNT, LOCAL_MIDNIGHT, LOCAL_MIDNIGHT + DAY)
+    assert stats["total_used"] == 4.0
+    assert stats["day_used"] == 2.0
+    assert stats["night_used"] == 2.0
+    assert stats["peak_hour"] == 1
+
+
+def test_day_buckets_start_at_local_midnight(history):
+    history.record_usage(ACCOUNT, sample(10.0, 6.0), ts=LOCAL_MIDNIGHT + HOUR)
+    history.record_usage(ACCOUNT, sample(12.0, 7.0), ts=LOCAL_MIDNIGHT + 2 * HOUR)
+    history.record_usage(ACCOUNT, sample(15.0, 9.0), ts=LOCAL_MIDNIGHT + DAY + HOUR)
+
+    # A range starting mid-morning still returns the whole first day
+    rows = list(history.iter_buckets(ACCOUNT, LOCAL_MIDNIGHT + 10 * HOUR, LOCAL_MIDNIGHT + 2 * DAY, bucket="day"))
+
+    assert bucket_start(LOCAL_MIDNIGHT + 10 * HOUR, DAY) == LOCAL_MIDNIGHT
+    assert rows == [
+        (LOCAL_MIDNIGHT, 1.0, 1.0, 2),
+        (LOCAL_MIDNIGHT + DAY, 2.0, 1.0, 1),
+    ]